@@ -0,0 +1,34 @@
+"""User login hints for unscoped login"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0002"
+down_revision: Union[str, None] = "20250927_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_login_hints",
+        sa.Column("email", sa.String(length=320), primary_key=True, nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "last_login_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_user_login_hints_tenant_id", "user_login_hints", ["tenant_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_login_hints_tenant_id", table_name="user_login_hints")
+    op.drop_table("user_login_hints")
@@ -0,0 +1,38 @@
+"""Composite indexes matching admin portal list ordering"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0004"
+down_revision: Union[str, None] = "20261019_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keyset pages filter by tenant and seek on (created_at, id); payment plan
+# templates are already covered by their (tenant_id, product_code) constraint.
+_INDEXES = (
+    ("ix_users_tenant_created", "users", ["tenant_id", "created_at", "id"]),
+    (
+        "ix_tenant_companies_tenant_created",
+        "tenant_companies",
+        ["tenant_id", "created_at", "id"],
+    ),
+    (
+        "ix_commercial_plans_tenant_created",
+        "commercial_plans",
+        ["tenant_id", "created_at", "id"],
+    ),
+    ("ix_tenants_created", "tenants", ["created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,46 @@
+"""Packed installment arrays on payment plan templates"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0005"
+down_revision: Union[str, None] = "20261019_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "payment_plan_templates",
+        sa.Column("installment_periods", postgresql.ARRAY(sa.Integer()), nullable=True),
+    )
+    op.add_column(
+        "payment_plan_templates",
+        sa.Column(
+            "installment_amounts",
+            postgresql.ARRAY(sa.Float(precision=53)),
+            nullable=True,
+        ),
+    )
+    op.execute("""
+        UPDATE payment_plan_templates AS t
+        SET installment_periods = packed.periods,
+            installment_amounts = packed.amounts
+        FROM (
+            SELECT template_id,
+                   array_agg(period ORDER BY period) AS periods,
+                   array_agg(amount::float8 ORDER BY period) AS amounts
+            FROM payment_plan_installments
+            GROUP BY template_id
+        ) AS packed
+        WHERE packed.template_id = t.id
+        """)
+
+
+def downgrade() -> None:
+    op.drop_column("payment_plan_templates", "installment_amounts")
+    op.drop_column("payment_plan_templates", "installment_periods")
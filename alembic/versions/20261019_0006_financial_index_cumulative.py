@@ -0,0 +1,59 @@
+"""Cumulative index series maintained alongside index values"""
+
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0006"
+down_revision: Union[str, None] = "20261019_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    table = op.create_table(
+        "financial_index_cumulative",
+        sa.Column(
+            "tenant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("index_code", sa.String(length=32), primary_key=True),
+        sa.Column("reference_date", sa.Date(), primary_key=True),
+        sa.Column("cumulative", sa.Float(precision=53), nullable=False),
+    )
+
+    # Backfill: running product of first-of-month values per tenant/index.
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT tenant_id, index_code, reference_date, value "
+            "FROM financial_index_values "
+            "WHERE EXTRACT(DAY FROM reference_date) = 1 "
+            "ORDER BY tenant_id, index_code, reference_date"
+        )
+    )
+    for (tenant_id, index_code), series in groupby(
+        rows, key=lambda row: (row.tenant_id, row.index_code)
+    ):
+        running = 1.0
+        batch = []
+        for row in series:
+            running *= float(row.value)
+            batch.append(
+                {
+                    "tenant_id": tenant_id,
+                    "index_code": index_code,
+                    "reference_date": row.reference_date,
+                    "cumulative": running,
+                }
+            )
+        op.bulk_insert(table, batch)
+
+
+def downgrade() -> None:
+    op.drop_table("financial_index_cumulative")
@@ -0,0 +1,62 @@
+"""Persistent storage for benchmark batches and aggregates"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0007"
+down_revision: Union[str, None] = "20261019_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "benchmark_batches",
+        sa.Column(
+            "tenant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("batch_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("total_rows", sa.Integer(), nullable=False),
+        sa.Column("discarded_rows", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_table(
+        "benchmark_aggregates",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("batch_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("metric_code", sa.Text(), primary_key=True),
+        sa.Column("segment_bucket", sa.String(length=16), primary_key=True),
+        sa.Column("region_bucket", sa.String(length=16), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("average_value", sa.Float(), nullable=False),
+        sa.Column("min_value", sa.Float(), nullable=False),
+        sa.Column("max_value", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["tenant_id", "batch_id"],
+            ["benchmark_batches.tenant_id", "benchmark_batches.batch_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("benchmark_aggregates")
+    op.drop_table("benchmark_batches")
@@ -0,0 +1,25 @@
+"""Exact value sums for appendable benchmark buckets"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0009"
+down_revision: Union[str, None] = "20261019_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "benchmark_aggregates",
+        sa.Column("value_sum", sa.Float(precision=53), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    # Suppressed buckets were never served; drop them with the column.
+    op.execute("DELETE FROM benchmark_aggregates WHERE count < 3")
+    op.drop_column("benchmark_aggregates", "value_sum")
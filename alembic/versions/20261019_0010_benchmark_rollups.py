@@ -0,0 +1,98 @@
+"""Benchmark rollup cubes per batch and per tenant market"""
+
+from itertools import groupby
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.services.benchmarking import BucketState, build_cube
+from app.services.sketches import KLLSketch
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0010"
+down_revision: Union[str, None] = "20261019_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    table = op.create_table(
+        "benchmark_rollups",
+        sa.Column(
+            "tenant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("scope", sa.String(length=36), primary_key=True),
+        sa.Column("metric_code", sa.Text(), primary_key=True),
+        sa.Column("segment_bucket", sa.String(length=16), primary_key=True),
+        sa.Column("region_bucket", sa.String(length=16), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("value_sum", sa.Float(precision=53), nullable=False),
+        sa.Column("min_value", sa.Float(), nullable=False),
+        sa.Column("max_value", sa.Float(), nullable=False),
+        sa.Column("sketch", sa.LargeBinary(), nullable=True),
+    )
+
+    # Backfill: appends and new batches only merge deltas into the cubes, so
+    # every existing batch needs its cube, and every tenant its market cube,
+    # built here. Sketches cannot be merged in SQL, hence the Python pass
+    # with the same build_cube the repository uses.
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT tenant_id, batch_id, metric_code, segment_bucket, "
+            "region_bucket, count, value_sum, average_value, min_value, "
+            "max_value, sketch "
+            "FROM benchmark_aggregates ORDER BY tenant_id, batch_id"
+        ).columns(tenant_id=sa.Uuid(), batch_id=sa.Uuid())
+    )
+    for tenant_id, tenant_rows in groupby(rows, key=lambda row: row.tenant_id):
+        market = []
+        for batch_id, batch_rows in groupby(tenant_rows, key=lambda row: row.batch_id):
+            states = [_state_from_row(row) for row in batch_rows]
+            market.extend(states)
+            op.bulk_insert(table, _rollup_rows(tenant_id, str(batch_id), states))
+        op.bulk_insert(table, _rollup_rows(tenant_id, "market", market))
+
+
+def _state_from_row(row) -> BucketState:
+    return BucketState(
+        metric_code=row.metric_code,
+        segment_bucket=row.segment_bucket,
+        region_bucket=row.region_bucket,
+        count=row.count,
+        # Rows written before value_sum existed only kept the rounded average.
+        total=(
+            row.value_sum
+            if row.value_sum is not None
+            else row.average_value * row.count
+        ),
+        min_value=row.min_value,
+        max_value=row.max_value,
+        sketch=KLLSketch.from_bytes(row.sketch) if row.sketch is not None else None,
+    )
+
+
+def _rollup_rows(tenant_id, scope: str, states) -> list:
+    return [
+        {
+            "tenant_id": tenant_id,
+            "scope": scope,
+            "metric_code": cell.metric_code,
+            "segment_bucket": cell.segment_bucket,
+            "region_bucket": cell.region_bucket,
+            "count": cell.count,
+            "value_sum": cell.total,
+            "min_value": cell.min_value,
+            "max_value": cell.max_value,
+            "sketch": cell.sketch.to_bytes() if cell.sketch is not None else None,
+        }
+        for cell in build_cube(states)
+    ]
+
+
+def downgrade() -> None:
+    op.drop_table("benchmark_rollups")
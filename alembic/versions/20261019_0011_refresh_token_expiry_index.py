@@ -0,0 +1,21 @@
+"""Index refresh tokens by expiry for batched pruning"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0011"
+down_revision: Union[str, None] = "20261019_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The partial (user_id, expires_at) index leads with user_id, so it
+    # cannot serve the pruning pass's range over expires_at alone.
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
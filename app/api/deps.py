@@ -1,13 +1,16 @@
-from typing import Annotated, Callable
+from typing import Annotated, Awaitable, Callable
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.security import pwd_context
-from app.db.session import get_db
+from app.core.token_cache import revocation_filter, token_cache
+from app.db.session import get_async_db, get_db
+from app.observability.sql import current_query_stats
 
 settings = get_settings()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/t/{tenant_id}/login")
@@ -23,14 +26,17 @@ class CurrentUser:
 async def get_current_user(
     request: Request, token: Annotated[str, Depends(oauth2_scheme)]
 ) -> CurrentUser:
-    try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
-    except JWTError as exc:  # pragma: no cover - defensive guard
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
-        ) from exc
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token, settings.secret_key, algorithms=[settings.algorithm]
+            )
+        except JWTError as exc:  # pragma: no cover - defensive guard
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
+            ) from exc
+        token_cache.put(token, payload)
 
     user_id: str | None = payload.get("sub")
     tenant_id: str | None = payload.get("tenant_id")
@@ -39,6 +45,10 @@ async def get_current_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
+    if revocation_filter.is_revoked(user_id, payload.get("sid")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked"
+        )
 
     current_user = CurrentUser(user_id=user_id, tenant_id=tenant_id, roles=roles)
     request.state.current_user = current_user
@@ -59,5 +69,21 @@ def require_roles(*expected_roles: str) -> Callable[[CurrentUser], CurrentUser]:
     return _checker
 
 
+def query_budget(max_queries: int) -> Callable[[], Awaitable[None]]:
+    """Declare how many SQL statements a route may issue per request.
+
+    Use as ``dependencies=[Depends(query_budget(n))]``. Overruns are counted
+    and logged, and raise when ``SQL_ENFORCE_QUERY_BUDGETS`` is on (tests).
+    """
+
+    async def _declare() -> None:
+        stats = current_query_stats()
+        if stats is not None:
+            stats.budget = max_queries
+
+    return _declare
+
+
 SessionDependency = Annotated[Session, Depends(get_db)]
+AsyncSessionDependency = Annotated[AsyncSession, Depends(get_async_db)]
 PasswordHasher = pwd_context
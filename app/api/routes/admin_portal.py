@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Annotated, Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 
-from app.api.deps import CurrentUser, SessionDependency, require_roles
+from app.api.deps import CurrentUser, SessionDependency, query_budget, require_roles
 from app.api.schemas.administration import (
     CommercialPlanResponse,
     CompanyUpdateRequest,
@@ -51,6 +54,7 @@ from app.services.administration import (
     UserUpdateInput,
 )
 from app.services.financial_settings import FinancialSettingsService
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 # Routers
 superuser_router = APIRouter(
@@ -139,6 +143,83 @@ def _audit_collection(request: Request, *, resource_type: str, count: int) -> No
     request.state.audit_payload_out = {"count": count}
 
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class CollectionParams:
+    limit: int | None
+    cursor: str | None
+    fields: frozenset[str] | None
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+    @property
+    def page_size(self) -> int:
+        return self.limit or DEFAULT_PAGE_SIZE
+
+
+def _collection_params(
+    limit: int | None = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size (enables pagination)"
+    ),
+    cursor: str | None = Query(
+        None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"
+    ),
+    fields: str | None = Query(
+        None, description="Comma separated response fields to return"
+    ),
+) -> CollectionParams:
+    selected = (
+        frozenset(name.strip() for name in fields.split(",") if name.strip())
+        if fields
+        else None
+    )
+    return CollectionParams(limit=limit, cursor=cursor, fields=selected or None)
+
+
+CollectionDependency = Annotated[CollectionParams, Depends(_collection_params)]
+
+
+def _collection_response(
+    responses: list[BaseModel],
+    *,
+    model: type[BaseModel],
+    params: CollectionParams,
+    next_cursor: str | None = None,
+    exclude: set[str] | None = None,
+) -> list[BaseModel] | JSONResponse:
+    """Return ``responses`` as-is unless a projection or cursor applies.
+
+    ``fields`` names the public (camelCase) response keys; snake_case field
+    names are accepted as well.
+    """
+    include: set[str] | None = None
+    if params.fields is not None:
+        public_names = {
+            alias: name
+            for name, info in model.model_fields.items()
+            for alias in (name, info.alias or name)
+        }
+        unknown = params.fields - set(public_names)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        include = {public_names[field] for field in params.fields}
+    if include is None and not exclude and next_cursor is None:
+        return responses
+    content = [
+        item.model_dump(mode="json", by_alias=True, include=include, exclude=exclude)
+        for item in responses
+    ]
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return JSONResponse(content=content, headers=headers)
+
+
 def _map_companies(payload: TenantCreateRequest) -> list[CompanyInput]:
     companies: list[CompanyInput] = []
     for company in payload.companies:
@@ -224,7 +305,9 @@ def _financial_settings_response(settings) -> FinancialSettings:
     )
 
 
-def _payment_plan_template_response(template) -> PaymentPlanTemplateResponse:
+def _payment_plan_template_response(
+    template, *, include_installments: bool = True
+) -> PaymentPlanTemplateResponse:
     return PaymentPlanTemplateResponse(
         id=template.id,
         tenantId=template.tenant_id,
@@ -243,7 +326,7 @@ def _payment_plan_template_response(template) -> PaymentPlanTemplateResponse:
                 period=item.period,
                 amount=float(item.amount),
             )
-            for item in template.installments
+            for item in (template.installments if include_installments else ())
         ],
     )
 
@@ -285,22 +368,44 @@ def _user_response(user) -> UserResponse:
 
 
 # Superuser endpoints
-@superuser_router.get("/plans", response_model=list[CommercialPlanResponse])
+@superuser_router.get(
+    "/plans",
+    response_model=list[CommercialPlanResponse],
+    dependencies=[Depends(query_budget(2))],
+)
 def list_plans(
     request: Request,
     service: AdminServiceDependency,
+    collection: CollectionDependency,
     include_inactive: bool = Query(False),
     current_user: CurrentUser = Depends(require_roles(SUPERADMIN_ROLE)),
 ) -> list[CommercialPlanResponse]:
     _set_audit_actor(request, current_user)
     acting = _acting_user(current_user)
+    next_cursor = None
     try:
-        plans = service.list_commercial_plans(acting, include_inactive=include_inactive)
+        if collection.paginated:
+            page = service.list_commercial_plans_page(
+                acting,
+                include_inactive=include_inactive,
+                limit=collection.page_size,
+                cursor=collection.cursor,
+            )
+            plans, next_cursor = page.items, page.next_cursor
+        else:
+            plans = service.list_commercial_plans(
+                acting, include_inactive=include_inactive
+            )
     except Exception as exc:
         _handle_service_error(exc)
     responses = [_plan_response(plan) for plan in plans]
     _audit_collection(request, resource_type="commercial_plan", count=len(responses))
-    return responses
+    return _collection_response(
+        responses,
+        model=CommercialPlanResponse,
+        params=collection,
+        next_cursor=next_cursor,
+    )
 
 
 @superuser_router.get("/plans/{plan_id}", response_model=CommercialPlanResponse)
@@ -394,6 +499,7 @@ def create_plan(
     "/tenants",
     response_model=TenantResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(12))],
 )
 def create_tenant(
     request: Request,
@@ -520,30 +626,70 @@ def update_financial_settings(
 
 
 @tenant_admin_router.get(
-    "/{tenant_id}/payment-plans", response_model=list[PaymentPlanTemplateResponse]
+    "/{tenant_id}/payment-plans",
+    response_model=list[PaymentPlanTemplateResponse],
+    dependencies=[Depends(query_budget(3))],
 )
 def list_payment_plan_templates(
     request: Request,
     tenant_id: Annotated[str, Path(pattern=r"^[0-9a-fA-F-]{36}$")],
     service: AdminServiceDependency,
+    collection: CollectionDependency,
     include_inactive: bool = Query(False),
+    include_installments: bool | None = Query(
+        None,
+        description="Load installment rows (default: only for unpaginated lists)",
+    ),
     current_user: CurrentUser = Depends(
         require_roles(SUPERADMIN_ROLE, TENANT_ADMIN_ROLE)
     ),
 ) -> list[PaymentPlanTemplateResponse]:
     _set_audit_actor(request, current_user)
     acting = _acting_user(current_user)
+    if collection.fields is not None and include_installments is None:
+        include_installments = "installments" in collection.fields
+    next_cursor = None
     try:
-        templates = service.list_payment_plan_templates(
-            acting, UUID(tenant_id), include_inactive=include_inactive
-        )
+        if collection.paginated:
+            page = service.list_payment_plan_templates_page(
+                acting,
+                UUID(tenant_id),
+                include_inactive=include_inactive,
+                include_installments=bool(include_installments),
+                limit=collection.page_size,
+                cursor=collection.cursor,
+            )
+            templates, next_cursor = page.items, page.next_cursor
+            include_installments = bool(include_installments)
+        elif include_installments is False:
+            templates = service.list_payment_plan_templates(
+                acting,
+                UUID(tenant_id),
+                include_inactive=include_inactive,
+                include_installments=False,
+            )
+        else:
+            templates = service.list_payment_plan_templates(
+                acting, UUID(tenant_id), include_inactive=include_inactive
+            )
     except Exception as exc:
         _handle_service_error(exc)
-    responses = [_payment_plan_template_response(template) for template in templates]
+    responses = [
+        _payment_plan_template_response(
+            template, include_installments=include_installments is not False
+        )
+        for template in templates
+    ]
     _audit_collection(
         request, resource_type="payment_plan_template", count=len(responses)
     )
-    return responses
+    return _collection_response(
+        responses,
+        model=PaymentPlanTemplateResponse,
+        params=collection,
+        next_cursor=next_cursor,
+        exclude=None if include_installments is not False else {"installments"},
+    )
 
 
 @tenant_admin_router.post(
@@ -641,10 +787,15 @@ def update_payment_plan_template(
     return response
 
 
-@tenant_admin_router.get("/tenants", response_model=list[TenantResponse])
+@tenant_admin_router.get(
+    "/tenants",
+    response_model=list[TenantResponse],
+    dependencies=[Depends(query_budget(2))],
+)
 def list_tenants(
     request: Request,
     service: AdminServiceDependency,
+    collection: CollectionDependency,
     include_inactive: bool = Query(False),
     current_user: CurrentUser = Depends(
         require_roles(SUPERADMIN_ROLE, TENANT_ADMIN_ROLE)
@@ -652,13 +803,25 @@ def list_tenants(
 ) -> list[TenantResponse]:
     _set_audit_actor(request, current_user)
     acting = _acting_user(current_user)
+    next_cursor = None
     try:
-        tenants = service.list_tenants(acting, include_inactive=include_inactive)
+        if collection.paginated:
+            page = service.list_tenants_page(
+                acting,
+                include_inactive=include_inactive,
+                limit=collection.page_size,
+                cursor=collection.cursor,
+            )
+            tenants, next_cursor = page.items, page.next_cursor
+        else:
+            tenants = service.list_tenants(acting, include_inactive=include_inactive)
     except Exception as exc:
         _handle_service_error(exc)
     responses = [_tenant_response(tenant) for tenant in tenants]
     _audit_collection(request, resource_type="tenant", count=len(responses))
-    return responses
+    return _collection_response(
+        responses, model=TenantResponse, params=collection, next_cursor=next_cursor
+    )
 
 
 @tenant_admin_router.get("/tenants/{tenant_id}", response_model=TenantResponse)
@@ -732,12 +895,15 @@ def attach_companies(
 
 
 @tenant_admin_router.get(
-    "/{tenant_id}/companies", response_model=list[TenantCompanyResponse]
+    "/{tenant_id}/companies",
+    response_model=list[TenantCompanyResponse],
+    dependencies=[Depends(query_budget(3))],
 )
 def list_companies(
     request: Request,
     tenant_id: Annotated[str, Path(pattern=r"^[0-9a-fA-F-]{36}$")],
     service: AdminServiceDependency,
+    collection: CollectionDependency,
     include_inactive: bool = Query(False),
     current_user: CurrentUser = Depends(
         require_roles(SUPERADMIN_ROLE, TENANT_ADMIN_ROLE)
@@ -745,15 +911,31 @@ def list_companies(
 ) -> list[TenantCompanyResponse]:
     _set_audit_actor(request, current_user)
     acting = _acting_user(current_user)
+    next_cursor = None
     try:
-        companies = service.list_tenant_companies(
-            acting, UUID(tenant_id), include_inactive=include_inactive
-        )
+        if collection.paginated:
+            page = service.list_tenant_companies_page(
+                acting,
+                UUID(tenant_id),
+                include_inactive=include_inactive,
+                limit=collection.page_size,
+                cursor=collection.cursor,
+            )
+            companies, next_cursor = page.items, page.next_cursor
+        else:
+            companies = service.list_tenant_companies(
+                acting, UUID(tenant_id), include_inactive=include_inactive
+            )
     except Exception as exc:
         _handle_service_error(exc)
     responses = [_company_response(company) for company in companies]
     _audit_collection(request, resource_type="tenant_companies", count=len(responses))
-    return responses
+    return _collection_response(
+        responses,
+        model=TenantCompanyResponse,
+        params=collection,
+        next_cursor=next_cursor,
+    )
 
 
 @tenant_admin_router.patch(
@@ -807,6 +989,7 @@ def update_company(
     "/{tenant_id}/users",
     response_model=UserResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(8))],
 )
 def create_user(
     request: Request,
@@ -837,11 +1020,16 @@ def create_user(
     return response
 
 
-@tenant_admin_router.get("/{tenant_id}/users", response_model=list[UserResponse])
+@tenant_admin_router.get(
+    "/{tenant_id}/users",
+    response_model=list[UserResponse],
+    dependencies=[Depends(query_budget(2))],
+)
 def list_users(
     request: Request,
     tenant_id: Annotated[str, Path(pattern=r"^[0-9a-fA-F-]{36}$")],
     service: AdminServiceDependency,
+    collection: CollectionDependency,
     include_inactive: bool = Query(False),
     current_user: CurrentUser = Depends(
         require_roles(SUPERADMIN_ROLE, TENANT_ADMIN_ROLE)
@@ -849,15 +1037,28 @@ def list_users(
 ) -> list[UserResponse]:
     _set_audit_actor(request, current_user)
     acting_user = _acting_user(current_user)
+    next_cursor = None
     try:
-        users = service.list_users(
-            acting_user, UUID(tenant_id), include_inactive=include_inactive
-        )
+        if collection.paginated:
+            page = service.list_users_page(
+                acting_user,
+                UUID(tenant_id),
+                include_inactive=include_inactive,
+                limit=collection.page_size,
+                cursor=collection.cursor,
+            )
+            users, next_cursor = page.items, page.next_cursor
+        else:
+            users = service.list_users(
+                acting_user, UUID(tenant_id), include_inactive=include_inactive
+            )
     except Exception as exc:
         _handle_service_error(exc)
     responses = [_user_response(user) for user in users]
     _audit_collection(request, resource_type="user", count=len(responses))
-    return responses
+    return _collection_response(
+        responses, model=UserResponse, params=collection, next_cursor=next_cursor
+    )
 
 
 @tenant_admin_router.get("/{tenant_id}/users/{user_id}", response_model=UserResponse)
@@ -913,7 +1114,9 @@ def update_user(
 
 
 @tenant_admin_router.post(
-    "/{tenant_id}/users/{user_id}/suspend", response_model=UserResponse
+    "/{tenant_id}/users/{user_id}/suspend",
+    response_model=UserResponse,
+    dependencies=[Depends(query_budget(6))],
 )
 def suspend_user(
     request: Request,
@@ -939,7 +1142,9 @@ def suspend_user(
 
 
 @tenant_admin_router.post(
-    "/{tenant_id}/users/{user_id}/reinstate", response_model=UserResponse
+    "/{tenant_id}/users/{user_id}/reinstate",
+    response_model=UserResponse,
+    dependencies=[Depends(query_budget(10))],
 )
 def reinstate_user(
     request: Request,
@@ -16,6 +16,8 @@ from app.api.schemas.auth import (
 from app.core.config import get_settings
 from app.core.roles import SUPERADMIN_ROLE, TENANT_USER_ROLE
 from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.token_cache import revocation_filter
+from app.db.models import User
 from app.db.repositories.refresh_token import RefreshTokenRepository
 from app.db.repositories.user import UserRepository
 from app.db.session import get_db
@@ -31,7 +33,7 @@ def _issue_refresh_token(
     user_id: UUID,
     user_agent: str | None,
     ip_address: str | None,
-) -> str:
+) -> tuple[UUID, str]:
     token_id = uuid4()
     secret = uuid4().hex
     expires_at = datetime.now(timezone.utc) + timedelta(
@@ -45,7 +47,7 @@ def _issue_refresh_token(
         user_agent=user_agent,
         ip_address=ip_address,
     )
-    return f"{token_id}:{secret}"
+    return token_id, f"{token_id}:{secret}"
 
 
 def _split_refresh_token(raw_token: str) -> tuple[UUID, str]:
@@ -68,6 +70,56 @@ def _normalize_token_roles(roles: list[str] | None, is_superuser: bool) -> list[
     return sorted(set(normalized))
 
 
+def _issue_access_token(user: User, *, session_id: UUID) -> str:
+    roles = _normalize_token_roles(getattr(user, "roles", None), user.is_superuser)
+    return create_access_token(
+        subject=str(user.id),
+        extra_claims={
+            "tenant_id": str(user.tenant_id),
+            "roles": roles,
+            "sid": str(session_id),
+        },
+    )
+
+
+def _can_sign_in(user: User) -> bool:
+    return bool(user.is_active) and not getattr(user, "is_suspended", False)
+
+
+def _resolve_unscoped_login_candidate(
+    repository: UserRepository, payload: LoginRequest
+) -> tuple[User | None, bool]:
+    """Pick the single account whose password will be verified.
+
+    An explicit tenant slug wins. Otherwise only active, non-suspended
+    memberships are considered: the tenant the email last logged into, then
+    the oldest one. Only one bcrypt verification is ever spent per attempt,
+    regardless of how many tenants share the email. The flag tells whether
+    other memberships exist that only a ``tenantSlug`` can reach.
+    """
+    if payload.tenantSlug:
+        user = repository.get_by_email_and_tenant_slug(
+            payload.email, payload.tenantSlug
+        )
+        return user, False
+
+    candidates = repository.get_by_email_unscoped(payload.email)
+    if len(candidates) <= 1:
+        return (candidates[0] if candidates else None), False
+
+    # With no usable membership, the oldest one reports why sign-in fails.
+    usable = [candidate for candidate in candidates if _can_sign_in(candidate)]
+    if len(usable) <= 1:
+        return (usable or candidates)[0], False
+
+    hinted_tenant_id = repository.get_login_hint(payload.email)
+    if hinted_tenant_id is not None:
+        for candidate in usable:
+            if str(candidate.tenant_id) == str(hinted_tenant_id):
+                return candidate, True
+    return usable[0], True
+
+
 @router.post("/login", response_model=TokenPair)
 def login(
     tenant_id: str,
@@ -90,19 +142,16 @@ def login(
             status_code=status.HTTP_403_FORBIDDEN, detail="User account is suspended"
         )
 
-    roles = _normalize_token_roles(getattr(user, "roles", None), user.is_superuser)
-    access_token = create_access_token(
-        subject=str(user.id),
-        extra_claims={"tenant_id": str(user.tenant_id), "roles": roles},
-    )
+    repository.record_login_hint(user.email, user.tenant_id)
 
     refresh_repo = RefreshTokenRepository(db)
-    refresh_token = _issue_refresh_token(
+    session_id, refresh_token = _issue_refresh_token(
         refresh_repo,
         user_id=user.id,
         user_agent=request.headers.get("user-agent"),
         ip_address=request.client.host if request.client else None,
     )
+    access_token = _issue_access_token(user, session_id=session_id)
 
     return TokenPair(
         access_token=access_token,
@@ -141,11 +190,7 @@ def refresh(
             status_code=status.HTTP_403_FORBIDDEN, detail="User account is suspended"
         )
 
-    roles = _normalize_token_roles(getattr(user, "roles", None), user.is_superuser)
-    access_token = create_access_token(
-        subject=str(user.id),
-        extra_claims={"tenant_id": str(user.tenant_id), "roles": roles},
-    )
+    access_token = _issue_access_token(user, session_id=stored_token.id)
 
     return TokenRefresh(
         access_token=access_token, expires_in=settings.access_token_expire_minutes * 60
@@ -175,6 +220,7 @@ def logout(
         )
 
     refresh_repo.revoke(stored_token)
+    revocation_filter.revoke_session(stored_token.id)
     return None
 
 
@@ -185,17 +231,16 @@ def login_unscoped(
     db: Session = Depends(get_db),
 ) -> TokenPair:
     repository = UserRepository(db)
-    users = repository.get_by_email_unscoped(payload.email)
-    
-    user = None
-    for u in users:
-        if verify_password(payload.password, u.hashed_password):
-            user = u
-            break
-
-    if not user:
+    user, ambiguous = _resolve_unscoped_login_candidate(repository, payload)
+    if not user or not verify_password(payload.password, user.hashed_password):
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=(
+                "Invalid credentials. This email belongs to several tenants; "
+                "provide tenantSlug to sign in to a specific one"
+                if ambiguous
+                else "Invalid credentials"
+            ),
         )
 
     if not user.is_active:
@@ -207,19 +252,16 @@ def login_unscoped(
             status_code=status.HTTP_403_FORBIDDEN, detail="User account is suspended"
         )
 
-    roles = _normalize_token_roles(getattr(user, "roles", None), user.is_superuser)
-    access_token = create_access_token(
-        subject=str(user.id),
-        extra_claims={"tenant_id": str(user.tenant_id), "roles": roles},
-    )
+    repository.record_login_hint(user.email, user.tenant_id)
 
     refresh_repo = RefreshTokenRepository(db)
-    refresh_token = _issue_refresh_token(
+    session_id, refresh_token = _issue_refresh_token(
         refresh_repo,
         user_id=user.id,
         user_agent=request.headers.get("user-agent"),
         ip_address=request.client.host if request.client else None,
     )
+    access_token = _issue_access_token(user, session_id=session_id)
 
     return TokenPair(
         access_token=access_token,
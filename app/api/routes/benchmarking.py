@@ -1,21 +1,52 @@
 from __future__ import annotations
 
-from typing import Optional
+import os
+import tempfile
+from typing import AsyncIterator, Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, status, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import CurrentUser, require_roles
 from app.api.schemas.benchmarking import (
     BenchmarkAggregationsResponse,
+    BenchmarkCompareRequest,
+    BenchmarkCompareResponse,
+    BenchmarkComparisonResponse,
+    BenchmarkCubeResponse,
+    BenchmarkDistributionResponse,
     BenchmarkIngestResponse,
+    BenchmarkJobResponse,
+)
+from app.core.logging import logger
+from app.db.repositories.benchmark import SqlBenchmarkRepository
+from app.db.session import SessionLocal
+from app.services.benchmark_jobs import BenchmarkJob, ingest_executor, ingest_jobs
+from app.services.benchmarking import (
+    AggregatedBenchmark,
+    BenchmarkIngestResult,
+    BenchmarkingService,
+    DatasetTooLargeError,
 )
-from app.db.session import get_db
-from app.services.benchmarking import AggregatedBenchmark, BenchmarkingService
 
 router = APIRouter(tags=["Benchmarking"], prefix="/t/{tenant_id}/benchmarking")
 
-service = BenchmarkingService()
+service = BenchmarkingService(SqlBenchmarkRepository(SessionLocal))
+
+# Uploads are copied to disk in chunks of this size before parsing.
+_SPOOL_CHUNK_BYTES = 1024 * 1024
 
 
 def _parse_uuid(raw: str, *, field_name: str) -> UUID:
@@ -27,6 +58,82 @@ def _parse_uuid(raw: str, *, field_name: str) -> UUID:
         ) from exc
 
 
+async def _upload_chunks(
+    request: Request, file: UploadFile | None
+) -> AsyncIterator[bytes]:
+    if file is None:
+        async for chunk in request.stream():
+            yield chunk
+        return
+    while chunk := await file.read(_SPOOL_CHUNK_BYTES):
+        yield chunk
+
+
+async def _spool_upload(request: Request, file: UploadFile | None) -> str:
+    """Copy the upload to a temporary file chunk by chunk, enforcing the cap.
+
+    Worker processes parse from the returned path; the caller deletes it.
+    """
+    handle = tempfile.NamedTemporaryFile(prefix="benchmark-", delete=False)
+    try:
+        size = 0
+        async for chunk in _upload_chunks(request, file):
+            size += len(chunk)
+            if size > service.max_file_size_bytes:
+                break
+            handle.write(chunk)
+        if size > service.max_file_size_bytes:
+            raise DatasetTooLargeError(
+                f"Dataset exceeds maximum size of {service.max_file_size_bytes} bytes"
+            )
+        if not size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File content required",
+            )
+    except BaseException:
+        handle.close()
+        os.unlink(handle.name)
+        raise
+    handle.close()
+    return handle.name
+
+
+async def _ingest(
+    path: str,
+    *,
+    tenant_id: UUID,
+    batch_id: UUID,
+    filename: str,
+    append: bool,
+) -> BenchmarkIngestResult:
+    """Parse off the event loop, then store; always removes ``path``."""
+    try:
+        upload = await ingest_executor.aggregate(
+            path, filename, service.max_file_size_bytes
+        )
+        return await run_in_threadpool(
+            service.persist, tenant_id, batch_id, upload, append=append
+        )
+    finally:
+        os.unlink(path)
+
+
+async def _run_ingest_job(job: BenchmarkJob, path: str, **options) -> None:
+    ingest_jobs.start(job)
+    try:
+        result = await _ingest(path, **options)
+    except (ValueError, OSError) as exc:
+        ingest_jobs.fail(job, str(exc))
+    except Exception as exc:  # pragma: no cover - defensive guard
+        logger.bind(component="benchmarking", job_id=str(job.job_id)).exception(
+            {"message": "Benchmark ingest job failed", "detail": str(exc)}
+        )
+        ingest_jobs.fail(job, "Benchmark ingestion failed")
+    else:
+        ingest_jobs.succeed(job, result)
+
+
 def _set_audit_context(
     request: Request,
     *,
@@ -69,47 +176,100 @@ def _to_response_items(
             "averageValue": item.average_value,
             "minValue": item.min_value,
             "maxValue": item.max_value,
+            "p25Value": item.percentile(0.25),
+            "medianValue": item.percentile(0.5),
+            "p75Value": item.percentile(0.75),
+            "p90Value": item.percentile(0.9),
         }
         for item in aggregations
     ]
 
 
-@router.post("/batches/{batch_id}/ingest", response_model=BenchmarkIngestResponse)
+def _ingest_response(result: BenchmarkIngestResult) -> BenchmarkIngestResponse:
+    return BenchmarkIngestResponse(
+        tenantId=result.tenant_id,
+        batchId=result.batch_id,
+        totalRows=result.total_rows,
+        discardedRows=result.discarded_rows,
+        aggregations=_to_response_items(result.aggregations),
+    )
+
+
+def _job_response(job: BenchmarkJob) -> BenchmarkJobResponse:
+    return BenchmarkJobResponse(
+        jobId=job.job_id,
+        tenantId=job.tenant_id,
+        batchId=job.batch_id,
+        status=job.status,
+        createdAt=job.created_at,
+        finishedAt=job.finished_at,
+        error=job.error,
+        result=_ingest_response(job.result) if job.result is not None else None,
+    )
+
+
+@router.post(
+    "/batches/{batch_id}/ingest",
+    response_model=BenchmarkIngestResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": BenchmarkJobResponse}},
+)
 async def ingest_benchmark_dataset(
     tenant_id: str,
     batch_id: str,
     request: Request,
+    background_tasks: BackgroundTasks,
     file: UploadFile | None = File(None),
+    mode: Literal["replace", "append"] = Query("replace"),
+    background: bool = Query(False),
     current_user: CurrentUser = Depends(require_roles("user", "superuser")),
-    db=Depends(get_db),  # noqa: ARG001 - future persistence
-) -> BenchmarkIngestResponse:
+) -> BenchmarkIngestResponse | JSONResponse:
     tenant_uuid = _parse_uuid(tenant_id, field_name="tenant_id")
     batch_uuid = _parse_uuid(batch_id, field_name="batch_id")
     filename_override: Optional[str] = request.query_params.get("filename")
-
     if file is not None:
-        content = await file.read()
         filename = file.filename or filename_override or "dataset.bin"
     else:
-        content = await request.body()
-        if not content:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="File content required"
-            )
         filename = filename_override or "dataset.bin"
+    options = {
+        "tenant_id": tenant_uuid,
+        "batch_id": batch_uuid,
+        "filename": filename,
+        "append": mode == "append",
+    }
 
     try:
-        result = service.ingest_dataset(
-            tenant_uuid,
-            batch_uuid,
-            filename=filename,
-            content=content,
-        )
+        path = await _spool_upload(request, file)
+        if background:
+            job = ingest_jobs.create(tenant_uuid, batch_uuid)
+            background_tasks.add_task(_run_ingest_job, job, path, **options)
+        else:
+            result = await _ingest(path, **options)
+    except DatasetTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(exc)
+        ) from exc
     except (ValueError, OSError) as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
         ) from exc
 
+    if background:
+        _set_audit_context(
+            request,
+            tenant_id=tenant_id,
+            batch_id=batch_id,
+            aggregations=[],
+            current_user=current_user,
+        )
+        location = request.url_for(
+            "get_benchmark_ingest_job", tenant_id=tenant_id, job_id=str(job.job_id)
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=_job_response(job).model_dump(by_alias=True, mode="json"),
+            headers={"Location": str(location)},
+        )
+
     _set_audit_context(
         request,
         tenant_id=tenant_id,
@@ -117,14 +277,22 @@ async def ingest_benchmark_dataset(
         aggregations=result.aggregations,
         current_user=current_user,
     )
+    return _ingest_response(result)
 
-    return BenchmarkIngestResponse(
-        tenantId=result.tenant_id,
-        batchId=result.batch_id,
-        totalRows=result.total_rows,
-        discardedRows=result.discarded_rows,
-        aggregations=_to_response_items(result.aggregations),
-    )
+
+@router.get("/jobs/{job_id}", response_model=BenchmarkJobResponse)
+def get_benchmark_ingest_job(
+    tenant_id: str,
+    job_id: str,
+    current_user: CurrentUser = Depends(require_roles("user", "superuser")),
+) -> BenchmarkJobResponse:
+    tenant_uuid = _parse_uuid(tenant_id, field_name="tenant_id")
+    job = ingest_jobs.get(tenant_uuid, _parse_uuid(job_id, field_name="job_id"))
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Ingest job not found"
+        )
+    return _job_response(job)
 
 
 @router.get(
@@ -135,7 +303,6 @@ def list_benchmark_aggregations(
     batch_id: str,
     request: Request,
     current_user: CurrentUser = Depends(require_roles("user", "superuser")),
-    db=Depends(get_db),  # noqa: ARG001 - future persistence
 ) -> BenchmarkAggregationsResponse:
     tenant_uuid = _parse_uuid(tenant_id, field_name="tenant_id")
     batch_uuid = _parse_uuid(batch_id, field_name="batch_id")
@@ -155,3 +322,109 @@ def list_benchmark_aggregations(
         batchId=batch_uuid,
         aggregations=_to_response_items(aggregations),
     )
+
+
+@router.get("/distribution", response_model=BenchmarkDistributionResponse)
+def get_benchmark_distribution(
+    tenant_id: str,
+    metric_code: str = Query(..., min_length=1),
+    batch_id: list[str] = Query(..., min_length=1),
+    segment_bucket: str | None = Query(None),
+    region_bucket: str | None = Query(None),
+    current_user: CurrentUser = Depends(require_roles("user", "superuser")),
+) -> BenchmarkDistributionResponse:
+    tenant_uuid = _parse_uuid(tenant_id, field_name="tenant_id")
+    batch_uuids = [_parse_uuid(raw, field_name="batch_id") for raw in batch_id]
+
+    distribution = service.distribution(
+        tenant_uuid,
+        batch_uuids,
+        metric_code,
+        segment_bucket=segment_bucket,
+        region_bucket=region_bucket,
+    )
+    if distribution is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No benchmark aggregates match the requested slice",
+        )
+
+    return BenchmarkDistributionResponse(
+        tenantId=tenant_uuid,
+        batchIds=batch_uuids,
+        metricCode=distribution.metric_code,
+        segmentBucket=segment_bucket,
+        regionBucket=region_bucket,
+        count=distribution.count,
+        minValue=distribution.min_value,
+        maxValue=distribution.max_value,
+        p25Value=distribution.percentile(0.25),
+        medianValue=distribution.percentile(0.5),
+        p75Value=distribution.percentile(0.75),
+        p90Value=distribution.percentile(0.9),
+    )
+
+
+@router.get("/cube", response_model=BenchmarkCubeResponse)
+def get_benchmark_cube(
+    tenant_id: str,
+    batch_id: str | None = Query(None),
+    metric_code: str | None = Query(None, min_length=1),
+    group_by: list[Literal["segment", "region"]] = Query([]),
+    segment_bucket: str | None = Query(None),
+    region_bucket: str | None = Query(None),
+    current_user: CurrentUser = Depends(require_roles("user", "superuser")),
+) -> BenchmarkCubeResponse:
+    tenant_uuid = _parse_uuid(tenant_id, field_name="tenant_id")
+    batch_uuid = (
+        _parse_uuid(batch_id, field_name="batch_id") if batch_id is not None else None
+    )
+
+    cells = service.cube(
+        tenant_uuid,
+        batch_uuid,
+        metric_code=metric_code,
+        by_segment="segment" in group_by,
+        by_region="region" in group_by,
+        segment_bucket=segment_bucket,
+        region_bucket=region_bucket,
+    )
+
+    return BenchmarkCubeResponse(
+        tenantId=tenant_uuid, batchId=batch_uuid, cells=_to_response_items(cells)
+    )
+
+
+@router.post("/compare", response_model=BenchmarkCompareResponse)
+def compare_with_benchmarks(
+    tenant_id: str,
+    payload: BenchmarkCompareRequest,
+    current_user: CurrentUser = Depends(require_roles("user", "superuser")),
+) -> BenchmarkCompareResponse:
+    tenant_uuid = _parse_uuid(tenant_id, field_name="tenant_id")
+
+    comparisons = service.compare(
+        tenant_uuid,
+        [
+            (item.metric_code, item.value, item.segment_bucket, item.region_bucket)
+            for item in payload.metrics
+        ],
+        batch_id=payload.batch_id,
+    )
+
+    return BenchmarkCompareResponse(
+        tenantId=tenant_uuid,
+        batchId=payload.batch_id,
+        comparisons=[
+            BenchmarkComparisonResponse(
+                metricCode=comparison.metric_code,
+                segmentBucket=comparison.segment_bucket,
+                regionBucket=comparison.region_bucket,
+                value=comparison.value,
+                percentileRank=comparison.percentile_rank,
+                count=comparison.count,
+                medianValue=comparison.median_value,
+            )
+            for comparison in comparisons
+        ],
+    )
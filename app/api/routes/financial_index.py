@@ -3,12 +3,25 @@ from __future__ import annotations
 from typing import Annotated, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 
-from app.api.deps import CurrentUser, SessionDependency, require_roles
-from app.api.schemas.financial_index import IndexValueBatchInput, IndexValueOutput
+from app.api.deps import (
+    AsyncSessionDependency,
+    CurrentUser,
+    SessionDependency,
+    require_roles,
+)
+from app.api.schemas.financial_index import (
+    IndexImportItem,
+    IndexImportResponse,
+    IndexValueBatchInput,
+    IndexValueOutput,
+)
+from app.core.config import get_settings
+from app.db.session import uses_async_db
 from app.services.administration import ActingUser, PermissionDeniedError
 from app.services.financial_index import FinancialIndexService
+from app.services.index_import import IndexImportError, IndexImportService
 
 router = APIRouter(tags=["Financial Indexes"], prefix="/t/{tenant_id}/indexes")
 
@@ -17,9 +30,28 @@ def get_financial_index_service(db: SessionDependency) -> FinancialIndexService:
     return FinancialIndexService(db)
 
 
+def get_async_financial_index_service(
+    db: AsyncSessionDependency,
+) -> FinancialIndexService:
+    return FinancialIndexService(db)
+
+
+def get_index_import_service(db: SessionDependency) -> IndexImportService:
+    return IndexImportService(db, chunk_size=get_settings().index_import_chunk_size)
+
+
 ServiceDependency = Annotated[
     FinancialIndexService, Depends(get_financial_index_service)
 ]
+# Reads move to the async engine once "financial_index" is in ASYNC_DB_ROUTERS.
+ReadServiceDependency = Annotated[
+    FinancialIndexService,
+    Depends(
+        get_async_financial_index_service
+        if uses_async_db("financial_index")
+        else get_financial_index_service
+    ),
+]
 
 
 def _acting_user(current_user: CurrentUser) -> ActingUser:
@@ -35,9 +67,41 @@ def _handle_service_error(exc: Exception) -> None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)
         ) from exc
+    if isinstance(exc, IndexImportError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
     raise exc
 
 
+@router.post(
+    "/import",
+    response_model=IndexImportResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def import_index_values(
+    tenant_id: UUID,
+    file: UploadFile = File(...),
+    service: IndexImportService = Depends(get_index_import_service),
+    current_user: CurrentUser = Depends(require_roles("tenant_admin", "superuser")),
+) -> IndexImportResponse:
+    """Importa séries de índices (index_code, reference_date, value) de CSV/XLSX."""
+    acting = _acting_user(current_user)
+    try:
+        summaries = service.import_file(
+            acting,
+            tenant_id,
+            filename=file.filename or "",
+            stream=file.file,
+        )
+    except Exception as exc:
+        _handle_service_error(exc)
+    return IndexImportResponse(
+        totalRows=sum(summary.rows for summary in summaries),
+        indexes=[IndexImportItem.model_validate(summary) for summary in summaries],
+    )
+
+
 @router.post(
     "/{index_code}/values",
     response_model=List[IndexValueOutput],
@@ -48,13 +112,20 @@ def create_or_update_index_values(
     index_code: str,
     service: ServiceDependency,
     payload: IndexValueBatchInput,
+    include_history: bool = Query(
+        False, description="Return the full index history instead of affected rows"
+    ),
     current_user: CurrentUser = Depends(require_roles("tenant_admin", "superuser")),
 ) -> List[IndexValueOutput]:
     """Cria ou atualiza valores para um índice financeiro customizado do tenant."""
     acting = _acting_user(current_user)
     try:
         results = service.create_or_update_values(
-            acting, tenant_id, index_code, payload.values
+            acting,
+            tenant_id,
+            index_code,
+            payload.values,
+            include_history=include_history,
         )
     except Exception as exc:
         _handle_service_error(exc)
@@ -62,10 +133,10 @@ def create_or_update_index_values(
 
 
 @router.get("/{index_code}/values", response_model=List[IndexValueOutput])
-def list_index_values(
+async def list_index_values(
     tenant_id: UUID,
     index_code: str,
-    service: ServiceDependency,
+    service: ReadServiceDependency,
     current_user: CurrentUser = Depends(
         require_roles("tenant_admin", "superuser", "support")
     ),
@@ -73,7 +144,7 @@ def list_index_values(
     """Lista os valores históricos de um índice financeiro customizado do tenant."""
     acting = _acting_user(current_user)
     try:
-        results = service.list_values(acting, tenant_id, index_code)
+        results = await service.list_values_async(acting, tenant_id, index_code)
     except Exception as exc:
         _handle_service_error(exc)
     return [IndexValueOutput.model_validate(r) for r in results]
@@ -23,6 +23,7 @@ from app.services.simulation import (
     SimulationPlan,
     _calculate_months_between,
 )
+from app.services.template_cache import CompiledTemplate, compiled_templates
 from app.db.repositories.financial_index import FinancialIndexRepository
 
 router = APIRouter(tags=["Simulations"], prefix="/t/{tenant_id}")
@@ -51,6 +52,44 @@ def _coerce_installment(item: InstallmentInput | object) -> InstallmentInput:
     )
 
 
+def _template_periods(template) -> list[tuple[int, float]]:
+    """``(period, amount)`` pairs of a template, from its packed columns if set."""
+    packed = getattr(template, "packed_installments", None)
+    if packed is not None:
+        return packed
+    return [(int(item.period), float(item.amount)) for item in template.installments]
+
+
+def _template_snapshot(
+    template, periods: list[tuple[int, float]]
+) -> SimulationPlanSnapshot:
+    return SimulationPlanSnapshot(
+        principal=float(template.principal),
+        discount_rate=float(template.discount_rate),
+        installments=[
+            InstallmentInput.model_construct(
+                due_date=None, period=period, amount=amount
+            )
+            for period, amount in periods
+        ],
+    )
+
+
+def _compile_template(template) -> CompiledTemplate:
+    periods = _template_periods(template)
+    plan = SimulationPlan(
+        principal=float(template.principal),
+        discount_rate=float(template.discount_rate),
+        # Templates currently don't have adjustment data in this flow
+        periods=periods,
+    )
+    return CompiledTemplate(
+        periods=tuple(periods),
+        snapshot=_template_snapshot(template, periods),
+        result=_run_simulation(plan),
+    )
+
+
 def _period_offset(base_date: date, installment: InstallmentInput) -> int:
     if installment.period is not None:
         return int(installment.period)
@@ -141,11 +180,15 @@ def create_simulation_batch(
     templates_by_id: dict[UUID, object] = {}
     templates_by_code: dict[str, object] = {}
 
-    for template in repository.list_by_ids(tenant_uuid, requested_ids):
+    for template in repository.list_by_ids(
+        tenant_uuid, requested_ids, with_installments=False
+    ):
         templates_by_id[template.id] = template
         templates_by_code[template.product_code.lower()] = template
 
-    for template in repository.list_by_product_codes(tenant_uuid, requested_codes):
+    for template in repository.list_by_product_codes(
+        tenant_uuid, requested_codes, with_installments=False
+    ):
         templates_by_id[template.id] = template
         templates_by_code[template.product_code.lower()] = template
 
@@ -201,27 +244,9 @@ def create_simulation_batch(
         if plan_product_code:
             template = templates_by_code.get(plan_product_code.lower())
             if template and template.id not in included_template_ids:
-                base_date_for_template = (
-                    plan_payload.adjustment.base_date
-                    if plan_payload.adjustment
-                    else date.today()
-                )
-                template_installments = [
-                    _coerce_installment(item) for item in template.installments
-                ]
-                template_plan = SimulationPlan(
-                    principal=float(template.principal),
-                    discount_rate=float(template.discount_rate),
-                    # Templates currently don't have adjustment data in this flow
-                    periods=[
-                        (
-                            _period_offset(base_date_for_template, inst),
-                            float(inst.amount),
-                        )
-                        for inst in template_installments
-                    ],
+                compiled = compiled_templates.get_or_compile(
+                    template, date.today(), _compile_template
                 )
-                template_result = _run_simulation(template_plan)
                 outcomes.append(
                     SimulationOutcome(
                         source="template",
@@ -229,12 +254,8 @@ def create_simulation_batch(
                         label=template.name,
                         product_code=template.product_code,
                         template_id=template.id,
-                        plan=_snapshot(
-                            float(template.principal),
-                            float(template.discount_rate),
-                            template_installments,
-                        ),
-                        result=template_result,
+                        plan=compiled.snapshot,
+                        result=compiled.result,
                     )
                 )
                 included_template_ids.add(template.id)
@@ -252,19 +273,9 @@ def create_simulation_batch(
             )
         if template.id in included_template_ids:
             continue
-        template_installments = [
-            _coerce_installment(item) for item in template.installments
-        ]
-        template_plan = SimulationPlan(
-            principal=float(template.principal),
-            discount_rate=float(template.discount_rate),
-            # Templates currently don't have adjustment data in this flow
-            periods=[
-                (_period_offset(date.today(), inst), float(inst.amount))
-                for inst in template_installments
-            ],
+        compiled = compiled_templates.get_or_compile(
+            template, date.today(), _compile_template
         )
-        template_result = _run_simulation(template_plan)
         outcomes.append(
             SimulationOutcome(
                 source="template",
@@ -272,12 +283,8 @@ def create_simulation_batch(
                 label=template.name,
                 product_code=template.product_code,
                 template_id=template.id,
-                plan=_snapshot(
-                    float(template.principal),
-                    float(template.discount_rate),
-                    template_installments,
-                ),
-                result=template_result,
+                plan=compiled.snapshot,
+                result=compiled.result,
             )
         )
         included_template_ids.add(template.id)
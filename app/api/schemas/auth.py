@@ -6,6 +6,7 @@ from pydantic import BaseModel, ConfigDict, EmailStr, Field
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
+    tenantSlug: str | None = Field(None, min_length=1, max_length=255)
 
     model_config = ConfigDict(validate_by_name=True)
 
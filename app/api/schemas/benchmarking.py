@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -13,6 +15,10 @@ class AggregatedBenchmarkResponse(BaseModel):
     average_value: float = Field(..., alias="averageValue")
     min_value: float = Field(..., alias="minValue")
     max_value: float = Field(..., alias="maxValue")
+    p25_value: float | None = Field(None, alias="p25Value")
+    median_value: float | None = Field(None, alias="medianValue")
+    p75_value: float | None = Field(None, alias="p75Value")
+    p90_value: float | None = Field(None, alias="p90Value")
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -33,3 +39,87 @@ class BenchmarkAggregationsResponse(BaseModel):
     aggregations: list[AggregatedBenchmarkResponse]
 
     model_config = ConfigDict(populate_by_name=True)
+
+
+class BenchmarkDistributionResponse(BaseModel):
+    tenant_id: UUID = Field(..., alias="tenantId")
+    batch_ids: list[UUID] = Field(..., alias="batchIds")
+    metric_code: str = Field(..., alias="metricCode")
+    segment_bucket: str | None = Field(None, alias="segmentBucket")
+    region_bucket: str | None = Field(None, alias="regionBucket")
+    count: int
+    min_value: float = Field(..., alias="minValue")
+    max_value: float = Field(..., alias="maxValue")
+    p25_value: float = Field(..., alias="p25Value")
+    median_value: float = Field(..., alias="medianValue")
+    p75_value: float = Field(..., alias="p75Value")
+    p90_value: float = Field(..., alias="p90Value")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BenchmarkCubeResponse(BaseModel):
+    tenant_id: UUID = Field(..., alias="tenantId")
+    batch_id: UUID | None = Field(
+        None, alias="batchId", description="Null for the market cube across batches"
+    )
+    cells: list[AggregatedBenchmarkResponse] = Field(
+        ..., description='Rolled-up dimensions are reported as the "*" bucket'
+    )
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BenchmarkCompareItem(BaseModel):
+    metric_code: str = Field(..., alias="metricCode", min_length=1)
+    value: float
+    segment_bucket: str | None = Field(None, alias="segmentBucket")
+    region_bucket: str | None = Field(None, alias="regionBucket")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BenchmarkCompareRequest(BaseModel):
+    batch_id: UUID | None = Field(
+        None, alias="batchId", description="Compare against the market cube if null"
+    )
+    metrics: list[BenchmarkCompareItem] = Field(..., min_length=1, max_length=500)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BenchmarkComparisonResponse(BaseModel):
+    metric_code: str = Field(..., alias="metricCode")
+    segment_bucket: str = Field(..., alias="segmentBucket")
+    region_bucket: str = Field(..., alias="regionBucket")
+    value: float
+    percentile_rank: float | None = Field(
+        None,
+        alias="percentileRank",
+        description="Percent of benchmark values at or below value; null if no match",
+    )
+    count: int | None = None
+    median_value: float | None = Field(None, alias="medianValue")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BenchmarkCompareResponse(BaseModel):
+    tenant_id: UUID = Field(..., alias="tenantId")
+    batch_id: UUID | None = Field(None, alias="batchId")
+    comparisons: list[BenchmarkComparisonResponse]
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BenchmarkJobResponse(BaseModel):
+    job_id: UUID = Field(..., alias="jobId")
+    tenant_id: UUID = Field(..., alias="tenantId")
+    batch_id: UUID = Field(..., alias="batchId")
+    status: Literal["queued", "running", "succeeded", "failed"]
+    created_at: datetime = Field(..., alias="createdAt")
+    finished_at: datetime | None = Field(None, alias="finishedAt")
+    error: str | None = None
+    result: BenchmarkIngestResponse | None = None
+
+    model_config = ConfigDict(populate_by_name=True)
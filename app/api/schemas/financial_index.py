@@ -30,3 +30,19 @@ class IndexValueOutput(BaseModel):
     updated_at: datetime = Field(..., alias="updatedAt")
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class IndexImportItem(BaseModel):
+    index_code: str = Field(..., alias="indexCode")
+    rows: int
+    first_date: date | None = Field(None, alias="firstDate")
+    last_date: date | None = Field(None, alias="lastDate")
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class IndexImportResponse(BaseModel):
+    total_rows: int = Field(..., alias="totalRows")
+    indexes: list[IndexImportItem]
+
+    model_config = ConfigDict(populate_by_name=True)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.logging import logger
+
+
+async def run_periodically(
+    name: str, interval_seconds: float, job: Callable[[], None]
+) -> None:
+    """Run a blocking job in the threadpool every ``interval_seconds``.
+
+    Failures are logged and retried on the next tick so a transient database
+    outage never kills the loop.
+    """
+    while True:
+        try:
+            await run_in_threadpool(job)
+        except Exception as exc:  # pragma: no cover - defensive guard
+            logger.bind(component="tasks", task=name).warning(
+                {"message": "Periodic task failed", "detail": str(exc)}
+            )
+        await asyncio.sleep(interval_seconds)
+
+
+def start_periodic_task(
+    name: str, interval_seconds: float, job: Callable[[], None]
+) -> asyncio.Task | None:
+    if interval_seconds <= 0:
+        return None
+    return asyncio.create_task(run_periodically(name, interval_seconds, job), name=name)
+
+
+async def cancel_tasks(tasks: list[asyncio.Task | None]) -> None:
+    pending = [task for task in tasks if task is not None]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+__all__ = ["cancel_tasks", "run_periodically", "start_periodic_task"]
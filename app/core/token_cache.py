@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class VerifiedTokenCache:
+    """LRU of verified access-token digests to their decoded claims.
+
+    Entries never outlive the token's own ``exp`` claim, so a cache hit is
+    always as valid as a fresh ``jwt.decode``.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str, now: float | None = None) -> dict[str, Any] | None:
+        key = _token_digest(token)
+        reference = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= reference:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        key = _token_digest(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _BloomFilter:
+    def __init__(self, size_bits: int, hash_count: int) -> None:
+        self.size_bits = max(size_bits, 8)
+        self.hash_count = max(hash_count, 1)
+        self._bits = bytearray((self.size_bits + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=32).digest()
+        return [
+            int.from_bytes(digest[offset : offset + 4], "little") % self.size_bits
+            for offset in range(0, 4 * self.hash_count, 4)
+        ]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationFilter:
+    """In-memory set of revoked users and refresh-token sessions.
+
+    Lookups hit a bloom filter first, so the common (not revoked) case never
+    touches the exact set. Suspended or inactive users are keyed by user id;
+    revoked refresh tokens are keyed by the ``sid`` claim carried by the access
+    tokens issued alongside them, and only kept for one access-token lifetime.
+    """
+
+    _USER_PREFIX = "user:"
+    _SESSION_PREFIX = "sid:"
+    _WATERMARK_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self, *, size_bits: int, hash_count: int, session_ttl: timedelta):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+        self._bloom = _BloomFilter(size_bits, hash_count)
+        self._entries: dict[str, datetime | None] = {}
+        self._users_watermark: datetime | None = None
+        self._sessions_watermark: datetime | None = None
+
+    def is_revoked(self, user_id: str, session_id: str | None = None) -> bool:
+        keys = [f"{self._USER_PREFIX}{user_id}"]
+        if session_id:
+            keys.append(f"{self._SESSION_PREFIX}{session_id}")
+        return any(
+            self._bloom.might_contain(key) and key in self._entries for key in keys
+        )
+
+    def revoke_user(self, user_id: Any) -> None:
+        self._add(f"{self._USER_PREFIX}{user_id}", None)
+
+    def restore_user(self, user_id: Any) -> None:
+        with self._lock:
+            self._entries.pop(f"{self._USER_PREFIX}{user_id}", None)
+
+    def revoke_session(
+        self, session_id: Any, revoked_at: datetime | None = None
+    ) -> None:
+        self._add(
+            f"{self._SESSION_PREFIX}{session_id}",
+            revoked_at or datetime.now(timezone.utc),
+        )
+
+    def refresh(self, session: Session, now: datetime | None = None) -> None:
+        """Apply suspensions and refresh-token revocations since the last run."""
+        from app.db.models import RefreshToken, User
+
+        reference = now or datetime.now(timezone.utc)
+
+        user_stmt = select(User.id, User.is_active, User.is_suspended, User.updated_at)
+        if self._users_watermark is None:
+            user_stmt = user_stmt.where(
+                or_(User.is_suspended.is_(True), User.is_active.is_(False))
+            )
+        else:
+            user_stmt = user_stmt.where(
+                User.updated_at > self._users_watermark - self._WATERMARK_OVERLAP
+            )
+        users_watermark = self._users_watermark
+        for user_id, is_active, is_suspended, updated_at in session.execute(user_stmt):
+            if is_suspended or not is_active:
+                self.revoke_user(user_id)
+            else:
+                self.restore_user(user_id)
+            if updated_at is not None:
+                updated_at = _as_aware(updated_at)
+                if users_watermark is None or updated_at > users_watermark:
+                    users_watermark = updated_at
+        self._users_watermark = users_watermark or reference
+
+        since = self._sessions_watermark or (reference - self.session_ttl)
+        token_stmt = select(RefreshToken.id, RefreshToken.revoked_at).where(
+            RefreshToken.revoked_at > since - self._WATERMARK_OVERLAP
+        )
+        sessions_watermark = self._sessions_watermark
+        for token_id, revoked_at in session.execute(token_stmt):
+            revoked_at = _as_aware(revoked_at)
+            self.revoke_session(token_id, revoked_at)
+            if sessions_watermark is None or revoked_at > sessions_watermark:
+                sessions_watermark = revoked_at
+        self._sessions_watermark = sessions_watermark or reference
+
+        self.prune(reference)
+
+    def prune(self, now: datetime | None = None) -> None:
+        """Drop session revocations older than an access token and rebuild."""
+        cutoff = (now or datetime.now(timezone.utc)) - self.session_ttl
+        with self._lock:
+            expired = [
+                key
+                for key, revoked_at in self._entries.items()
+                if revoked_at is not None and _as_aware(revoked_at) < cutoff
+            ]
+            for key in expired:
+                del self._entries[key]
+            if expired:
+                self._rebuild_locked()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._users_watermark = None
+            self._sessions_watermark = None
+            self._rebuild_locked()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add(self, key: str, revoked_at: datetime | None) -> None:
+        with self._lock:
+            self._entries[key] = revoked_at
+            self._bloom.add(key)
+
+    def _rebuild_locked(self) -> None:
+        bloom = _BloomFilter(self.size_bits, self.hash_count)
+        for key in self._entries:
+            bloom.add(key)
+        self._bloom = bloom
+
+
+def _as_aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+_settings = get_settings()
+
+token_cache = VerifiedTokenCache(maxsize=_settings.token_cache_size)
+revocation_filter = RevocationFilter(
+    size_bits=_settings.token_revocation_bloom_bits,
+    hash_count=_settings.token_revocation_bloom_hashes,
+    session_ttl=timedelta(minutes=_settings.access_token_expire_minutes),
+)
+
+
+__all__ = [
+    "RevocationFilter",
+    "VerifiedTokenCache",
+    "revocation_filter",
+    "token_cache",
+]
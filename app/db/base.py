@@ -9,12 +9,14 @@ class Base(DeclarativeBase):
 try:
     from app.db.models import (
         audit_log,  # noqa: F401
+        benchmark,  # noqa: F401
         commercial_plan,  # noqa: F401
         refresh_token,  # noqa: F401
         tenant,  # noqa: F401
         tenant_company,  # noqa: F401
         tenant_plan_subscription,  # noqa: F401
         user,  # noqa: F401
+        user_login_hint,  # noqa: F401
     )
 except ImportError:
     pass
@@ -1,4 +1,9 @@
 from app.db.models.audit_log import AuditLog
+from app.db.models.benchmark import (
+    BenchmarkAggregate,
+    BenchmarkBatch,
+    BenchmarkRollup,
+)
 from app.db.models.commercial_plan import CommercialPlan
 from app.db.models.financial_settings import FinancialSettings
 from app.db.models.payment_plan_installment import PaymentPlanInstallment
@@ -8,9 +13,13 @@ from app.db.models.tenant import Tenant
 from app.db.models.tenant_company import TenantCompany
 from app.db.models.tenant_plan_subscription import TenantPlanSubscription
 from app.db.models.user import User
+from app.db.models.user_login_hint import UserLoginHint
 
 __all__ = [
     "AuditLog",
+    "BenchmarkAggregate",
+    "BenchmarkBatch",
+    "BenchmarkRollup",
     "CommercialPlan",
     "FinancialSettings",
     "PaymentPlanInstallment",
@@ -20,4 +29,5 @@ __all__ = [
     "TenantCompany",
     "TenantPlanSubscription",
     "User",
+    "UserLoginHint",
 ]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from sqlalchemy import (
+    Column,
+    Float,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.models.base import Base, TimestampMixin
+
+
+class BenchmarkBatch(Base, TimestampMixin):
+    __tablename__ = "benchmark_batches"
+
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    batch_id = Column(UUID(as_uuid=True), primary_key=True)
+    total_rows = Column(Integer, nullable=False)
+    discarded_rows = Column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<BenchmarkBatch(tenant_id={self.tenant_id}, batch_id={self.batch_id})>"
+
+
+class BenchmarkAggregate(Base):
+    """Running statistics of one bucket of a benchmark batch.
+
+    Buckets under the k-anonymity threshold are kept too, so appended slices
+    can merge into them; readers filter on ``count``. The primary key leads
+    with ``(tenant_id, batch_id)`` so listing a batch is a single index range
+    scan.
+    """
+
+    __tablename__ = "benchmark_aggregates"
+
+    tenant_id = Column(UUID(as_uuid=True), primary_key=True)
+    batch_id = Column(UUID(as_uuid=True), primary_key=True)
+    metric_code = Column(Text, primary_key=True)
+    segment_bucket = Column(String(16), primary_key=True)
+    region_bucket = Column(String(16), primary_key=True)
+    count = Column(Integer, nullable=False)
+    value_sum = Column(Float(precision=53), nullable=True)
+    average_value = Column(Float, nullable=False)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+    # Serialized KLLSketch of the bucket's values (see app.services.sketches).
+    sketch = Column(LargeBinary, nullable=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["tenant_id", "batch_id"],
+            ["benchmark_batches.tenant_id", "benchmark_batches.batch_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+
+class BenchmarkRollup(Base):
+    """One cell of a benchmark cube (see ``app.services.benchmarking.build_cube``).
+
+    ``scope`` is the batch id for a batch's cube or ``"market"`` for the
+    tenant-wide cube across batches; a ``"*"`` bucket means the dimension is
+    rolled up. Cells only merge batch buckets that meet the k-anonymity
+    threshold, so suppressed buckets never show through a rollup.
+    """
+
+    __tablename__ = "benchmark_rollups"
+
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    scope = Column(String(36), primary_key=True)
+    metric_code = Column(Text, primary_key=True)
+    segment_bucket = Column(String(16), primary_key=True)
+    region_bucket = Column(String(16), primary_key=True)
+    count = Column(Integer, nullable=False)
+    value_sum = Column(Float(precision=53), nullable=False)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+    sketch = Column(LargeBinary, nullable=True)
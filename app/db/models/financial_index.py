@@ -24,3 +24,22 @@ class FinancialIndexValue(Base, UUIDMixin, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<FinancialIndexValue(id={self.id}, index_code='{self.index_code}', date='{self.reference_date}')>"
+
+
+class FinancialIndexCumulative(Base):
+    """Running product of an index's monthly values, maintained at write time.
+
+    ``cumulative`` at a month is the product of every first-of-month value up
+    to and including it, so the correction between two months is a ratio.
+    """
+
+    __tablename__ = "financial_index_cumulative"
+
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    index_code = Column(String(32), primary_key=True)
+    reference_date = Column(Date, primary_key=True)
+    cumulative = Column(Float(precision=53), nullable=False)
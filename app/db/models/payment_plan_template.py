@@ -1,17 +1,21 @@
 import uuid
 
+from collections.abc import Iterable
+
 from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
+    Integer,
     JSON,
     Numeric,
     String,
     UniqueConstraint,
     func,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -46,6 +50,15 @@ class PaymentPlanTemplate(Base):
         onupdate=func.now(),
     )
 
+    # Packed copy of the installment rows (same order, sorted by period) so
+    # read paths can use a template without loading its installments.
+    installment_periods = Column(
+        ARRAY(Integer).with_variant(JSON(), "sqlite"), nullable=True
+    )
+    installment_amounts = Column(
+        ARRAY(Float(precision=53)).with_variant(JSON(), "sqlite"), nullable=True
+    )
+
     installments = relationship(
         "PaymentPlanInstallment",
         back_populates="template",
@@ -53,3 +66,15 @@ class PaymentPlanTemplate(Base):
         order_by="PaymentPlanInstallment.period",
         lazy="joined",
     )
+
+    def pack_installments(self, installments: Iterable[tuple[int, float]]) -> None:
+        ordered = sorted(installments)
+        self.installment_periods = [int(period) for period, _ in ordered]
+        self.installment_amounts = [float(amount) for _, amount in ordered]
+
+    @property
+    def packed_installments(self) -> list[tuple[int, float]] | None:
+        """``(period, amount)`` pairs, or None when the template is not packed."""
+        if self.installment_periods is None or self.installment_amounts is None:
+            return None
+        return list(zip(self.installment_periods, self.installment_amounts))
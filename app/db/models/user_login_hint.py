@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, ForeignKey, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class UserLoginHint(Base):
+    """Last tenant an email successfully authenticated against.
+
+    Tenant membership itself is resolved through ``users`` (indexed by email);
+    this table only stores the hint used to pick the account to verify when an
+    email belongs to several tenants.
+    """
+
+    __tablename__ = "user_login_hints"
+
+    email = Column(String(320), primary_key=True)
+    tenant_id = Column(
+        UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False
+    )
+    last_login_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
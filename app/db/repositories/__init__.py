@@ -1,4 +1,5 @@
 from . import (
+    benchmark,
     financial_index,
     financial_settings,
     payment_plan_template,
@@ -7,6 +8,7 @@ from . import (
 )
 
 __all__ = [
+    "benchmark",
     "financial_index",
     "financial_settings",
     "payment_plan_template",
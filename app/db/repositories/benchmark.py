@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, delete, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.models.benchmark import BenchmarkAggregate, BenchmarkBatch, BenchmarkRollup
+from app.db.models.tenant import Tenant
+from app.db.routing import bind_tenant
+from app.services.benchmarking import (
+    K_ANONYMITY_THRESHOLD,
+    AggregatedBenchmark,
+    BenchmarkIngestResult,
+    BenchmarkRepository,
+    BucketState,
+    RunningAggregation,
+    appended_cube,
+    build_cube,
+    publishable,
+)
+from app.services.sketches import KLLSketch
+
+_BatchKey = Tuple[UUID, UUID | None]
+
+# ``BenchmarkRollup.scope`` of the tenant-wide cube across batches.
+MARKET_SCOPE = "market"
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+_BUCKET_COLUMNS = (
+    BenchmarkAggregate.metric_code,
+    BenchmarkAggregate.segment_bucket,
+    BenchmarkAggregate.region_bucket,
+)
+
+
+_ROLLUP_COLUMNS = (
+    BenchmarkRollup.metric_code,
+    BenchmarkRollup.segment_bucket,
+    BenchmarkRollup.region_bucket,
+)
+
+
+def _states_stmt(
+    tenant_id: UUID, batch_id: UUID | None, *, min_count: int | None = None
+) -> Select:
+    """Bucket states of a batch, or of every batch of the tenant if None."""
+    stmt = (
+        select(
+            *_BUCKET_COLUMNS,
+            BenchmarkAggregate.count,
+            BenchmarkAggregate.value_sum,
+            BenchmarkAggregate.average_value,
+            BenchmarkAggregate.min_value,
+            BenchmarkAggregate.max_value,
+            BenchmarkAggregate.sketch,
+        )
+        .where(BenchmarkAggregate.tenant_id == tenant_id)
+        .order_by(*_BUCKET_COLUMNS)
+    )
+    if batch_id is not None:
+        stmt = stmt.where(BenchmarkAggregate.batch_id == batch_id)
+    if min_count is not None:
+        # Buckets under the threshold are stored for later merges only.
+        stmt = stmt.where(BenchmarkAggregate.count >= min_count)
+    return stmt
+
+
+def _rollups_stmt(
+    tenant_id: UUID, scope: str, *, min_count: int | None = None
+) -> Select:
+    stmt = (
+        select(
+            *_ROLLUP_COLUMNS,
+            BenchmarkRollup.count,
+            BenchmarkRollup.value_sum,
+            BenchmarkRollup.min_value,
+            BenchmarkRollup.max_value,
+            BenchmarkRollup.sketch,
+        )
+        .where(BenchmarkRollup.tenant_id == tenant_id, BenchmarkRollup.scope == scope)
+        .order_by(*_ROLLUP_COLUMNS)
+    )
+    if min_count is not None:
+        stmt = stmt.where(BenchmarkRollup.count >= min_count)
+    return stmt
+
+
+def _scope(batch_id: UUID | None) -> str:
+    return str(batch_id) if batch_id is not None else MARKET_SCOPE
+
+
+def _state_from_row(row) -> BucketState:
+    return BucketState(
+        metric_code=row.metric_code,
+        segment_bucket=row.segment_bucket,
+        region_bucket=row.region_bucket,
+        count=row.count,
+        # Rows written before value_sum existed only kept the rounded average.
+        total=(
+            row.value_sum
+            if row.value_sum is not None
+            else row.average_value * row.count
+        ),
+        min_value=row.min_value,
+        max_value=row.max_value,
+        sketch=KLLSketch.from_bytes(row.sketch) if row.sketch is not None else None,
+    )
+
+
+def _state_rows(
+    tenant_id: UUID, batch_id: UUID, states: Iterable[BucketState]
+) -> List[dict]:
+    return [
+        {
+            "tenant_id": tenant_id,
+            "batch_id": batch_id,
+            "metric_code": state.metric_code,
+            "segment_bucket": state.segment_bucket,
+            "region_bucket": state.region_bucket,
+            "count": state.count,
+            "value_sum": state.total,
+            "average_value": round(state.total / state.count, 2),
+            "min_value": state.min_value,
+            "max_value": state.max_value,
+            "sketch": state.sketch.to_bytes() if state.sketch is not None else None,
+        }
+        for state in states
+    ]
+
+
+def _rollup_rows(
+    tenant_id: UUID, scope: str, cells: Iterable[BucketState]
+) -> List[dict]:
+    return [
+        {
+            "tenant_id": tenant_id,
+            "scope": scope,
+            "metric_code": cell.metric_code,
+            "segment_bucket": cell.segment_bucket,
+            "region_bucket": cell.region_bucket,
+            "count": cell.count,
+            "value_sum": cell.total,
+            "min_value": cell.min_value,
+            "max_value": cell.max_value,
+            "sketch": cell.sketch.to_bytes() if cell.sketch is not None else None,
+        }
+        for cell in cells
+    ]
+
+
+def _bucket_key(item: AggregatedBenchmark) -> Tuple[str, str, str]:
+    return (item.metric_code, item.segment_bucket, item.region_bucket)
+
+
+class AggregationCache:
+    """Small TTL + LRU cache of aggregations per ``(tenant_id, batch_id)``.
+
+    Writes in this process refresh the entry directly; the TTL bounds how
+    long another worker's write can go unseen.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[
+            _BatchKey, tuple[float, List[AggregatedBenchmark]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: _BatchKey) -> List[AggregatedBenchmark] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, aggregations = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return aggregations
+
+    def put(self, key: _BatchKey, aggregations: List[AggregatedBenchmark]) -> None:
+        if self.maxsize <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, aggregations)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def merge(self, key: _BatchKey, aggregations: List[AggregatedBenchmark]) -> None:
+        """Replace the cached buckets of ``aggregations`` if ``key`` is cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            expires_at, cached = entry
+            replaced = {_bucket_key(item) for item in aggregations}
+            self._entries[key] = (
+                expires_at,
+                sorted(
+                    [item for item in cached if _bucket_key(item) not in replaced]
+                    + aggregations,
+                    key=_bucket_key,
+                ),
+            )
+
+    def discard(self, key: _BatchKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqlBenchmarkRepository(BenchmarkRepository):
+    """Persist benchmark batches and their bucket states in the database.
+
+    Every bucket is stored, including those under the k-anonymity threshold,
+    so ``append`` can merge later slices; ``list`` only returns buckets that
+    meet the threshold. Each call opens a short-lived session from
+    ``session_factory`` so the repository can back the module-level
+    benchmarking service.
+
+    Writes also refresh the batch's rollup cube and the tenant's market cube
+    in the same transaction. Writes of one tenant are serialized on its
+    tenant row so concurrent batches never lose a market merge.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        cache: AggregationCache | None = None,
+    ) -> None:
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.cache = (
+            cache
+            if cache is not None
+            else AggregationCache(
+                settings.benchmark_cache_size, settings.benchmark_cache_ttl_seconds
+            )
+        )
+        self.cube_cache = AggregationCache(self.cache.maxsize, self.cache.ttl_seconds)
+
+    def store(self, result: BenchmarkIngestResult) -> None:
+        with self._session(result.tenant_id) as session:
+            try:
+                self._lock_tenant(session, result.tenant_id)
+                session.merge(
+                    BenchmarkBatch(
+                        tenant_id=result.tenant_id,
+                        batch_id=result.batch_id,
+                        total_rows=result.total_rows,
+                        discarded_rows=result.discarded_rows,
+                    )
+                )
+                replaced = session.execute(
+                    delete(BenchmarkAggregate).where(
+                        BenchmarkAggregate.tenant_id == result.tenant_id,
+                        BenchmarkAggregate.batch_id == result.batch_id,
+                    )
+                ).rowcount
+                self._insert_states(session, result, result.buckets)
+                cube = build_cube(result.buckets)
+                self._replace_rollups(
+                    session, result.tenant_id, _scope(result.batch_id), cube
+                )
+                if replaced:
+                    # Sketches cannot be subtracted: rebuild the market cube.
+                    self._replace_rollups(
+                        session,
+                        result.tenant_id,
+                        MARKET_SCOPE,
+                        build_cube(
+                            _state_from_row(row)
+                            for row in session.execute(
+                                _states_stmt(
+                                    result.tenant_id,
+                                    None,
+                                    min_count=K_ANONYMITY_THRESHOLD,
+                                )
+                            )
+                        ),
+                    )
+                else:
+                    self._merge_rollups(session, result.tenant_id, MARKET_SCOPE, cube)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        self.cache.put((result.tenant_id, result.batch_id), publishable(result.buckets))
+        self._cache_cubes(result, cube)
+
+    def append(self, result: BenchmarkIngestResult) -> List[BucketState]:
+        with self._session(result.tenant_id) as session:
+            try:
+                self._lock_tenant(session, result.tenant_id)
+                batch = self._lock_batch(session, result)
+                batch.total_rows += result.total_rows
+                batch.discarded_rows += result.discarded_rows
+                touched = list({state.key for state in result.buckets})
+                aggregation = RunningAggregation()
+                previous_counts = {}
+                if touched:
+                    # Only the slice's buckets change: read and rewrite just those.
+                    for row in session.execute(
+                        _states_stmt(result.tenant_id, result.batch_id).where(
+                            tuple_(*_BUCKET_COLUMNS).in_(touched)
+                        )
+                    ):
+                        state = _state_from_row(row)
+                        previous_counts[state.key] = state.count
+                        aggregation.merge_state(state)
+                    for state in result.buckets:
+                        aggregation.merge_state(state)
+                    session.execute(
+                        delete(BenchmarkAggregate).where(
+                            BenchmarkAggregate.tenant_id == result.tenant_id,
+                            BenchmarkAggregate.batch_id == result.batch_id,
+                            tuple_(*_BUCKET_COLUMNS).in_(touched),
+                        )
+                    )
+                merged = aggregation.states()
+                self._insert_states(session, result, merged)
+                # Cubes are mergeable, so the delta of the batch's published
+                # buckets updates both the batch cube and the market cube.
+                cube = appended_cube(previous_counts, merged, result.buckets)
+                for scope in (_scope(result.batch_id), MARKET_SCOPE):
+                    self._merge_rollups(session, result.tenant_id, scope, cube)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        self.cache.merge((result.tenant_id, result.batch_id), publishable(merged))
+        for scope in (result.batch_id, None):
+            self.cube_cache.discard((result.tenant_id, scope))
+        return merged
+
+    def list(self, tenant_id: UUID, batch_id: UUID) -> List[AggregatedBenchmark]:
+        key = (tenant_id, batch_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        with self._session(tenant_id) as session:
+            rows = session.execute(
+                _states_stmt(
+                    tenant_id, batch_id, min_count=K_ANONYMITY_THRESHOLD
+                ).execution_options(read_replica=True)
+            ).all()
+        aggregations = [_state_from_row(row).to_aggregate() for row in rows]
+        self.cache.put(key, aggregations)
+        return aggregations
+
+    def cube(self, tenant_id: UUID, batch_id: UUID | None) -> List[AggregatedBenchmark]:
+        key = (tenant_id, batch_id)
+        cached = self.cube_cache.get(key)
+        if cached is not None:
+            return cached
+        with self._session(tenant_id) as session:
+            rows = session.execute(
+                _rollups_stmt(
+                    tenant_id, _scope(batch_id), min_count=K_ANONYMITY_THRESHOLD
+                ).execution_options(read_replica=True)
+            ).all()
+        cells = [_state_from_row(row).to_aggregate() for row in rows]
+        self.cube_cache.put(key, cells)
+        return cells
+
+    def _cache_cubes(
+        self, result: BenchmarkIngestResult, cube: List[BucketState]
+    ) -> None:
+        self.cube_cache.put((result.tenant_id, result.batch_id), publishable(cube))
+        self.cube_cache.discard((result.tenant_id, None))
+
+    def _session(self, tenant_id: UUID) -> Session:
+        session = self.session_factory()
+        bind_tenant(session, str(tenant_id))
+        return session
+
+    @staticmethod
+    def _lock_tenant(session: Session, tenant_id: UUID) -> None:
+        session.execute(
+            select(Tenant.id).where(Tenant.id == tenant_id).with_for_update()
+        )
+
+    @staticmethod
+    def _lock_batch(session: Session, result: BenchmarkIngestResult) -> BenchmarkBatch:
+        """Create the batch row if needed and lock it against concurrent slices."""
+        dialect_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        identity = {"tenant_id": result.tenant_id, "batch_id": result.batch_id}
+        if dialect_insert is not None:
+            session.execute(
+                dialect_insert(BenchmarkBatch)
+                .values(**identity, total_rows=0, discarded_rows=0)
+                .on_conflict_do_nothing()
+            )
+        batch = session.execute(
+            select(BenchmarkBatch).filter_by(**identity).with_for_update()
+        ).scalar_one_or_none()
+        if batch is None:
+            batch = BenchmarkBatch(**identity, total_rows=0, discarded_rows=0)
+            session.add(batch)
+        return batch
+
+    @staticmethod
+    def _insert_states(
+        session: Session, result: BenchmarkIngestResult, states: List[BucketState]
+    ) -> None:
+        if states:
+            # Executemany through insertmanyvalues: one round trip per few
+            # thousand rows instead of one per bucket.
+            session.execute(
+                insert(BenchmarkAggregate),
+                _state_rows(result.tenant_id, result.batch_id, states),
+            )
+
+    @staticmethod
+    def _replace_rollups(
+        session: Session, tenant_id: UUID, scope: str, cells: List[BucketState]
+    ) -> None:
+        session.execute(
+            delete(BenchmarkRollup).where(
+                BenchmarkRollup.tenant_id == tenant_id, BenchmarkRollup.scope == scope
+            )
+        )
+        if cells:
+            session.execute(
+                insert(BenchmarkRollup), _rollup_rows(tenant_id, scope, cells)
+            )
+
+    @staticmethod
+    def _merge_rollups(
+        session: Session, tenant_id: UUID, scope: str, cells: List[BucketState]
+    ) -> None:
+        """Merge ``cells`` into the stored cube, rewriting only their keys."""
+        if not cells:
+            return
+        keys = [cell.key for cell in cells]
+        aggregation = RunningAggregation()
+        for row in session.execute(
+            _rollups_stmt(tenant_id, scope).where(tuple_(*_ROLLUP_COLUMNS).in_(keys))
+        ):
+            aggregation.merge_state(_state_from_row(row))
+        for cell in cells:
+            aggregation.merge_state(cell)
+        session.execute(
+            delete(BenchmarkRollup).where(
+                BenchmarkRollup.tenant_id == tenant_id,
+                BenchmarkRollup.scope == scope,
+                tuple_(*_ROLLUP_COLUMNS).in_(keys),
+            )
+        )
+        session.execute(
+            insert(BenchmarkRollup),
+            _rollup_rows(tenant_id, scope, aggregation.states()),
+        )
+
+
+__all__ = ["MARKET_SCOPE", "AggregationCache", "SqlBenchmarkRepository"]
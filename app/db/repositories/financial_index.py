@@ -1,11 +1,220 @@
 from __future__ import annotations
 
+import uuid
+from collections.abc import Iterable
+from datetime import date
 from uuid import UUID
 
+from sqlalchemy import Delete, Select, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.schemas.financial_index import IndexValueInput
-from app.db.models.financial_index import FinancialIndexValue
+from app.db.models.financial_index import FinancialIndexCumulative, FinancialIndexValue
+
+
+def _by_index_code_stmt(tenant_id: UUID, index_code: str) -> Select:
+    return (
+        select(FinancialIndexValue)
+        .where(
+            FinancialIndexValue.tenant_id == tenant_id,
+            FinancialIndexValue.index_code == index_code,
+        )
+        .order_by(FinancialIndexValue.reference_date)
+        .execution_options(read_replica=True)
+    )
+
+
+# Five bound parameters per row keeps each chunk well under SQLite's limit.
+UPSERT_CHUNK_SIZE = 1000
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _dedupe_values(values: list[IndexValueInput]) -> list[IndexValueInput]:
+    """Keep the last value per reference date (ON CONFLICT rejects repeats)."""
+    return list({value.reference_date: value for value in values}.values())
+
+
+def _upsert_chunks(
+    dialect_name: str,
+    tenant_id: UUID,
+    index_code: str,
+    values: list[IndexValueInput],
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+):
+    """Yield one ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` per chunk.
+
+    Yields nothing for dialects without ``ON CONFLICT`` support.
+    """
+    dialect_insert = _UPSERT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        return
+    for start in range(0, len(values), chunk_size):
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "index_code": index_code,
+                "reference_date": value.reference_date,
+                "value": value.value,
+            }
+            for value in values[start : start + chunk_size]
+        ]
+        stmt = dialect_insert(FinancialIndexValue).values(rows)
+        yield stmt.on_conflict_do_update(
+            index_elements=[
+                FinancialIndexValue.tenant_id,
+                FinancialIndexValue.index_code,
+                FinancialIndexValue.reference_date,
+            ],
+            set_={"value": stmt.excluded.value, "updated_at": func.now()},
+        ).returning(FinancialIndexValue)
+
+
+def cumulative_series(
+    values: Iterable[tuple[date, float]], start: float = 1.0
+) -> list[tuple[date, float]]:
+    """Running product of first-of-month ``values`` (other days never apply)."""
+    running = start
+    series = []
+    for reference_date, value in sorted(values):
+        if reference_date.day != 1:
+            continue
+        running *= value
+        series.append((reference_date, running))
+    return series
+
+
+def _cumulative_stmt(tenant_id: UUID, index_code: str) -> Select:
+    return (
+        select(
+            FinancialIndexCumulative.reference_date, FinancialIndexCumulative.cumulative
+        )
+        .where(
+            FinancialIndexCumulative.tenant_id == tenant_id,
+            FinancialIndexCumulative.index_code == index_code,
+        )
+        .order_by(FinancialIndexCumulative.reference_date)
+        .execution_options(read_replica=True)
+    )
+
+
+def _cumulative_window_stmt(
+    tenant_id: UUID, index_code: str, start: date, end: date
+) -> Select:
+    """Cumulative rows in ``[start, end]`` plus the latest one at or before ``start``."""
+    floor = (
+        select(func.max(FinancialIndexCumulative.reference_date))
+        .where(
+            FinancialIndexCumulative.tenant_id == tenant_id,
+            FinancialIndexCumulative.index_code == index_code,
+            FinancialIndexCumulative.reference_date <= start,
+        )
+        .scalar_subquery()
+    )
+    return (
+        select(
+            FinancialIndexCumulative.reference_date, FinancialIndexCumulative.cumulative
+        )
+        .where(
+            FinancialIndexCumulative.tenant_id == tenant_id,
+            FinancialIndexCumulative.index_code == index_code,
+            FinancialIndexCumulative.reference_date >= func.coalesce(floor, start),
+            FinancialIndexCumulative.reference_date <= end,
+        )
+        .order_by(FinancialIndexCumulative.reference_date)
+        .execution_options(read_replica=True)
+    )
+
+
+def _has_cumulative_stmt(tenant_id: UUID, index_code: str) -> Select:
+    return (
+        select(FinancialIndexCumulative.reference_date)
+        .where(
+            FinancialIndexCumulative.tenant_id == tenant_id,
+            FinancialIndexCumulative.index_code == index_code,
+        )
+        .limit(1)
+        .execution_options(read_replica=True)
+    )
+
+
+def _cumulative_before_stmt(tenant_id: UUID, index_code: str, month: date) -> Select:
+    return (
+        select(FinancialIndexCumulative.cumulative)
+        .where(
+            FinancialIndexCumulative.tenant_id == tenant_id,
+            FinancialIndexCumulative.index_code == index_code,
+            FinancialIndexCumulative.reference_date < month,
+        )
+        .order_by(FinancialIndexCumulative.reference_date.desc())
+        .limit(1)
+    )
+
+
+def _values_since_stmt(tenant_id: UUID, index_code: str, month: date) -> Select:
+    return select(FinancialIndexValue.reference_date, FinancialIndexValue.value).where(
+        FinancialIndexValue.tenant_id == tenant_id,
+        FinancialIndexValue.index_code == index_code,
+        FinancialIndexValue.reference_date >= month,
+    )
+
+
+def _delete_cumulative_stmt(tenant_id: UUID, index_code: str, month: date) -> Delete:
+    return delete(FinancialIndexCumulative).where(
+        FinancialIndexCumulative.tenant_id == tenant_id,
+        FinancialIndexCumulative.index_code == index_code,
+        FinancialIndexCumulative.reference_date >= month,
+    )
+
+
+def _cumulative_rows(
+    tenant_id: UUID, index_code: str, series: list[tuple[date, float]]
+) -> list[dict]:
+    return [
+        {
+            "tenant_id": tenant_id,
+            "index_code": index_code,
+            "reference_date": reference_date,
+            "cumulative": cumulative,
+        }
+        for reference_date, cumulative in series
+    ]
+
+
+def _existing_values_stmt(
+    tenant_id: UUID, index_code: str, reference_dates: list[date]
+) -> Select:
+    return select(FinancialIndexValue).where(
+        FinancialIndexValue.tenant_id == tenant_id,
+        FinancialIndexValue.index_code == index_code,
+        FinancialIndexValue.reference_date.in_(reference_dates),
+    )
+
+
+def _merge_values(
+    existing_records: list[FinancialIndexValue],
+    tenant_id: UUID,
+    index_code: str,
+    values: list[IndexValueInput],
+) -> list[FinancialIndexValue]:
+    """Update existing rows in place and return the rows that must be added."""
+    existing_map = {record.reference_date: record for record in existing_records}
+    new_records = []
+    for value_input in values:
+        if record := existing_map.get(value_input.reference_date):
+            record.value = value_input.value
+        else:
+            new_records.append(
+                FinancialIndexValue(
+                    tenant_id=tenant_id,
+                    index_code=index_code,
+                    **value_input.model_dump(),
+                )
+            )
+    return new_records
 
 
 class FinancialIndexRepository:
@@ -15,38 +224,186 @@ class FinancialIndexRepository:
     def list_by_index_code(
         self, tenant_id: UUID, index_code: str
     ) -> list[FinancialIndexValue]:
-        return (
-            self._db.query(FinancialIndexValue)
-            .filter_by(tenant_id=tenant_id, index_code=index_code)
-            .order_by(FinancialIndexValue.reference_date)
-            .all()
+        return list(
+            self._db.execute(_by_index_code_stmt(tenant_id, index_code)).scalars()
         )
 
     def create_or_update_values(
+        self,
+        tenant_id: UUID,
+        index_code: str,
+        values: list[IndexValueInput],
+        *,
+        include_history: bool = False,
+    ) -> list[FinancialIndexValue]:
+        """Upsert ``values`` and return the affected rows by reference date.
+
+        With ``include_history`` the whole index is returned instead.
+        """
+        values = _dedupe_values(values)
+        self._db.flush()
+        affected: list[FinancialIndexValue] = []
+        statements = list(
+            _upsert_chunks(
+                self._db.get_bind().dialect.name, tenant_id, index_code, values
+            )
+        )
+        for stmt in statements:
+            affected.extend(
+                self._db.scalars(stmt, execution_options={"populate_existing": True})
+            )
+        if not statements:
+            affected = self._merge(tenant_id, index_code, values)
+        if values:
+            self.refresh_cumulative(
+                tenant_id, index_code, min(v.reference_date for v in values)
+            )
+        if include_history:
+            return self.list_by_index_code(tenant_id, index_code)
+        return sorted(affected, key=lambda record: record.reference_date)
+
+    def list_cumulative(
+        self, tenant_id: UUID, index_code: str
+    ) -> list[tuple[date, float]]:
+        return [
+            (row.reference_date, row.cumulative)
+            for row in self._db.execute(_cumulative_stmt(tenant_id, index_code))
+        ]
+
+    def list_cumulative_window(
+        self, tenant_id: UUID, index_code: str, start: date, end: date
+    ) -> list[tuple[date, float]]:
+        """``(month, cumulative)`` tuples needed to price ``start`` to ``end``."""
+        return [
+            (row.reference_date, row.cumulative)
+            for row in self._db.execute(
+                _cumulative_window_stmt(tenant_id, index_code, start, end)
+            )
+        ]
+
+    def has_values(self, tenant_id: UUID, index_code: str) -> bool:
+        return (
+            self._db.execute(_has_cumulative_stmt(tenant_id, index_code)).first()
+            is not None
+        )
+
+    def refresh_cumulative(self, tenant_id: UUID, index_code: str, since: date) -> None:
+        """Recompute the cumulative series from the month of ``since`` onwards."""
+        month = since.replace(day=1)
+        start = self._db.execute(
+            _cumulative_before_stmt(tenant_id, index_code, month)
+        ).scalar_one_or_none()
+        series = cumulative_series(
+            self._db.execute(_values_since_stmt(tenant_id, index_code, month)).all(),
+            start=1.0 if start is None else start,
+        )
+        self._db.execute(_delete_cumulative_stmt(tenant_id, index_code, month))
+        if series:
+            self._db.execute(
+                insert(FinancialIndexCumulative),
+                _cumulative_rows(tenant_id, index_code, series),
+            )
+
+    def _merge(
         self, tenant_id: UUID, index_code: str, values: list[IndexValueInput]
     ) -> list[FinancialIndexValue]:
         reference_dates = [v.reference_date for v in values]
-        existing_records = (
-            self._db.query(FinancialIndexValue)
-            .filter(
-                FinancialIndexValue.tenant_id == tenant_id,
-                FinancialIndexValue.index_code == index_code,
-                FinancialIndexValue.reference_date.in_(reference_dates),
-            )
-            .all()
-        )
-        existing_map = {record.reference_date: record for record in existing_records}
-
-        for value_input in values:
-            if record := existing_map.get(value_input.reference_date):
-                record.value = value_input.value
-            else:
-                new_record = FinancialIndexValue(
-                    tenant_id=tenant_id,
-                    index_code=index_code,
-                    **value_input.model_dump(),
-                )
-                self._db.add(new_record)
-
+        existing_records = list(
+            self._db.execute(
+                _existing_values_stmt(tenant_id, index_code, reference_dates)
+            ).scalars()
+        )
+        new_records = _merge_values(existing_records, tenant_id, index_code, values)
+        self._db.add_all(new_records)
         self._db.flush()
-        return self.list_by_index_code(tenant_id, index_code)
+        return existing_records + new_records
+
+
+class AsyncFinancialIndexRepository:
+    """``FinancialIndexRepository`` counterpart for the async engine."""
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def list_by_index_code(
+        self, tenant_id: UUID, index_code: str
+    ) -> list[FinancialIndexValue]:
+        result = await self._db.execute(_by_index_code_stmt(tenant_id, index_code))
+        return list(result.scalars())
+
+    async def create_or_update_values(
+        self,
+        tenant_id: UUID,
+        index_code: str,
+        values: list[IndexValueInput],
+        *,
+        include_history: bool = False,
+    ) -> list[FinancialIndexValue]:
+        values = _dedupe_values(values)
+        await self._db.flush()
+        affected: list[FinancialIndexValue] = []
+        statements = list(
+            _upsert_chunks(
+                self._db.get_bind().dialect.name, tenant_id, index_code, values
+            )
+        )
+        for stmt in statements:
+            result = await self._db.scalars(
+                stmt, execution_options={"populate_existing": True}
+            )
+            affected.extend(result)
+        if not statements:
+            reference_dates = [v.reference_date for v in values]
+            result = await self._db.execute(
+                _existing_values_stmt(tenant_id, index_code, reference_dates)
+            )
+            existing_records = list(result.scalars())
+            new_records = _merge_values(existing_records, tenant_id, index_code, values)
+            self._db.add_all(new_records)
+            await self._db.flush()
+            affected = existing_records + new_records
+        if values:
+            await self.refresh_cumulative(
+                tenant_id, index_code, min(v.reference_date for v in values)
+            )
+        if include_history:
+            return await self.list_by_index_code(tenant_id, index_code)
+        return sorted(affected, key=lambda record: record.reference_date)
+
+    async def list_cumulative(
+        self, tenant_id: UUID, index_code: str
+    ) -> list[tuple[date, float]]:
+        result = await self._db.execute(_cumulative_stmt(tenant_id, index_code))
+        return [(row.reference_date, row.cumulative) for row in result]
+
+    async def list_cumulative_window(
+        self, tenant_id: UUID, index_code: str, start: date, end: date
+    ) -> list[tuple[date, float]]:
+        result = await self._db.execute(
+            _cumulative_window_stmt(tenant_id, index_code, start, end)
+        )
+        return [(row.reference_date, row.cumulative) for row in result]
+
+    async def has_values(self, tenant_id: UUID, index_code: str) -> bool:
+        result = await self._db.execute(_has_cumulative_stmt(tenant_id, index_code))
+        return result.first() is not None
+
+    async def refresh_cumulative(
+        self, tenant_id: UUID, index_code: str, since: date
+    ) -> None:
+        month = since.replace(day=1)
+        start = (
+            await self._db.execute(
+                _cumulative_before_stmt(tenant_id, index_code, month)
+            )
+        ).scalar_one_or_none()
+        values = (
+            await self._db.execute(_values_since_stmt(tenant_id, index_code, month))
+        ).all()
+        series = cumulative_series(values, start=1.0 if start is None else start)
+        await self._db.execute(_delete_cumulative_stmt(tenant_id, index_code, month))
+        if series:
+            await self._db.execute(
+                insert(FinancialIndexCumulative),
+                _cumulative_rows(tenant_id, index_code, series),
+            )
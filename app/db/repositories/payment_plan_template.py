@@ -1,13 +1,106 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import uuid
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from decimal import Decimal
 from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, lazyload
 
-from app.db.models import PaymentPlanTemplate
+from app.db.models import PaymentPlanInstallment, PaymentPlanTemplate
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+@dataclass(frozen=True)
+class InstallmentDiff:
+    """Periods to write (new or changed amount) and periods to remove."""
+
+    upserts: dict[int, Decimal]
+    removed: tuple[int, ...]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.upserts and not self.removed
+
+
+def diff_installments(
+    current: Mapping[int, Decimal], desired: Mapping[int, Decimal]
+) -> InstallmentDiff:
+    upserts = {
+        period: amount
+        for period, amount in desired.items()
+        if current.get(period) != amount
+    }
+    removed = tuple(sorted(set(current) - set(desired)))
+    return InstallmentDiff(upserts=upserts, removed=removed)
+
+
+def _templates_select(with_installments: bool) -> Select:
+    stmt = select(PaymentPlanTemplate)
+    if not with_installments:
+        # Readers of the packed columns skip the joined installment rows; an
+        # unpacked template still loads them lazily on access.
+        stmt = stmt.options(lazyload(PaymentPlanTemplate.installments))
+    return stmt
+
+
+def _by_ids_stmt(
+    tenant_id: UUID,
+    ids: Sequence[UUID],
+    *,
+    only_active: bool,
+    with_installments: bool = True,
+) -> Select:
+    stmt = _templates_select(with_installments).where(
+        PaymentPlanTemplate.tenant_id == tenant_id,
+        PaymentPlanTemplate.id.in_(ids),
+    )
+    if only_active:
+        stmt = stmt.where(PaymentPlanTemplate.is_active.is_(True))
+    return stmt.order_by(PaymentPlanTemplate.product_code).execution_options(
+        read_replica=True
+    )
+
+
+def _normalize_product_codes(product_codes: Iterable[str]) -> tuple[str, ...]:
+    return tuple(
+        code.strip().lower() for code in product_codes if code and code.strip()
+    )
+
+
+def _by_product_codes_stmt(
+    tenant_id: UUID,
+    codes: Sequence[str],
+    *,
+    only_active: bool,
+    with_installments: bool = True,
+) -> Select:
+    stmt = _templates_select(with_installments).where(
+        PaymentPlanTemplate.tenant_id == tenant_id,
+        func.lower(PaymentPlanTemplate.product_code).in_(codes),
+    )
+    if only_active:
+        stmt = stmt.where(PaymentPlanTemplate.is_active.is_(True))
+    return stmt.order_by(PaymentPlanTemplate.product_code).execution_options(
+        read_replica=True
+    )
+
+
+def _by_id_stmt(tenant_id: UUID, template_id: UUID) -> Select:
+    return (
+        select(PaymentPlanTemplate)
+        .where(
+            PaymentPlanTemplate.tenant_id == tenant_id,
+            PaymentPlanTemplate.id == template_id,
+        )
+        .execution_options(read_replica=True)
+    )
 
 
 class PaymentPlanTemplateRepository:
@@ -15,46 +108,149 @@ class PaymentPlanTemplateRepository:
         self.session = session
 
     def list_by_ids(
-        self, tenant_id: UUID, template_ids: Iterable[UUID], *, only_active: bool = True
+        self,
+        tenant_id: UUID,
+        template_ids: Iterable[UUID],
+        *,
+        only_active: bool = True,
+        with_installments: bool = True,
     ) -> list[PaymentPlanTemplate]:
         ids: Sequence[UUID] = tuple(template_ids)
         if not ids:
             return []
-        stmt = select(PaymentPlanTemplate).where(
-            PaymentPlanTemplate.tenant_id == tenant_id,
-            PaymentPlanTemplate.id.in_(ids),
-        )
-        if only_active:
-            stmt = stmt.where(PaymentPlanTemplate.is_active.is_(True))
         result = self.session.execute(
-            stmt.order_by(PaymentPlanTemplate.product_code)
+            _by_ids_stmt(
+                tenant_id,
+                ids,
+                only_active=only_active,
+                with_installments=with_installments,
+            )
         ).unique()
         return list(result.scalars())
 
     def list_by_product_codes(
-        self, tenant_id: UUID, product_codes: Iterable[str], *, only_active: bool = True
+        self,
+        tenant_id: UUID,
+        product_codes: Iterable[str],
+        *,
+        only_active: bool = True,
+        with_installments: bool = True,
     ) -> list[PaymentPlanTemplate]:
-        normalized = tuple(
-            code.strip().lower() for code in product_codes if code and code.strip()
-        )
+        normalized = _normalize_product_codes(product_codes)
         if not normalized:
             return []
-        stmt = select(PaymentPlanTemplate).where(
-            PaymentPlanTemplate.tenant_id == tenant_id,
-            func.lower(PaymentPlanTemplate.product_code).in_(normalized),
-        )
-        if only_active:
-            stmt = stmt.where(PaymentPlanTemplate.is_active.is_(True))
         result = self.session.execute(
-            stmt.order_by(PaymentPlanTemplate.product_code)
+            _by_product_codes_stmt(
+                tenant_id,
+                normalized,
+                only_active=only_active,
+                with_installments=with_installments,
+            )
         ).unique()
         return list(result.scalars())
 
     def get_by_id(
         self, tenant_id: UUID, template_id: UUID
     ) -> PaymentPlanTemplate | None:
-        stmt = select(PaymentPlanTemplate).where(
-            PaymentPlanTemplate.tenant_id == tenant_id,
-            PaymentPlanTemplate.id == template_id,
+        return (
+            self.session.execute(_by_id_stmt(tenant_id, template_id))
+            .unique()
+            .scalar_one_or_none()
+        )
+
+    def apply_installment_diff(self, template_id: UUID, diff: InstallmentDiff) -> None:
+        """Apply ``diff`` with one bulk upsert and one delete, without committing.
+
+        Rows are keyed by ``(template_id, period)`` so unchanged installments
+        keep their ids and are never rewritten.
+        """
+        if diff.removed:
+            self.session.execute(
+                delete(PaymentPlanInstallment).where(
+                    PaymentPlanInstallment.template_id == template_id,
+                    PaymentPlanInstallment.period.in_(diff.removed),
+                )
+            )
+        if not diff.upserts:
+            return
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "template_id": template_id,
+                "period": period,
+                "amount": amount,
+            }
+            for period, amount in sorted(diff.upserts.items())
+        ]
+        dialect_insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if dialect_insert is None:
+            self._upsert_rows_individually(template_id, rows)
+            return
+        stmt = dialect_insert(PaymentPlanInstallment).values(rows)
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    PaymentPlanInstallment.template_id,
+                    PaymentPlanInstallment.period,
+                ],
+                set_={"amount": stmt.excluded.amount},
+            )
+        )
+
+    def _upsert_rows_individually(self, template_id: UUID, rows: list[dict]) -> None:
+        existing = set(
+            self.session.execute(
+                select(PaymentPlanInstallment.period).where(
+                    PaymentPlanInstallment.template_id == template_id,
+                    PaymentPlanInstallment.period.in_([row["period"] for row in rows]),
+                )
+            ).scalars()
         )
-        return self.session.execute(stmt).unique().scalar_one_or_none()
+        for row in rows:
+            if row["period"] in existing:
+                self.session.execute(
+                    update(PaymentPlanInstallment)
+                    .where(
+                        PaymentPlanInstallment.template_id == template_id,
+                        PaymentPlanInstallment.period == row["period"],
+                    )
+                    .values(amount=row["amount"])
+                )
+        new_rows = [row for row in rows if row["period"] not in existing]
+        if new_rows:
+            self.session.execute(insert(PaymentPlanInstallment), new_rows)
+
+
+class AsyncPaymentPlanTemplateRepository:
+    """``PaymentPlanTemplateRepository`` counterpart for the async engine."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def list_by_ids(
+        self, tenant_id: UUID, template_ids: Iterable[UUID], *, only_active: bool = True
+    ) -> list[PaymentPlanTemplate]:
+        ids: Sequence[UUID] = tuple(template_ids)
+        if not ids:
+            return []
+        result = await self.session.execute(
+            _by_ids_stmt(tenant_id, ids, only_active=only_active)
+        )
+        return list(result.unique().scalars())
+
+    async def list_by_product_codes(
+        self, tenant_id: UUID, product_codes: Iterable[str], *, only_active: bool = True
+    ) -> list[PaymentPlanTemplate]:
+        normalized = _normalize_product_codes(product_codes)
+        if not normalized:
+            return []
+        result = await self.session.execute(
+            _by_product_codes_stmt(tenant_id, normalized, only_active=only_active)
+        )
+        return list(result.unique().scalars())
+
+    async def get_by_id(
+        self, tenant_id: UUID, template_id: UUID
+    ) -> PaymentPlanTemplate | None:
+        result = await self.session.execute(_by_id_stmt(tenant_id, template_id))
+        return result.unique().scalar_one_or_none()
@@ -1,14 +1,40 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import Select, Update, delete, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models.refresh_token import RefreshToken
 
 
+@dataclass(frozen=True)
+class TableStats:
+    live_rows: int
+    dead_rows: int
+    total_bytes: int
+
+
+def _active_stmt(token_id: UUID, reference: datetime) -> Select:
+    return select(RefreshToken).where(
+        RefreshToken.id == token_id,
+        RefreshToken.revoked_at.is_(None),
+        RefreshToken.expires_at > reference,
+    )
+
+
+def _revoke_all_stmt(user_id: UUID) -> Update:
+    return (
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+
+
 class RefreshTokenRepository:
     def __init__(self, session: Session) -> None:
         self.session = session
@@ -37,15 +63,9 @@ class RefreshTokenRepository:
         return token
 
     def get_active(self, token_id: UUID, reference: datetime) -> RefreshToken | None:
-        return (
-            self.session.query(RefreshToken)
-            .filter(
-                RefreshToken.id == token_id,
-                RefreshToken.revoked_at.is_(None),
-                RefreshToken.expires_at > reference,
-            )
-            .one_or_none()
-        )
+        return self.session.execute(
+            _active_stmt(token_id, reference)
+        ).scalar_one_or_none()
 
     def revoke(self, token: RefreshToken) -> RefreshToken:
         token.revoked_at = datetime.now(timezone.utc)
@@ -55,11 +75,123 @@ class RefreshTokenRepository:
         return token
 
     def revoke_all_for_user(self, user_id: UUID) -> None:
-        (
-            self.session.query(RefreshToken)
-            .filter(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
-            .update(
-                {"revoked_at": datetime.now(timezone.utc)}, synchronize_session=False
-            )
+        self.session.execute(
+            _revoke_all_stmt(user_id), execution_options={"synchronize_session": False}
         )
         self.session.commit()
+
+    def prune(
+        self,
+        *,
+        expired_before: datetime,
+        revoked_before: datetime,
+        batch_size: int,
+        max_batches: int | None = None,
+    ) -> int:
+        """Delete expired or revoked tokens in batches of ``batch_size`` rows.
+
+        Expired and revoked tokens are pruned in two passes so each batch is
+        picked through its own index (``expires_at``, then the partial
+        ``revoked_at`` one); an ``OR`` of both would scan the table. Each batch
+        is committed on its own so locks stay short and replication is never
+        handed one huge transaction; ``max_batches`` bounds both passes
+        together. Returns the number of rows removed.
+        """
+        removed = 0
+        batches = 0
+        for condition in (
+            RefreshToken.expires_at <= expired_before,
+            RefreshToken.revoked_at <= revoked_before,
+        ):
+            while max_batches is None or batches < max_batches:
+                ids = list(
+                    self.session.execute(
+                        select(RefreshToken.id).where(condition).limit(batch_size)
+                    ).scalars()
+                )
+                if not ids:
+                    break
+                self.session.execute(
+                    delete(RefreshToken)
+                    .where(RefreshToken.id.in_(ids))
+                    .execution_options(synchronize_session=False)
+                )
+                self.session.commit()
+                removed += len(ids)
+                batches += 1
+                if len(ids) < batch_size:
+                    break
+        return removed
+
+    def table_stats(self) -> TableStats | None:
+        """Return live/dead tuple counts and on-disk size (PostgreSQL only)."""
+        bind = self.session.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+        row = self.session.execute(
+            text(
+                "SELECT n_live_tup, n_dead_tup, "
+                "pg_total_relation_size(relid) AS total_bytes "
+                "FROM pg_stat_user_tables WHERE relname = :table_name"
+            ),
+            {"table_name": RefreshToken.__tablename__},
+        ).one_or_none()
+        if row is None:
+            return None
+        return TableStats(
+            live_rows=int(row.n_live_tup or 0),
+            dead_rows=int(row.n_dead_tup or 0),
+            total_bytes=int(row.total_bytes or 0),
+        )
+
+
+class AsyncRefreshTokenRepository:
+    """``RefreshTokenRepository`` counterpart for the async engine.
+
+    Maintenance (``prune``/``table_stats``) stays on the sync repository.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def create(
+        self,
+        *,
+        token_id: UUID,
+        user_id: UUID,
+        token_hash: str,
+        expires_at: datetime,
+        user_agent: Optional[str],
+        ip_address: Optional[str],
+    ) -> RefreshToken:
+        token = RefreshToken(
+            id=token_id,
+            user_id=user_id,
+            token_hash=token_hash,
+            expires_at=expires_at,
+            user_agent=user_agent,
+            ip_address=ip_address,
+        )
+        self.session.add(token)
+        await self.session.commit()
+        await self.session.refresh(token)
+        return token
+
+    async def get_active(
+        self, token_id: UUID, reference: datetime
+    ) -> RefreshToken | None:
+        result = await self.session.execute(_active_stmt(token_id, reference))
+        return result.scalar_one_or_none()
+
+    async def revoke(self, token: RefreshToken) -> RefreshToken:
+        token.revoked_at = datetime.now(timezone.utc)
+        self.session.add(token)
+        await self.session.commit()
+        await self.session.refresh(token)
+        return token
+
+    async def revoke_all_for_user(self, user_id: UUID) -> None:
+        await self.session.execute(
+            _revoke_all_stmt(user_id), execution_options={"synchronize_session": False}
+        )
+        await self.session.commit()
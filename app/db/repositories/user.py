@@ -2,10 +2,94 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Insert, Select, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import User
+from app.db.models import Tenant, User, UserLoginHint
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def _by_email_stmt(tenant_id: UUID | str, email: str) -> Select:
+    return select(User).where(
+        User.tenant_id == tenant_id, User.email == _normalize_email(email)
+    )
+
+
+def _by_id_stmt(user_id: UUID | str) -> Select:
+    return select(User).where(User.id == user_id)
+
+
+def _by_email_unscoped_stmt(email: str) -> Select:
+    return (
+        select(User)
+        .where(User.email == _normalize_email(email))
+        .order_by(User.created_at, User.id)
+    )
+
+
+def _by_email_and_tenant_slug_stmt(email: str, tenant_slug: str) -> Select:
+    return (
+        select(User)
+        .join(Tenant, Tenant.id == User.tenant_id)
+        .where(
+            User.email == _normalize_email(email),
+            func.lower(Tenant.slug) == tenant_slug.strip().lower(),
+        )
+    )
+
+
+def _login_hint_stmt(email: str) -> Select:
+    return select(UserLoginHint.tenant_id).where(
+        UserLoginHint.email == _normalize_email(email)
+    )
+
+
+def _count_active_by_tenant_stmt(tenant_id: UUID | str) -> Select:
+    return (
+        select(func.count())
+        .select_from(User)
+        .where(User.tenant_id == tenant_id, User.is_active.is_(True))
+    )
+
+
+def _login_hint_upsert_stmt(
+    dialect_name: str, email: str, tenant_id: UUID | str
+) -> Insert | None:
+    """``INSERT ... ON CONFLICT (email) DO UPDATE`` for the login hint.
+
+    Concurrent first logins for the same email both land on the conflict
+    clause instead of one failing on the primary key. The row is only
+    rewritten when the tenant changes. None for dialects without
+    ``ON CONFLICT`` support.
+    """
+    dialect_insert = _UPSERT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        return None
+    stmt = dialect_insert(UserLoginHint).values(email=email, tenant_id=tenant_id)
+    return stmt.on_conflict_do_update(
+        index_elements=[UserLoginHint.email],
+        set_={"tenant_id": stmt.excluded.tenant_id, "last_login_at": func.now()},
+        where=UserLoginHint.tenant_id != stmt.excluded.tenant_id,
+    )
+
+
+def _apply_login_hint(
+    hint: UserLoginHint | None, email: str, tenant_id: UUID | str
+) -> UserLoginHint | None:
+    """Return the hint row to persist, or None when nothing changed."""
+    if hint is None:
+        return UserLoginHint(email=email, tenant_id=tenant_id)
+    if str(hint.tenant_id) == str(tenant_id):
+        return None
+    hint.tenant_id = tenant_id
+    return hint
 
 
 class UserRepository:
@@ -14,40 +98,121 @@ class UserRepository:
 
     @staticmethod
     def _normalize_email(email: str) -> str:
-        return email.strip().lower()
+        return _normalize_email(email)
 
     def get_by_email(self, tenant_id: UUID | str, email: str) -> User | None:
-        normalized = self._normalize_email(email)
-        stmt = select(User).where(User.tenant_id == tenant_id, User.email == normalized)
-        return self.session.execute(stmt).scalar_one_or_none()
+        return self.session.execute(
+            _by_email_stmt(tenant_id, email)
+        ).scalar_one_or_none()
 
     def get_by_id(self, user_id: UUID | str) -> User | None:
-        stmt = select(User).where(User.id == user_id)
-        return self.session.execute(stmt).scalar_one_or_none()
+        return self.session.execute(_by_id_stmt(user_id)).scalar_one_or_none()
 
     def get_by_email_unscoped(self, email: str) -> list[User]:
-        normalized = self._normalize_email(email)
-        stmt = select(User).where(User.email == normalized)
-        return self.session.execute(stmt).scalars().all()
+        return self.session.execute(_by_email_unscoped_stmt(email)).scalars().all()
+
+    def get_by_email_and_tenant_slug(self, email: str, tenant_slug: str) -> User | None:
+        return self.session.execute(
+            _by_email_and_tenant_slug_stmt(email, tenant_slug)
+        ).scalar_one_or_none()
+
+    def get_login_hint(self, email: str) -> UUID | None:
+        return self.session.execute(_login_hint_stmt(email)).scalar_one_or_none()
+
+    def record_login_hint(self, email: str, tenant_id: UUID | str) -> None:
+        normalized = _normalize_email(email)
+        stmt = _login_hint_upsert_stmt(
+            self.session.get_bind().dialect.name, normalized, tenant_id
+        )
+        if stmt is not None:
+            self.session.execute(stmt)
+            self.session.commit()
+            return
+        hint = _apply_login_hint(
+            self.session.get(UserLoginHint, normalized), normalized, tenant_id
+        )
+        if hint is None:
+            return
+        self.session.add(hint)
+        self.session.commit()
 
     def count_active_by_tenant(self, tenant_id: UUID | str) -> int:
-        stmt = (
-            select(func.count())
-            .select_from(User)
-            .where(User.tenant_id == tenant_id, User.is_active.is_(True))
+        return int(
+            self.session.execute(_count_active_by_tenant_stmt(tenant_id)).scalar_one()
         )
-        return int(self.session.execute(stmt).scalar_one())
 
     def create(self, user: User) -> User:
-        user.email = self._normalize_email(user.email)
+        user.email = _normalize_email(user.email)
         self.session.add(user)
         self.session.commit()
         self.session.refresh(user)
         return user
 
     def save(self, user: User) -> User:
-        user.email = self._normalize_email(user.email)
+        user.email = _normalize_email(user.email)
         self.session.add(user)
         self.session.commit()
         self.session.refresh(user)
         return user
+
+
+class AsyncUserRepository:
+    """``UserRepository`` counterpart for routes served by the async engine."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_by_email(self, tenant_id: UUID | str, email: str) -> User | None:
+        result = await self.session.execute(_by_email_stmt(tenant_id, email))
+        return result.scalar_one_or_none()
+
+    async def get_by_id(self, user_id: UUID | str) -> User | None:
+        result = await self.session.execute(_by_id_stmt(user_id))
+        return result.scalar_one_or_none()
+
+    async def get_by_email_unscoped(self, email: str) -> list[User]:
+        result = await self.session.execute(_by_email_unscoped_stmt(email))
+        return list(result.scalars().all())
+
+    async def get_by_email_and_tenant_slug(
+        self, email: str, tenant_slug: str
+    ) -> User | None:
+        result = await self.session.execute(
+            _by_email_and_tenant_slug_stmt(email, tenant_slug)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_login_hint(self, email: str) -> UUID | None:
+        result = await self.session.execute(_login_hint_stmt(email))
+        return result.scalar_one_or_none()
+
+    async def record_login_hint(self, email: str, tenant_id: UUID | str) -> None:
+        normalized = _normalize_email(email)
+        stmt = _login_hint_upsert_stmt(
+            self.session.get_bind().dialect.name, normalized, tenant_id
+        )
+        if stmt is not None:
+            await self.session.execute(stmt)
+            await self.session.commit()
+            return
+        hint = _apply_login_hint(
+            await self.session.get(UserLoginHint, normalized), normalized, tenant_id
+        )
+        if hint is None:
+            return
+        self.session.add(hint)
+        await self.session.commit()
+
+    async def count_active_by_tenant(self, tenant_id: UUID | str) -> int:
+        result = await self.session.execute(_count_active_by_tenant_stmt(tenant_id))
+        return int(result.scalar_one())
+
+    async def create(self, user: User) -> User:
+        user.email = _normalize_email(user.email)
+        self.session.add(user)
+        await self.session.commit()
+        await self.session.refresh(user)
+        return user
+
+    async def save(self, user: User) -> User:
+        return await self.create(user)
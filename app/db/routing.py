@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.dml import UpdateBase
+
+READ_REPLICA_OPTION = "read_replica"
+# Client-held marker of its last write (epoch seconds), sent as a cookie and
+# echoed in a header for clients without a cookie jar.
+WRITE_MARKER_COOKIE = "last_write_at"
+WRITE_MARKER_HEADER = "X-Last-Write-At"
+
+_READS_FROM_REPLICA = "reads_from_replica"
+_WROTE = "wrote"
+_TENANT_KEY = "tenant_key"
+_CLIENT_WROTE_AT = "client_wrote_at"
+_ON_WRITE = "on_write"
+
+TenantKey = str | Callable[[], Any] | None
+
+_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE("
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0"
+    ") END"
+)
+
+
+class ReplicaMonitor:
+    """Cached view of replica lag, refreshed out of band.
+
+    The replica is only considered usable after a successful probe that
+    measured a lag below ``max_lag_seconds`` no longer than ``stale_after``
+    seconds ago, so a dead probe loop falls back to the primary on its own.
+    """
+
+    def __init__(self, *, max_lag_seconds: float, stale_after: float) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.stale_after = stale_after
+        self.lag_seconds: float | None = None
+        self._checked_at: float | None = None
+
+    def probe(self, replica: Engine) -> float | None:
+        try:
+            with replica.connect() as connection:
+                lag = float(connection.execute(_LAG_QUERY).scalar_one() or 0)
+        except Exception:
+            lag = None
+        self.record(lag)
+        return lag
+
+    def record(self, lag_seconds: float | None, now: float | None = None) -> None:
+        self.lag_seconds = lag_seconds
+        self._checked_at = time.monotonic() if now is None else now
+
+    def is_healthy(self, now: float | None = None) -> bool:
+        if self.lag_seconds is None or self._checked_at is None:
+            return False
+        reference = time.monotonic() if now is None else now
+        if reference - self._checked_at > self.stale_after:
+            return False
+        return self.lag_seconds <= self.max_lag_seconds
+
+
+class ReadYourWritesTracker:
+    """Remember tenants that committed writes recently.
+
+    Their reads stay on the primary for ``window_seconds`` so a client never
+    reads its own change back from a replica that has not replayed it yet.
+
+    The map only covers writes committed by this process. With several
+    workers the next request may land elsewhere, so the client also carries
+    a write marker (see ``track_client_writes``) that any worker honours.
+    Markers are wall-clock times, so hosts must keep their clocks in sync.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        self.window_seconds = window_seconds
+        self._writes: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, tenant_key: str, now: float | None = None) -> None:
+        reference = time.monotonic() if now is None else now
+        with self._lock:
+            self._writes[tenant_key] = reference
+            if len(self._writes) > 10_000:
+                cutoff = reference - self.window_seconds
+                self._writes = {
+                    key: written_at
+                    for key, written_at in self._writes.items()
+                    if written_at >= cutoff
+                }
+
+    def is_sticky(self, tenant_key: str, now: float | None = None) -> bool:
+        written_at = self._writes.get(tenant_key)
+        if written_at is None:
+            return False
+        reference = time.monotonic() if now is None else now
+        return reference - written_at < self.window_seconds
+
+    def marker_is_fresh(self, written_at: float, now: float | None = None) -> bool:
+        """Whether a client marker written at ``written_at`` is in the window."""
+        reference = time.time() if now is None else now
+        return reference - written_at < self.window_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._writes.clear()
+
+
+class RoutingSession(Session):
+    """Session that sends eligible reads to a replica engine.
+
+    A read goes to the replica when the session was opened for a read-only
+    request (see ``use_replica_for_reads``) or the statement carries the
+    ``read_replica`` execution option, and only while the session has not
+    written, its tenant is outside the read-your-writes window and the
+    replica lag is acceptable. Everything else uses the primary ``bind``.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        replica_bind: Engine | None = None,
+        replica_monitor: ReplicaMonitor | None = None,
+        write_tracker: ReadYourWritesTracker | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+        self.replica_monitor = replica_monitor
+        self.write_tracker = write_tracker
+
+    def get_bind(self, mapper=None, clause=None, **kwargs: Any):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self.replica_bind is None:
+            return primary
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[_WROTE] = True
+            return primary
+        if self._can_use_replica(clause):
+            return self.replica_bind
+        return primary
+
+    def commit(self) -> None:
+        wrote = self.info.get(_WROTE, False) or bool(
+            self.new or self.dirty or self.deleted
+        )
+        super().commit()
+        if not wrote:
+            return
+        if self.write_tracker is not None:
+            tenant_key = self._tenant_key()
+            if tenant_key:
+                self.write_tracker.mark(tenant_key)
+        on_write = self.info.get(_ON_WRITE)
+        if on_write is not None:
+            on_write(time.time())
+
+    def _can_use_replica(self, clause: Executable | None) -> bool:
+        if self.info.get(_WROTE):
+            return False
+        explicit = clause is not None and bool(
+            clause.get_execution_options().get(READ_REPLICA_OPTION, False)
+        )
+        # Raw SQL may write, so it only reaches the replica when asked to.
+        requested = explicit or (
+            self.info.get(_READS_FROM_REPLICA, False)
+            and not isinstance(clause, TextClause)
+        )
+        if not requested:
+            return False
+        if self.write_tracker is not None:
+            tenant_key = self._tenant_key()
+            if tenant_key and self.write_tracker.is_sticky(tenant_key):
+                return False
+            client_wrote_at = self.info.get(_CLIENT_WROTE_AT)
+            if client_wrote_at is not None and self.write_tracker.marker_is_fresh(
+                client_wrote_at
+            ):
+                return False
+        return self.replica_monitor is None or self.replica_monitor.is_healthy()
+
+    def _tenant_key(self) -> str | None:
+        tenant_key = self.info.get(_TENANT_KEY)
+        if callable(tenant_key):
+            tenant_key = tenant_key()
+        return str(tenant_key) if tenant_key else None
+
+
+def use_replica_for_reads(session: Session, *, tenant_key: TenantKey) -> None:
+    """Route every read of ``session`` to the replica when it is safe."""
+    session.info[_READS_FROM_REPLICA] = True
+    bind_tenant(session, tenant_key)
+
+
+def bind_tenant(session: Session, tenant_key: TenantKey) -> None:
+    """Associate ``session`` with a tenant for read-your-writes stickiness.
+
+    ``tenant_key`` may be a callable so request sessions can resolve the
+    tenant lazily, after authentication has populated the request state.
+    """
+    if tenant_key:
+        session.info[_TENANT_KEY] = tenant_key
+
+
+def track_client_writes(
+    session: Session,
+    *,
+    marker: str | None,
+    on_write: Callable[[float], None],
+) -> None:
+    """Carry read-your-writes across workers through a client-held marker.
+
+    ``marker`` is the last write time the client sent back; while it is
+    inside the tracker's window the session reads from the primary.
+    ``on_write`` receives the time of each committed write so the caller can
+    hand the client a fresh marker.
+    """
+    try:
+        session.info[_CLIENT_WROTE_AT] = float(marker) if marker else None
+    except ValueError:
+        session.info[_CLIENT_WROTE_AT] = None
+    session.info[_ON_WRITE] = on_write
+
+
+__all__ = [
+    "READ_REPLICA_OPTION",
+    "WRITE_MARKER_COOKIE",
+    "WRITE_MARKER_HEADER",
+    "ReadYourWritesTracker",
+    "ReplicaMonitor",
+    "RoutingSession",
+    "bind_tenant",
+    "track_client_writes",
+    "use_replica_for_reads",
+]
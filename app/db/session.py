@@ -1,21 +1,169 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from functools import lru_cache, partial
+from typing import Any
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import get_settings
+from app.db.routing import (
+    WRITE_MARKER_COOKIE,
+    WRITE_MARKER_HEADER,
+    ReadYourWritesTracker,
+    ReplicaMonitor,
+    RoutingSession,
+    bind_tenant,
+    track_client_writes,
+    use_replica_for_reads,
+)
+from app.observability.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url, echo=settings.database_echo, pool_pre_ping=True, future=True
+
+def pool_options(url: str, *, name: str, asynchronous: bool = False) -> dict[str, Any]:
+    """Pool keyword arguments for ``create_engine`` built from settings.
+
+    SQLite keeps SQLAlchemy's default single-connection pools, which reject the
+    sizing arguments.
+    """
+    options: dict[str, Any] = {
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "pool_logging_name": name,
+    }
+    if make_url(url).get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=(
+            InstrumentedAsyncAdaptedQueuePool if asynchronous else InstrumentedQueuePool
+        ),
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout_seconds,
+    )
+    return options
+
+
+engine = instrument_engine(
+    create_engine(
+        settings.database_url,
+        echo=settings.database_echo,
+        future=True,
+        **pool_options(settings.database_url, name="primary"),
+    )
+)
+replica_engine = (
+    instrument_engine(
+        create_engine(
+            settings.database_replica_url,
+            echo=settings.database_echo,
+            future=True,
+            **pool_options(settings.database_replica_url, name="replica"),
+        )
+    )
+    if settings.database_replica_url
+    else None
 )
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+replica_monitor = ReplicaMonitor(
+    max_lag_seconds=settings.database_replica_max_lag_seconds,
+    stale_after=settings.database_replica_lag_check_seconds * 3,
+)
+write_tracker = ReadYourWritesTracker(settings.database_read_your_writes_seconds)
+SessionLocal = sessionmaker(
+    bind=engine,
+    class_=RoutingSession,
+    autoflush=False,
+    autocommit=False,
+    replica_bind=replica_engine,
+    replica_monitor=replica_monitor,
+    write_tracker=write_tracker,
+)
+
+_READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+psycopg_async",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def _request_tenant(request: Request):
+    def resolve():
+        return request.path_params.get("tenant_id") or getattr(
+            request.state, "tenant_id", None
+        )
 
+    return resolve
 
-def get_db() -> Generator[Session, None, None]:
+
+def get_db(request: Request) -> Generator[Session, None, None]:
     db = SessionLocal()
+    if request.method in _READ_ONLY_METHODS:
+        use_replica_for_reads(db, tenant_key=_request_tenant(request))
+    else:
+        bind_tenant(db, _request_tenant(request))
+    if replica_engine is not None:
+        # WriteMarkerMiddleware hands ``request.state.last_write_at`` back.
+        track_client_writes(
+            db,
+            marker=request.cookies.get(WRITE_MARKER_COOKIE)
+            or request.headers.get(WRITE_MARKER_HEADER),
+            on_write=partial(setattr, request.state, "last_write_at"),
+        )
     try:
         yield db
     finally:
         db.close()
+
+
+def check_replica_lag() -> None:
+    if replica_engine is not None:
+        replica_monitor.probe(replica_engine)
+
+
+def async_database_url() -> str:
+    if settings.database_async_url:
+        return settings.database_async_url
+    url = make_url(settings.database_url)
+    drivername = _ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Build the async engine on first use so sync-only deployments never do."""
+    url = async_database_url()
+    async_engine = create_async_engine(
+        url,
+        echo=settings.database_echo,
+        **pool_options(url, name="async", asynchronous=True),
+    )
+    instrument_engine(async_engine.sync_engine)
+    return async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def uses_async_db(router_name: str) -> bool:
+    """Return True when ``router_name`` is listed in ASYNC_DB_ROUTERS."""
+    enabled = {
+        name.strip().lower()
+        for name in settings.async_db_routers.split(",")
+        if name.strip()
+    }
+    return router_name.lower() in enabled or "*" in enabled
@@ -11,22 +11,64 @@ from app.audit.middleware import AuditMiddleware
 from app.core.config import get_settings
 from app.core.errors import register_exception_handlers
 from app.core.logging import configure_logging
+from app.core.tasks import cancel_tasks, start_periodic_task
+from app.core.token_cache import revocation_filter
+from app.db.routing import WRITE_MARKER_HEADER
+from app.db.session import SessionLocal, check_replica_lag, replica_engine
 from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.read_your_writes import WriteMarkerMiddleware
 from app.middleware.request_context import RequestContextMiddleware
+from app.middleware.sql_metrics import SQLInstrumentationMiddleware
 from app.observability.metrics import (
     REQUEST_COUNTER,
     observe_request,
     registry,
     now_seconds,
 )
+from app.observability.sql import install_sql_instrumentation
+from app.services.benchmark_jobs import ingest_executor
+from app.services.maintenance import prune_refresh_tokens
 
 settings = get_settings()
 
 
+def _refresh_revocation_filter() -> None:
+    with SessionLocal() as session:
+        revocation_filter.refresh(session)
+
+
+def _prune_refresh_tokens() -> None:
+    with SessionLocal() as session:
+        prune_refresh_tokens(session)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     configure_logging()
+    tasks = [
+        start_periodic_task(
+            "token-revocation-refresh",
+            settings.token_revocation_refresh_seconds,
+            _refresh_revocation_filter,
+        ),
+        start_periodic_task(
+            "refresh-token-prune",
+            settings.refresh_token_prune_interval_seconds,
+            _prune_refresh_tokens,
+        ),
+        start_periodic_task(
+            "replica-lag-check",
+            (
+                settings.database_replica_lag_check_seconds
+                if replica_engine is not None
+                else 0
+            ),
+            check_replica_lag,
+        ),
+    ]
     yield
+    await cancel_tasks(tasks)
+    ingest_executor.shutdown()
 
 
 def create_app() -> FastAPI:
@@ -43,6 +85,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "Server-Timing", WRITE_MARKER_HEADER],
     )
 
     app.add_middleware(RequestContextMiddleware)
@@ -53,6 +96,13 @@ def create_app() -> FastAPI:
         excluded_paths={"/metrics", "/v1/health"},
     )
     app.add_middleware(AuditMiddleware)
+    install_sql_instrumentation()
+    app.add_middleware(SQLInstrumentationMiddleware)
+    if replica_engine is not None:
+        app.add_middleware(
+            WriteMarkerMiddleware,
+            window_seconds=settings.database_read_your_writes_seconds,
+        )
     register_exception_handlers(app)
     app.include_router(api_router)
 
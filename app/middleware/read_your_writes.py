@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.db.routing import WRITE_MARKER_COOKIE, WRITE_MARKER_HEADER
+
+
+class WriteMarkerMiddleware(BaseHTTPMiddleware):
+    """Hand the client a marker of its last committed write.
+
+    Sent as a cookie and a header; whichever comes back on the next request
+    keeps its reads on the primary for ``window_seconds`` on any worker.
+    """
+
+    def __init__(self, app: Any, *, window_seconds: float) -> None:
+        super().__init__(app)
+        self.window_seconds = window_seconds
+
+    async def dispatch(self, request: Request, call_next: Callable[..., Any]):
+        response = await call_next(request)
+        written_at = getattr(request.state, "last_write_at", None)
+        if written_at is not None and self.window_seconds > 0:
+            marker = f"{written_at:.3f}"
+            response.set_cookie(
+                WRITE_MARKER_COOKIE,
+                marker,
+                max_age=math.ceil(self.window_seconds),
+                httponly=True,
+                samesite="lax",
+            )
+            response.headers[WRITE_MARKER_HEADER] = marker
+        return response
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.observability.metrics import (
+    DB_DUPLICATE_QUERIES,
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    QUERY_BUDGET_EXCEEDED,
+)
+from app.observability.sql import QueryBudgetExceeded, QueryStats, collect_queries
+
+settings = get_settings()
+
+
+# Requests that matched no route (404s, scanners) share one label so raw
+# URLs never become Prometheus label values.
+UNMATCHED_ENDPOINT = "unmatched"
+
+
+def _endpoint_label(request: Request) -> str:
+    """Template of the matched route, e.g. ``/v1/t/{tenant_id}/users``."""
+    route = request.scope.get("route")
+    return getattr(route, "path_format", None) or UNMATCHED_ENDPOINT
+
+
+class SQLInstrumentationMiddleware(BaseHTTPMiddleware):
+    """Count SQL statements per request and publish them.
+
+    Adds a ``Server-Timing: db`` entry, feeds the ``db_*_per_request``
+    histograms and flags routes that break their ``query_budget``.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable[..., Any]):
+        with collect_queries() as stats:
+            response = await call_next(request)
+
+        endpoint = _endpoint_label(request)
+        DB_QUERIES_PER_REQUEST.labels(endpoint=endpoint).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(endpoint=endpoint).observe(stats.duration_seconds)
+        if stats.duplicate_count:
+            DB_DUPLICATE_QUERIES.labels(endpoint=endpoint).inc(stats.duplicate_count)
+        self._warn_on_repeats(endpoint, stats)
+
+        response.headers.append(
+            "Server-Timing",
+            f'db;dur={stats.duration_seconds * 1000:.1f};desc="{stats.count} queries"',
+        )
+
+        if stats.over_budget:
+            QUERY_BUDGET_EXCEEDED.labels(endpoint=endpoint).inc()
+            message = (
+                f"{request.method} {endpoint} issued {stats.count} SQL statements "
+                f"(budget {stats.budget})"
+            )
+            if settings.sql_enforce_query_budgets:
+                raise QueryBudgetExceeded(message)
+            logger.bind(component="sql").warning({"message": message})
+        return response
+
+    @staticmethod
+    def _warn_on_repeats(endpoint: str, stats: QueryStats) -> None:
+        repeated = {
+            sql: hits
+            for sql, hits in stats.duplicates.items()
+            if hits >= settings.sql_duplicate_warning_threshold
+        }
+        if repeated:
+            logger.bind(component="sql").warning(
+                {
+                    "message": "Repeated SQL statements in one request",
+                    "endpoint": endpoint,
+                    "statements": repeated,
+                }
+            )
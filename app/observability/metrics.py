@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import time
 
-from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
 
 from app.core.config import get_settings
 
@@ -41,6 +41,132 @@ REQUEST_LATENCY = Histogram(
     registry=registry,
 )
 
+REFRESH_TOKEN_ROWS = Gauge(
+    "refresh_token_rows",
+    "Tuples in the refresh_tokens table as reported by pg_stat_user_tables",
+    ["state"],
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+REFRESH_TOKEN_TABLE_BYTES = Gauge(
+    "refresh_token_table_bytes",
+    "Total on-disk size of refresh_tokens including indexes and TOAST",
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+REFRESH_TOKENS_PRUNED = Counter(
+    "refresh_tokens_pruned_total",
+    "Expired or revoked refresh tokens deleted by the maintenance job",
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond the configured pool size",
+    ["pool"],
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["pool"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1,
+        2.5,
+        5,
+        10,
+        30,
+    ),
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+DB_POOL_CONNECTION_AGE = Histogram(
+    "db_pool_connection_age_seconds",
+    "Age of pooled connections when they are checked out",
+    ["pool"],
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400),
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements issued while serving a request",
+    ["endpoint"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL while serving a request",
+    ["endpoint"],
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+DB_DUPLICATE_QUERIES = Counter(
+    "db_duplicate_queries_total",
+    "Repeated identical SQL statements within one request (N+1 candidates)",
+    ["endpoint"],
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+QUERY_BUDGET_EXCEEDED = Counter(
+    "query_budget_exceeded_total",
+    "Requests that issued more SQL statements than the route's budget",
+    ["endpoint"],
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+BENCHMARK_INGEST_BYTES = Counter(
+    "benchmark_ingest_bytes_total",
+    "Bytes read from benchmark dataset uploads",
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+BENCHMARK_INGEST_ROWS = Counter(
+    "benchmark_ingest_rows_total",
+    "Benchmark dataset rows processed, by outcome",
+    ["outcome"],
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
+BENCHMARK_INGESTS_IN_PROGRESS = Gauge(
+    "benchmark_ingests_in_progress",
+    "Benchmark dataset uploads currently being ingested",
+    namespace=settings.metrics_namespace,
+    registry=registry,
+)
+
 
 def observe_request(endpoint: str, latency_seconds: float) -> None:
     REQUEST_LATENCY.labels(endpoint=endpoint).observe(latency_seconds)
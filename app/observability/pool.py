@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.observability.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_CONNECTION_AGE,
+    DB_POOL_OVERFLOW,
+)
+
+_CONNECTED_AT = "safv_connected_at"
+
+
+def _pool_name(pool: Pool) -> str:
+    return getattr(pool, "_orig_logging_name", None) or "primary"
+
+
+class _CheckoutTimingMixin:
+    """Report how long callers wait for a connection.
+
+    Pool events only fire once a connection has been handed out, so the wait
+    itself is measured around ``_do_get``.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(pool=_pool_name(self)).observe(
+                time.perf_counter() - started
+            )
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_stat(pool: Pool, attribute: str) -> float:
+    getter = getattr(pool, attribute, None)
+    return float(getter()) if callable(getter) else 0.0
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Attach pool event listeners that feed the ``db_pool_*`` metrics.
+
+    Usage gauges are read from the live pool at scrape time, so they stay
+    exact even across ``engine.dispose()`` and cost nothing per checkout.
+    """
+    name = _pool_name(engine.pool)
+    DB_POOL_CHECKED_OUT.labels(pool=name).set_function(
+        lambda: _pool_stat(engine.pool, "checkedout")
+    )
+    DB_POOL_OVERFLOW.labels(pool=name).set_function(
+        lambda: max(_pool_stat(engine.pool, "overflow"), 0)
+    )
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        connection_record.info[_CONNECTED_AT] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        connected_at = connection_record.info.get(_CONNECTED_AT)
+        if connected_at is not None:
+            DB_POOL_CONNECTION_AGE.labels(pool=_pool_name(engine.pool)).observe(
+                time.monotonic() - connected_at
+            )
+
+    return engine
+
+
+__all__ = [
+    "InstrumentedAsyncAdaptedQueuePool",
+    "InstrumentedQueuePool",
+    "instrument_engine",
+]
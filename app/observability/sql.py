@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_STARTED_AT = "safv_query_started_at"
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when a route issues more statements than it declared."""
+
+
+@dataclass
+class QueryStats:
+    """Statements issued while a request was being served."""
+
+    count: int = 0
+    duration_seconds: float = 0.0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+    budget: int | None = None
+
+    def record(self, statement: str, duration_seconds: float) -> None:
+        self.count += 1
+        self.duration_seconds += duration_seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Statements executed more than once (the usual N+1 signature)."""
+        return {sql: hits for sql, hits in self.fingerprints.items() if hits > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(hits - 1 for hits in self.duplicates.values())
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "safv_query_stats", default=None
+)
+
+
+def fingerprint(statement: str) -> str:
+    return _WHITESPACE.sub(" ", statement).strip()
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """Collect every statement executed in this context (threadpool included).
+
+    Sync routes and dependencies run in worker threads with a copy of the
+    context, which still points at the same mutable ``QueryStats``.
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault(_STARTED_AT, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    stats = _current_stats.get()
+    started = conn.info.get(_STARTED_AT)
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+def install_sql_instrumentation() -> None:
+    """Listen on every engine, including ones created later (e.g. in tests)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+__all__ = [
+    "QueryBudgetExceeded",
+    "QueryStats",
+    "collect_queries",
+    "current_query_stats",
+    "fingerprint",
+    "install_sql_instrumentation",
+]
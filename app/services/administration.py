@@ -7,9 +7,9 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select, text
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
 from app.core.roles import (
     ALLOWED_ROLES,
@@ -18,6 +18,7 @@ from app.core.roles import (
     TENANT_USER_ROLE,
 )
 from app.core.security import get_password_hash, verify_password
+from app.core.token_cache import revocation_filter
 from app.db.models import (
     CommercialPlan,
     FinancialSettings,
@@ -28,6 +29,20 @@ from app.db.models import (
     TenantPlanSubscription,
     User,
 )
+from app.db.repositories.payment_plan_template import (
+    PaymentPlanTemplateRepository,
+    diff_installments,
+)
+from app.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    Page,
+    paginate,
+)
+from app.services.template_cache import compiled_templates
+
+_INSTALLMENT_SCALE = Decimal("0.0001")
 
 
 class AdministrationError(Exception):
@@ -223,14 +238,29 @@ class AdministrationService:
     def list_tenants(
         self, acting_user: ActingUser, *, include_inactive: bool = False
     ) -> list[Tenant]:
+        stmt = self._tenants_stmt(acting_user, include_inactive=include_inactive)
+        stmt = stmt.order_by(Tenant.created_at)
+        return list(self.session.execute(stmt).scalars().all())
+
+    def list_tenants_page(
+        self,
+        acting_user: ActingUser,
+        *,
+        include_inactive: bool = False,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> Page[Tenant]:
+        stmt = self._tenants_stmt(acting_user, include_inactive=include_inactive)
+        return self._page(stmt, Tenant.created_at, Tenant.id, limit, cursor)
+
+    def _tenants_stmt(self, acting_user: ActingUser, *, include_inactive: bool):
         self._require_roles(acting_user, {SUPERADMIN_ROLE, TENANT_ADMIN_ROLE})
         stmt = select(Tenant)
         if not include_inactive:
             stmt = stmt.where(Tenant.is_active.is_(True))
         if SUPERADMIN_ROLE not in acting_user.roles:
             stmt = stmt.where(Tenant.id == acting_user.tenant_id)
-        stmt = stmt.order_by(Tenant.created_at)
-        return list(self.session.execute(stmt).scalars().all())
+        return stmt
 
     def get_tenant(self, acting_user: ActingUser, tenant_id: UUID) -> Tenant:
         self._require_roles(acting_user, {SUPERADMIN_ROLE, TENANT_ADMIN_ROLE})
@@ -387,13 +417,37 @@ class AdministrationService:
         *,
         include_inactive: bool = False,
     ) -> list[TenantCompany]:
+        stmt = self._tenant_companies_stmt(
+            acting_user, tenant_id, include_inactive=include_inactive
+        )
+        stmt = stmt.order_by(TenantCompany.created_at)
+        return list(self.session.execute(stmt).scalars().all())
+
+    def list_tenant_companies_page(
+        self,
+        acting_user: ActingUser,
+        tenant_id: UUID,
+        *,
+        include_inactive: bool = False,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> Page[TenantCompany]:
+        stmt = self._tenant_companies_stmt(
+            acting_user, tenant_id, include_inactive=include_inactive
+        )
+        return self._page(
+            stmt, TenantCompany.created_at, TenantCompany.id, limit, cursor
+        )
+
+    def _tenant_companies_stmt(
+        self, acting_user: ActingUser, tenant_id: UUID, *, include_inactive: bool
+    ):
         self._require_roles(acting_user, {SUPERADMIN_ROLE, TENANT_ADMIN_ROLE})
         self._assert_tenant_scope(acting_user, tenant_id)
         stmt = select(TenantCompany).where(TenantCompany.tenant_id == tenant_id)
         if not include_inactive:
             stmt = stmt.where(TenantCompany.is_active.is_(True))
-        stmt = stmt.order_by(TenantCompany.created_at)
-        return list(self.session.execute(stmt).scalars().all())
+        return stmt
 
     def get_company(self, acting_user: ActingUser, company_id: UUID) -> TenantCompany:
         self._require_roles(acting_user, {SUPERADMIN_ROLE, TENANT_ADMIN_ROLE})
@@ -572,13 +626,36 @@ class AdministrationService:
         *,
         include_inactive: bool = False,
     ) -> list[CommercialPlan]:
+        stmt = self._commercial_plans_stmt(
+            acting_user, include_inactive=include_inactive
+        )
+        stmt = stmt.order_by(CommercialPlan.created_at)
+        return list(self.session.execute(stmt).scalars().all())
+
+    def list_commercial_plans_page(
+        self,
+        acting_user: ActingUser,
+        *,
+        include_inactive: bool = False,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> Page[CommercialPlan]:
+        stmt = self._commercial_plans_stmt(
+            acting_user, include_inactive=include_inactive
+        )
+        return self._page(
+            stmt, CommercialPlan.created_at, CommercialPlan.id, limit, cursor
+        )
+
+    def _commercial_plans_stmt(
+        self, acting_user: ActingUser, *, include_inactive: bool
+    ):
         self._require_roles(acting_user, {SUPERADMIN_ROLE})
         owner = self._get_default_tenant()
         stmt = select(CommercialPlan).where(CommercialPlan.tenant_id == owner.id)
         if not include_inactive:
             stmt = stmt.where(CommercialPlan.is_active.is_(True))
-        stmt = stmt.order_by(CommercialPlan.created_at)
-        return list(self.session.execute(stmt).scalars().all())
+        return stmt
 
     def get_commercial_plan(
         self, acting_user: ActingUser, plan_id: UUID
@@ -642,7 +719,50 @@ class AdministrationService:
         tenant_id: UUID,
         *,
         include_inactive: bool = False,
+        include_installments: bool = True,
     ) -> list[PaymentPlanTemplate]:
+        stmt = self._payment_plan_templates_stmt(
+            acting_user,
+            tenant_id,
+            include_inactive=include_inactive,
+            include_installments=include_installments,
+        )
+        stmt = stmt.order_by(PaymentPlanTemplate.product_code)
+        result = self.session.execute(stmt).unique()
+        return list(result.scalars())
+
+    def list_payment_plan_templates_page(
+        self,
+        acting_user: ActingUser,
+        tenant_id: UUID,
+        *,
+        include_inactive: bool = False,
+        include_installments: bool = False,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> Page[PaymentPlanTemplate]:
+        stmt = self._payment_plan_templates_stmt(
+            acting_user,
+            tenant_id,
+            include_inactive=include_inactive,
+            include_installments=include_installments,
+        )
+        return self._page(
+            stmt,
+            PaymentPlanTemplate.product_code,
+            PaymentPlanTemplate.id,
+            limit,
+            cursor,
+        )
+
+    def _payment_plan_templates_stmt(
+        self,
+        acting_user: ActingUser,
+        tenant_id: UUID,
+        *,
+        include_inactive: bool,
+        include_installments: bool,
+    ):
         self._require_roles(acting_user, {SUPERADMIN_ROLE, TENANT_ADMIN_ROLE})
         self._assert_tenant_scope(acting_user, tenant_id)
         stmt = select(PaymentPlanTemplate).where(
@@ -650,9 +770,12 @@ class AdministrationService:
         )
         if not include_inactive:
             stmt = stmt.where(PaymentPlanTemplate.is_active.is_(True))
-        stmt = stmt.order_by(PaymentPlanTemplate.product_code)
-        result = self.session.execute(stmt).unique()
-        return list(result.scalars())
+        if not include_installments:
+            # The relationship is joined-eager by default; skip the installment
+            # rows when the caller only needs the template headers (callers must
+            # not touch ``installments`` afterwards or it loads per template).
+            stmt = stmt.options(lazyload(PaymentPlanTemplate.installments))
+        return stmt
 
     def create_payment_plan_template(
         self,
@@ -688,6 +811,7 @@ class AdministrationService:
             )
             for item in installments
         ]
+        template.pack_installments((item.period, item.amount) for item in installments)
         self.session.add(template)
         self._commit()
         self.session.refresh(template)
@@ -730,34 +854,26 @@ class AdministrationService:
             installments = self._validate_payment_plan_installments(
                 payload.installments
             )
+            desired = {
+                item.period: self._installment_amount(item.amount)
+                for item in installments
+            }
+            diff = diff_installments(
+                {item.period: item.amount for item in template.installments},
+                desired,
+            )
+            template.pack_installments(desired.items())
             self.session.add(template)
             self.session.flush()
-            dialect_name = getattr(
-                getattr(self.session.bind, "dialect", None), "name", None
-            )
-            identifier = (
-                template.id.hex if dialect_name == "sqlite" else str(template.id)
-            )
-            self.session.execute(
-                text(
-                    "DELETE FROM payment_plan_installments WHERE template_id = :template_id"
-                ),
-                {"template_id": identifier},
-            )
-            self._commit()
-            for item in installments:
-                self.session.add(
-                    PaymentPlanInstallment(
-                        template_id=template.id,
-                        period=item.period,
-                        amount=self._to_decimal(item.amount),
-                    )
+            if not diff.is_empty:
+                PaymentPlanTemplateRepository(self.session).apply_installment_diff(
+                    template.id, diff
                 )
-            self._commit()
-            return self._get_payment_plan_template(template_id)
+                self.session.expire(template, ["installments"])
 
         self.session.add(template)
         self._commit()
+        compiled_templates.invalidate(template.id)
         self.session.refresh(template)
         return template
 
@@ -821,13 +937,35 @@ class AdministrationService:
         *,
         include_inactive: bool = False,
     ) -> list[User]:
+        stmt = self._users_stmt(
+            acting_user, tenant_id, include_inactive=include_inactive
+        )
+        stmt = stmt.order_by(User.created_at)
+        return list(self.session.execute(stmt).scalars().all())
+
+    def list_users_page(
+        self,
+        acting_user: ActingUser,
+        tenant_id: UUID,
+        *,
+        include_inactive: bool = False,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+    ) -> Page[User]:
+        stmt = self._users_stmt(
+            acting_user, tenant_id, include_inactive=include_inactive
+        )
+        return self._page(stmt, User.created_at, User.id, limit, cursor)
+
+    def _users_stmt(
+        self, acting_user: ActingUser, tenant_id: UUID, *, include_inactive: bool
+    ):
         self._require_roles(acting_user, {SUPERADMIN_ROLE, TENANT_ADMIN_ROLE})
         self._assert_tenant_scope(acting_user, tenant_id)
         stmt = select(User).where(User.tenant_id == tenant_id)
         if not include_inactive:
             stmt = stmt.where(User.is_active.is_(True), User.is_suspended.is_(False))
-        stmt = stmt.order_by(User.created_at)
-        return list(self.session.execute(stmt).scalars().all())
+        return stmt
 
     def get_user(self, acting_user: ActingUser, user_id: UUID) -> User:
         self._require_roles(acting_user, {SUPERADMIN_ROLE, TENANT_ADMIN_ROLE})
@@ -914,6 +1052,11 @@ class AdministrationService:
                 "User update violates database constraints"
             ) from exc
 
+        if payload.is_active is not None:
+            if user.is_active and not user.is_suspended:
+                revocation_filter.restore_user(user.id)
+            else:
+                revocation_filter.revoke_user(user.id)
         self.session.refresh(user)
         return user
 
@@ -953,6 +1096,7 @@ class AdministrationService:
             user.is_active = False
         self.session.add(user)
         self._commit()
+        revocation_filter.revoke_user(user.id)
         self.session.refresh(user)
         return user
 
@@ -978,6 +1122,8 @@ class AdministrationService:
             user.is_active = True
         self.session.add(user)
         self._commit()
+        if user.is_active:
+            revocation_filter.restore_user(user.id)
         self.session.refresh(user)
         return user
 
@@ -1142,6 +1288,11 @@ class AdministrationService:
         validated.sort(key=lambda value: value.period)
         return validated
 
+    @classmethod
+    def _installment_amount(cls, value: float | Decimal | int) -> Decimal:
+        # Match the column scale so unchanged amounts compare equal.
+        return cls._to_decimal(value).quantize(_INSTALLMENT_SCALE)
+
     @staticmethod
     def _to_decimal(value: float | Decimal | int) -> Decimal:
         if isinstance(value, Decimal):
@@ -1242,11 +1393,31 @@ class AdministrationService:
     def _count_active_admins(
         self, tenant_id: UUID, *, exclude_user_id: UUID | None = None
     ) -> int:
-        stmt = select(User).where(User.tenant_id == tenant_id, User.is_active.is_(True))
+        # Roles live in a JSON column, so only that column is fetched and the
+        # membership test stays in Python instead of hydrating full users.
+        stmt = select(User.roles).where(
+            User.tenant_id == tenant_id, User.is_active.is_(True)
+        )
         if exclude_user_id:
             stmt = stmt.where(User.id != exclude_user_id)
-        users = self.session.execute(stmt).scalars().all()
-        return sum(1 for current in users if TENANT_ADMIN_ROLE in (current.roles or []))
+        return sum(
+            1
+            for roles in self.session.execute(stmt).scalars()
+            if TENANT_ADMIN_ROLE in (roles or [])
+        )
+
+    def _page(self, stmt, sort_column, id_column, limit: int, cursor: str | None):
+        try:
+            return paginate(
+                self.session,
+                stmt,
+                sort_column=sort_column,
+                id_column=id_column,
+                limit=max(1, min(limit, MAX_PAGE_SIZE)),
+                cursor=cursor,
+            )
+        except InvalidCursorError as exc:
+            raise BusinessRuleViolation(str(exc)) from exc
 
     @staticmethod
     def _now() -> datetime:
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Literal
+from uuid import UUID, uuid4
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.observability.metrics import (
+    BENCHMARK_INGEST_BYTES,
+    BENCHMARK_INGESTS_IN_PROGRESS,
+)
+from app.services.benchmarking import (
+    BenchmarkIngestResult,
+    BenchmarkingService,
+    InMemoryBenchmarkRepository,
+    UploadAggregate,
+)
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+def aggregate_file(
+    path: str, filename: str, max_file_size_bytes: int
+) -> UploadAggregate:
+    """Parse and aggregate the upload spooled at ``path``.
+
+    Module-level so it can be pickled into a worker process; persistence
+    stays in the API process.
+    """
+    service = BenchmarkingService(
+        InMemoryBenchmarkRepository(), max_file_size_bytes=max_file_size_bytes
+    )
+    with open(path, "rb") as stream:
+        return service.aggregate_stream(filename, stream)
+
+
+class BenchmarkIngestExecutor:
+    """Run upload parsing off the event loop with bounded concurrency.
+
+    With ``benchmark_ingest_processes`` > 0 uploads are parsed in a process
+    pool of that size, so parsing neither blocks the event loop nor holds
+    the GIL; at most that many uploads are parsed at once and the rest
+    queue. With 0 parsing falls back to the threadpool. The pool is created
+    on first use.
+    """
+
+    def __init__(self, processes: int | None = None) -> None:
+        self._processes = processes
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def processes(self) -> int:
+        if self._processes is not None:
+            return self._processes
+        return get_settings().benchmark_ingest_processes
+
+    async def aggregate(
+        self, path: str, filename: str, max_file_size_bytes: int
+    ) -> UploadAggregate:
+        if self.processes <= 0:
+            return await run_in_threadpool(
+                aggregate_file, path, filename, max_file_size_bytes
+            )
+        loop = asyncio.get_running_loop()
+        # Worker processes have their own metric registries; report here.
+        BENCHMARK_INGESTS_IN_PROGRESS.inc()
+        try:
+            upload = await loop.run_in_executor(
+                self._executor(), aggregate_file, path, filename, max_file_size_bytes
+            )
+        finally:
+            BENCHMARK_INGESTS_IN_PROGRESS.dec()
+        BENCHMARK_INGEST_BYTES.inc(os.path.getsize(path))
+        BenchmarkingService.report_rows(upload.total_rows, upload.discarded_rows)
+        return upload
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawn rather than fork: the API process runs threads (the
+                # threadpool, background tasks, pool connections) whose held
+                # locks a forked child would inherit.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+
+@dataclass(slots=True)
+class BenchmarkJob:
+    job_id: UUID
+    tenant_id: UUID
+    batch_id: UUID
+    status: JobStatus = "queued"
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+    error: str | None = None
+    result: BenchmarkIngestResult | None = None
+
+
+class BenchmarkJobRegistry:
+    """In-process registry of background ingest jobs.
+
+    Finished jobs are forgotten after ``benchmark_job_ttl_seconds``. Jobs
+    live in the worker that accepted the upload, so deployments with
+    several workers need sticky routing for the status endpoint.
+    """
+
+    def __init__(self, ttl_seconds: float | None = None) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._jobs: Dict[UUID, tuple[float | None, BenchmarkJob]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl_seconds(self) -> float:
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return get_settings().benchmark_job_ttl_seconds
+
+    def create(self, tenant_id: UUID, batch_id: UUID) -> BenchmarkJob:
+        job = BenchmarkJob(job_id=uuid4(), tenant_id=tenant_id, batch_id=batch_id)
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = (None, job)
+        return job
+
+    def get(self, tenant_id: UUID, job_id: UUID) -> BenchmarkJob | None:
+        with self._lock:
+            self._prune()
+            entry = self._jobs.get(job_id)
+        if entry is None or entry[1].tenant_id != tenant_id:
+            return None
+        return entry[1]
+
+    def start(self, job: BenchmarkJob) -> None:
+        job.status = "running"
+
+    def succeed(self, job: BenchmarkJob, result: BenchmarkIngestResult) -> None:
+        job.result = result
+        self._finish(job, "succeeded")
+
+    def fail(self, job: BenchmarkJob, error: str) -> None:
+        job.error = error
+        self._finish(job, "failed")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+
+    def _finish(self, job: BenchmarkJob, status: JobStatus) -> None:
+        job.finished_at = datetime.now(timezone.utc)
+        job.status = status
+        with self._lock:
+            self._jobs[job.job_id] = (time.monotonic() + self.ttl_seconds, job)
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, (expires_at, _) in self._jobs.items()
+            if expires_at is not None and expires_at <= now
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+ingest_executor = BenchmarkIngestExecutor()
+ingest_jobs = BenchmarkJobRegistry()
+
+
+__all__ = [
+    "BenchmarkIngestExecutor",
+    "BenchmarkJob",
+    "BenchmarkJobRegistry",
+    "aggregate_file",
+    "ingest_executor",
+    "ingest_jobs",
+]
@@ -2,14 +2,60 @@ from __future__ import annotations
 
 import csv
 import io
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Tuple
+import math
+import threading
+import zipfile
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from itertools import islice, repeat
+from operator import itemgetter
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID
 
+from app.core.config import get_settings
+from app.observability.metrics import (
+    BENCHMARK_INGEST_BYTES,
+    BENCHMARK_INGEST_ROWS,
+    BENCHMARK_INGESTS_IN_PROGRESS,
+)
+from app.services.sketches import KLLSketch
+
 try:
     from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
 except ImportError:  # pragma: no cover - optional dependency
     load_workbook = None  # type: ignore
+    InvalidFileException = None  # type: ignore
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import ipc as pa_ipc
+    from pyarrow import parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pc = pa_ipc = pq = None  # type: ignore
+
+
+K_ANONYMITY_THRESHOLD = 3
+# Leading bytes of the binary upload formats; anything else must be CSV.
+_MAGIC_FORMATS = (
+    (b"PAR1", "parquet"),
+    (b"ARROW1", "arrow"),
+    (b"\xff\xff\xff\xff", "arrow_stream"),
+    (b"PK\x03\x04", "xlsx"),
+)
+# Bucket value of a cube cell whose dimension is rolled up.
+ROLLUP_ALL = "*"
 
 
 def _normalize_header(value: str) -> str:
@@ -33,6 +79,165 @@ class AggregatedBenchmark:
     average_value: float
     min_value: float
     max_value: float
+    sketch: KLLSketch | None = field(default=None, compare=False, repr=False)
+
+    def percentile(self, q: float) -> float | None:
+        """Approximate ``q`` quantile from the bucket's sketch, if it has one."""
+        if self.sketch is None or not self.sketch.count:
+            return None
+        return round(self.sketch.quantile(q), 2)
+
+
+@dataclass(slots=True)
+class BenchmarkDistribution:
+    """Distribution of a metric over a union of buckets and batches."""
+
+    metric_code: str
+    count: int
+    min_value: float
+    max_value: float
+    sketch: KLLSketch = field(compare=False, repr=False)
+
+    def percentile(self, q: float) -> float:
+        return round(self.sketch.quantile(q), 2)
+
+
+@dataclass(slots=True)
+class BenchmarkComparison:
+    """Where a tenant's value falls in one benchmark cube cell.
+
+    ``percentile_rank`` is None when no publishable cell (with a sketch)
+    matches the requested metric and buckets.
+    """
+
+    metric_code: str
+    segment_bucket: str
+    region_bucket: str
+    value: float
+    percentile_rank: float | None = None
+    count: int | None = None
+    median_value: float | None = None
+
+
+@dataclass(slots=True)
+class BucketState:
+    """Mergeable running statistics of one bucket, published or not.
+
+    Repositories persist every bucket state, including those still under the
+    k-anonymity threshold, so later slices of a batch can be merged in and
+    the threshold re-evaluated on the totals.
+    """
+
+    metric_code: str
+    segment_bucket: str
+    region_bucket: str
+    count: int
+    total: float
+    min_value: float
+    max_value: float
+    sketch: KLLSketch | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.metric_code, self.segment_bucket, self.region_bucket)
+
+    def merge(self, other: BucketState) -> None:
+        self.count += other.count
+        self.total += other.total
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        if other.sketch is not None:
+            # Build a new sketch: published aggregates may still share this one.
+            self.sketch = KLLSketch.merged(
+                sketch for sketch in (self.sketch, other.sketch) if sketch is not None
+            )
+
+    def to_aggregate(self) -> AggregatedBenchmark:
+        return AggregatedBenchmark(
+            metric_code=self.metric_code,
+            segment_bucket=self.segment_bucket,
+            region_bucket=self.region_bucket,
+            count=int(self.count),
+            average_value=round(self.total / self.count, 2),
+            min_value=round(self.min_value, 2),
+            max_value=round(self.max_value, 2),
+            sketch=self.sketch,
+        )
+
+
+def publishable(
+    states: Iterable[BucketState], min_count: int = K_ANONYMITY_THRESHOLD
+) -> List[AggregatedBenchmark]:
+    """Aggregates for the bucket states that meet the k-anonymity threshold."""
+    return [state.to_aggregate() for state in states if state.count >= min_count]
+
+
+def build_cube(
+    states: Iterable[BucketState], *, min_count: int = K_ANONYMITY_THRESHOLD
+) -> List[BucketState]:
+    """Roll the published bucket states up into every level of the cube.
+
+    Besides each ``(metric, segment, region)`` bucket the cube holds the
+    ``(metric, segment, *)``, ``(metric, *, region)`` and ``(metric, *, *)``
+    cells. Cells are bucket states themselves, so batch cubes merge into the
+    tenant's market cube the same way slices merge into a batch.
+
+    Only buckets meeting ``min_count`` are rolled up. A suppressed bucket
+    would otherwise show through a rollup's min/max and sketch, or by
+    subtracting the published sibling cells; this way every cell is a merge
+    of buckets that are published anyway.
+    """
+    return _roll_up(state for state in states if state.count >= min_count)
+
+
+def appended_cube(
+    previous_counts: Dict[_BucketKey, int],
+    merged: Iterable[BucketState],
+    slice_states: Iterable[BucketState],
+    *,
+    min_count: int = K_ANONYMITY_THRESHOLD,
+) -> List[BucketState]:
+    """Cube delta of a batch after an appended slice, for ``_merge_rollups``.
+
+    ``previous_counts`` are the stored counts of the touched buckets and
+    ``merged`` their states after the append. A bucket that was already
+    published contributes just the slice; one that crosses ``min_count``
+    now contributes its whole merged state; one still under contributes
+    nothing.
+    """
+    slices = {state.key: state for state in slice_states}
+    contributions = [
+        slices[state.key] if previous_counts.get(state.key, 0) >= min_count else state
+        for state in merged
+        if state.count >= min_count
+    ]
+    return _roll_up(contributions)
+
+
+def _roll_up(states: Iterable[BucketState]) -> List[BucketState]:
+    aggregation = RunningAggregation()
+    for state in states:
+        for segment_bucket, region_bucket in (
+            (state.segment_bucket, state.region_bucket),
+            (state.segment_bucket, ROLLUP_ALL),
+            (ROLLUP_ALL, state.region_bucket),
+            (ROLLUP_ALL, ROLLUP_ALL),
+        ):
+            aggregation.merge_state(
+                replace(
+                    state, segment_bucket=segment_bucket, region_bucket=region_bucket
+                )
+            )
+    return aggregation.states()
+
+
+@dataclass(slots=True)
+class UploadAggregate:
+    """Parsed and aggregated upload that has not been stored yet."""
+
+    total_rows: int
+    discarded_rows: int
+    buckets: List[BucketState]
 
 
 @dataclass(slots=True)
@@ -42,6 +247,7 @@ class BenchmarkIngestResult:
     total_rows: int
     discarded_rows: int
     aggregations: List[AggregatedBenchmark]
+    buckets: List[BucketState] = field(default_factory=list, repr=False)
 
 
 class BenchmarkRepository:
@@ -50,59 +256,456 @@ class BenchmarkRepository:
     ) -> None:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def append(
+        self, result: BenchmarkIngestResult
+    ) -> List[BucketState]:  # pragma: no cover - interface
+        """Merge ``result.buckets`` into the stored batch.
+
+        Returns the merged state of the buckets the slice touched; untouched
+        buckets are neither read nor returned, so appends cost O(slice).
+        """
+        raise NotImplementedError
+
     def list(
         self, tenant_id: UUID, batch_id: UUID
     ) -> List[AggregatedBenchmark]:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def cube(
+        self, tenant_id: UUID, batch_id: UUID | None
+    ) -> List[AggregatedBenchmark]:  # pragma: no cover - interface
+        """Publishable cells of a batch's cube, or of the market cube if None."""
+        raise NotImplementedError
+
 
 class InMemoryBenchmarkRepository(BenchmarkRepository):
     def __init__(self) -> None:
-        self._store: Dict[Tuple[UUID, UUID], List[AggregatedBenchmark]] = {}
+        self._store: Dict[Tuple[UUID, UUID], List[BucketState]] = {}
+        self._cubes: Dict[Tuple[UUID, UUID | None], List[BucketState]] = {}
+        self._lock = threading.Lock()
 
     def store(self, result: BenchmarkIngestResult) -> None:
-        self._store[(result.tenant_id, result.batch_id)] = result.aggregations
+        with self._lock:
+            self._store[(result.tenant_id, result.batch_id)] = list(result.buckets)
+            self._refresh_cubes(result.tenant_id, result.batch_id)
+
+    def append(self, result: BenchmarkIngestResult) -> List[BucketState]:
+        key = (result.tenant_id, result.batch_id)
+        with self._lock:
+            aggregation = RunningAggregation()
+            for state in self._store.get(key, []):
+                aggregation.merge_state(replace(state))
+            for state in result.buckets:
+                aggregation.merge_state(state)
+            self._store[key] = aggregation.states()
+            self._refresh_cubes(result.tenant_id, result.batch_id)
+            touched = {state.key for state in result.buckets}
+            return [state for state in self._store[key] if state.key in touched]
 
     def list(self, tenant_id: UUID, batch_id: UUID) -> List[AggregatedBenchmark]:
-        return self._store.get((tenant_id, batch_id), [])
+        return publishable(self._store.get((tenant_id, batch_id), []))
+
+    def cube(self, tenant_id: UUID, batch_id: UUID | None) -> List[AggregatedBenchmark]:
+        return publishable(self._cubes.get((tenant_id, batch_id), []))
 
     def clear(self) -> None:
         self._store.clear()
+        self._cubes.clear()
+
+    def _refresh_cubes(self, tenant_id: UUID, batch_id: UUID) -> None:
+        self._cubes[(tenant_id, batch_id)] = build_cube(
+            self._store[(tenant_id, batch_id)]
+        )
+        self._cubes[(tenant_id, None)] = build_cube(
+            state
+            for (owner, _), states in self._store.items()
+            if owner == tenant_id
+            for state in states
+        )
+
+
+class DatasetTooLargeError(ValueError):
+    """Raised when an uploaded dataset exceeds the configured size cap."""
+
+
+class _CappedReader(io.RawIOBase):
+    """Count bytes read from ``stream`` and stop once ``limit`` is exceeded."""
+
+    def __init__(self, stream: BinaryIO, limit: int) -> None:
+        self._stream = stream
+        self._limit = limit
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._stream.read(len(buffer))
+        if not chunk:
+            return 0
+        size = len(chunk)
+        self.bytes_read += size
+        BENCHMARK_INGEST_BYTES.inc(size)
+        if self.bytes_read > self._limit:
+            raise DatasetTooLargeError(
+                f"Dataset exceeds maximum size of {self._limit} bytes"
+            )
+        buffer[:size] = chunk
+        return size
+
+
+_BucketKey = Tuple[str, str, str]
+_BUCKET_KEY_CACHE_SIZE = 65_536
+
+
+def _bucketize_segment(segment: str) -> str:
+    normalized = segment.strip().upper()
+    if len(normalized) <= 3:
+        return f"{normalized}*"
+    return f"{normalized[:3]}*"
+
+
+def _bucketize_region(region: str) -> str:
+    normalized = region.strip().upper()
+    if len(normalized) <= 2:
+        return f"{normalized}*"
+    return f"{normalized[:2]}*"
+
+
+class _BucketKeys(dict):
+    """Memoize raw ``(metric_code, segment, region)`` cells to a bucket key.
+
+    Datasets repeat a handful of distinct cells across millions of rows, so
+    each combination is normalized once. Invalid combinations map to None.
+    """
+
+    def __missing__(self, raw: Tuple[str, str, str]) -> _BucketKey | None:
+        if len(self) >= _BUCKET_KEY_CACHE_SIZE:
+            self.clear()
+        metric_code, segment, region = (cell.strip() for cell in raw)
+        key = (
+            (
+                metric_code.upper(),
+                _bucketize_segment(segment),
+                _bucketize_region(region),
+            )
+            if metric_code and segment and region
+            else None
+        )
+        self[raw] = key
+        return key
+
+
+def _parse_values(raw: Sequence[Any]) -> List[float | None]:
+    """Parse a value column; unparsable, negative or non-finite cells are None."""
+    try:
+        values = list(map(float, raw))
+    except (TypeError, ValueError):
+        return [_parse_value(cell) for cell in raw]
+    # A NaN or infinity anywhere makes the sum non-finite.
+    if math.isfinite(sum(values)) and min(values, default=0.0) >= 0:
+        return list(map(round, values, repeat(2)))
+    return [round(value, 2) if 0 <= value < math.inf else None for value in values]
+
+
+def _parse_value(cell: Any) -> float | None:
+    try:
+        value = float(cell)
+    except (TypeError, ValueError):
+        return None
+    return round(value, 2) if 0 <= value < math.inf else None
+
+
+def _group_by_cells(
+    cells: Iterable[Tuple[str, str, str]], values: Sequence[float | None]
+) -> Dict[Tuple[str, str, str], List[float]]:
+    """Hash-group parsed values by their raw cells, skipping None values."""
+    groups: Dict[Tuple[str, str, str], List[float]] = defaultdict(list)
+    if None in values:
+        for key, value in zip(cells, values):
+            if value is not None:
+                groups[key].append(value)
+    else:
+        for key, value in zip(cells, values):
+            groups[key].append(value)
+    return groups
+
+
+def _requested_bucket(value: str | None, bucketize: Callable[[str], str]) -> str | None:
+    """Bucket a requested segment/region the way ingest does; ``"*"`` is unset.
+
+    Accepts raw names (``"Varejo"``) as well as buckets in any case
+    (``"var*"``), so callers need not know the bucket width.
+    """
+    stem = (value or "").strip().rstrip(ROLLUP_ALL)
+    return bucketize(stem) if stem else None
+
+
+def _cube_dimension_matches(bucket: str, broken_out: bool, wanted: str | None) -> bool:
+    if not broken_out:
+        return bucket == ROLLUP_ALL
+    return bucket != ROLLUP_ALL and wanted in (None, bucket)
+
+
+def _padded_columns(
+    rows: Sequence[Sequence[Any]],
+    positions: Sequence[int | None],
+    *,
+    fill: Any = "",
+) -> List[List[Any]]:
+    """Split rows into columns, filling missing or short cells with ``fill``."""
+    return [
+        [
+            row[position] if position is not None and position < len(row) else fill
+            for row in rows
+            if row
+        ]
+        for position in positions
+    ]
+
+
+def _text_cells(cells: List[Any]) -> List[str]:
+    """Coerce spreadsheet label cells (numbers, dates, None) to strings."""
+    if all(cell.__class__ is str for cell in cells):
+        return cells
+    return ["" if cell is None else str(cell) for cell in cells]
+
+
+def _value_cells(cells: List[Any]) -> List[Any]:
+    """Blank boolean spreadsheet cells, which CSV rejects as ``TRUE``/``FALSE``.
+
+    ``bool`` subclasses ``int``, so they would otherwise parse as 1 and 0.
+    """
+    if not any(cell.__class__ is bool for cell in cells):
+        return cells
+    return [None if cell.__class__ is bool else cell for cell in cells]
+
+
+@dataclass(slots=True)
+class ColumnBatch:
+    """Up to ``BenchmarkingService.BATCH_ROWS`` raw rows, stored column-wise.
+
+    Label columns are strings; ``values`` holds CSV text or, for XLSX, the
+    raw cell values (numbers, strings or None).
+    """
+
+    metric_codes: Sequence[str]
+    segments: Sequence[str]
+    regions: Sequence[str]
+    values: Sequence[Any]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def groups(self) -> Dict[Tuple[str, str, str], List[float]]:
+        return _group_by_cells(
+            zip(self.metric_codes, self.segments, self.regions),
+            _parse_values(self.values),
+        )
+
+
+@dataclass(slots=True)
+class ArrowColumnBatch:
+    """Required columns of a Parquet or Arrow IPC record batch.
+
+    ``table`` has string ``metric_code``/``segment``/``region`` columns and
+    a float64 ``value`` column already stripped of null, negative and
+    non-finite values. Grouping runs inside Arrow, so Python objects are only created
+    per group label and per accepted value.
+    """
+
+    table: Any
+    rows: int
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def groups(self) -> Dict[Tuple[str, str, str], List[float]]:
+        labels = list(BenchmarkingService.REQUIRED_COLUMNS[:3])
+        grouped = self.table.group_by(labels).aggregate([("value", "list")])
+        cells = zip(
+            *(
+                ["" if cell is None else cell for cell in grouped[name].to_pylist()]
+                for name in labels
+            )
+        )
+        return {
+            key: list(map(round, values, repeat(2)))
+            for key, values in zip(cells, grouped["value_list"].to_pylist())
+        }
+
+
+class RunningAggregation:
+    """Fold normalized values into per-bucket count/sum/min/max and a sketch.
+
+    Memory grows with the number of distinct buckets, not with the number
+    of rows, so datasets of any length aggregate in constant space. Each
+    bucket also feeds a ``KLLSketch`` so percentiles survive aggregation.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: Dict[_BucketKey, BucketState] = {}
+
+    def add(self, record: BenchmarkRecord) -> None:
+        key = (record.metric_code, record.segment, record.region)
+        self.add_group(key, (record.value,))
+
+    def add_group(self, key: _BucketKey, values: Sequence[float]) -> None:
+        """Merge the stats of one bucket's values from a column batch."""
+        state = self._buckets.get(key)
+        if state is None:
+            state = self._buckets[key] = BucketState(
+                *key,
+                count=0,
+                total=0.0,
+                min_value=math.inf,
+                max_value=-math.inf,
+                sketch=KLLSketch(),
+            )
+        state.count += len(values)
+        state.total += sum(values)
+        minimum, maximum = min(values), max(values)
+        if minimum < state.min_value:
+            state.min_value = minimum
+        if maximum > state.max_value:
+            state.max_value = maximum
+        state.sketch.update_many(values)
+
+    def merge_state(self, state: BucketState) -> None:
+        """Fold a previously aggregated bucket (e.g. a stored slice) in."""
+        existing = self._buckets.get(state.key)
+        if existing is None:
+            self._buckets[state.key] = state
+        else:
+            existing.merge(state)
+
+    def states(self) -> List[BucketState]:
+        return list(self._buckets.values())
+
+    def results(
+        self, *, min_count: int = K_ANONYMITY_THRESHOLD
+    ) -> List[AggregatedBenchmark]:
+        return publishable(self._buckets.values(), min_count)
 
 
 class BenchmarkingService:
-    REQUIRED_COLUMNS = {"metric_code", "segment", "region", "value"}
-    MAX_FILE_SIZE_BYTES = 2 * 1024 * 1024  # 2MB local limit
+    REQUIRED_COLUMNS = ("metric_code", "segment", "region", "value")
+    READ_CHUNK_BYTES = 1024 * 1024
+    BATCH_ROWS = 4096
+    # Arrow groups in native code, so larger batches amortize better.
+    ARROW_BATCH_ROWS = 65536
 
-    def __init__(self, repository: BenchmarkRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: BenchmarkRepository | None = None,
+        *,
+        max_file_size_bytes: int | None = None,
+    ) -> None:
         self.repository = repository or InMemoryBenchmarkRepository()
+        self.max_file_size_bytes = (
+            max_file_size_bytes
+            if max_file_size_bytes is not None
+            else get_settings().benchmark_max_upload_bytes
+        )
 
     def ingest_dataset(
-        self, tenant_id: UUID, batch_id: UUID, *, filename: str, content: bytes
+        self,
+        tenant_id: UUID,
+        batch_id: UUID,
+        *,
+        filename: str,
+        content: bytes,
+        append: bool = False,
+    ) -> BenchmarkIngestResult:
+        return self.ingest_stream(
+            tenant_id,
+            batch_id,
+            filename=filename,
+            stream=io.BytesIO(content),
+            append=append,
+        )
+
+    def ingest_stream(
+        self,
+        tenant_id: UUID,
+        batch_id: UUID,
+        *,
+        filename: str,
+        stream: BinaryIO,
+        append: bool = False,
     ) -> BenchmarkIngestResult:
-        if len(content) > self.MAX_FILE_SIZE_BYTES:
-            raise ValueError("Dataset exceeds maximum size of 2MB")
+        """Aggregate a CSV/XLSX upload read from ``stream`` and store it."""
+        return self.persist(
+            tenant_id,
+            batch_id,
+            self.aggregate_stream(filename, stream),
+            append=append,
+        )
 
-        rows = self._parse_file(filename, content)
-        total_rows = len(rows)
-        normalized_records: List[BenchmarkRecord] = []
+    def aggregate_stream(self, filename: str, stream: BinaryIO) -> UploadAggregate:
+        """Parse and aggregate an upload without touching the repository.
+
+        Rows are read in fixed-size chunks and parsed into column batches of
+        ``BATCH_ROWS``; each batch is grouped and folded into the
+        aggregation, so memory stays flat regardless of the upload size.
+        This is the CPU-bound half of ingestion and is safe to run in a
+        worker process.
+        """
+        aggregation = RunningAggregation()
+        bucket_keys = _BucketKeys()
+        total_rows = 0
         discarded_rows = 0
 
-        for row in rows:
-            try:
-                normalized_records.append(self._normalize_row(row))
-            except ValueError:
-                discarded_rows += 1
+        BENCHMARK_INGESTS_IN_PROGRESS.inc()
+        try:
+            for batch in self._iter_batches(filename, stream):
+                accepted = 0
+                for cells, values in batch.groups().items():
+                    key = bucket_keys[cells]
+                    if key is not None:
+                        aggregation.add_group(key, values)
+                        accepted += len(values)
+                total_rows += len(batch)
+                discarded_rows += len(batch) - accepted
+                self.report_rows(len(batch), len(batch) - accepted)
+        finally:
+            BENCHMARK_INGESTS_IN_PROGRESS.dec()
+
+        return UploadAggregate(
+            total_rows=total_rows,
+            discarded_rows=discarded_rows,
+            buckets=aggregation.states(),
+        )
+
+    def persist(
+        self,
+        tenant_id: UUID,
+        batch_id: UUID,
+        upload: UploadAggregate,
+        *,
+        append: bool = False,
+    ) -> BenchmarkIngestResult:
+        """Store an aggregated upload as the batch, or merge it in with ``append``.
 
-        aggregations = self._aggregate(normalized_records)
+        With ``append`` the upload is treated as a slice of the batch: its
+        bucket states are merged into the stored ones and the returned
+        aggregations are the batch-wide totals of the buckets the slice
+        touched, while ``total_rows`` and ``discarded_rows`` describe the
+        slice alone.
+        """
         result = BenchmarkIngestResult(
             tenant_id=tenant_id,
             batch_id=batch_id,
-            total_rows=total_rows,
-            discarded_rows=discarded_rows,
-            aggregations=aggregations,
+            total_rows=upload.total_rows,
+            discarded_rows=upload.discarded_rows,
+            aggregations=publishable(upload.buckets),
+            buckets=upload.buckets,
         )
-        self.repository.store(result)
+        if append:
+            result.buckets = self.repository.append(result)
+            result.aggregations = publishable(result.buckets)
+        else:
+            self.repository.store(result)
         return result
 
     def list_aggregations(
@@ -110,120 +713,344 @@ class BenchmarkingService:
     ) -> List[AggregatedBenchmark]:
         return self.repository.list(tenant_id, batch_id)
 
-    def _parse_file(self, filename: str, content: bytes) -> List[Dict[str, str]]:
-        lowered = filename.lower()
-        if lowered.endswith(".csv"):
-            return self._parse_csv(content)
-        if lowered.endswith(".xlsx"):
-            return self._parse_excel(content)
-        raise ValueError("Unsupported file format. Use CSV or XLSX")
-
-    def _parse_csv(self, content: bytes) -> List[Dict[str, str]]:
-        text = content.decode("utf-8-sig")
-        reader = csv.DictReader(io.StringIO(text))
-        reader.fieldnames = [
-            _normalize_header(name) for name in reader.fieldnames or []
+    def distribution(
+        self,
+        tenant_id: UUID,
+        batch_ids: Sequence[UUID],
+        metric_code: str,
+        *,
+        segment_bucket: str | None = None,
+        region_bucket: str | None = None,
+    ) -> BenchmarkDistribution | None:
+        """Merge the sketches of every matching bucket across ``batch_ids``.
+
+        Leaving a bucket dimension unset unions all of its buckets. Only
+        published (k-anonymous) aggregates take part, so any union of them
+        is k-anonymous as well. Returns None when nothing matches.
+        """
+        metric_code = metric_code.strip().upper()
+        matches = [
+            item
+            for batch_id in dict.fromkeys(batch_ids)
+            for item in self.repository.list(tenant_id, batch_id)
+            if item.metric_code == metric_code
+            and item.sketch is not None
+            and segment_bucket in (None, item.segment_bucket)
+            and region_bucket in (None, item.region_bucket)
         ]
-        rows = [self._select_required_columns(row) for row in reader]
-        return rows
+        if not matches:
+            return None
+        return BenchmarkDistribution(
+            metric_code=metric_code,
+            count=sum(item.count for item in matches),
+            min_value=min(item.min_value for item in matches),
+            max_value=max(item.max_value for item in matches),
+            sketch=KLLSketch.merged(item.sketch for item in matches),
+        )
 
-    def _parse_excel(self, content: bytes) -> List[Dict[str, str]]:
-        if load_workbook is None:
-            raise ValueError("openpyxl is required to process XLSX files")
-        stream = io.BytesIO(content)
-        workbook = load_workbook(stream, read_only=True)
-        sheet = workbook.active
-        headers = [
-            _normalize_header(str(cell.value))
-            for cell in next(sheet.iter_rows(min_row=1, max_row=1))
+    def cube(
+        self,
+        tenant_id: UUID,
+        batch_id: UUID | None = None,
+        *,
+        metric_code: str | None = None,
+        by_segment: bool = False,
+        by_region: bool = False,
+        segment_bucket: str | None = None,
+        region_bucket: str | None = None,
+    ) -> List[AggregatedBenchmark]:
+        """Answer a slice of the precomputed cube of a batch or of the market.
+
+        Without ``batch_id`` the tenant's market cube across all batches is
+        used. Segment and region are rolled up (reported as ``ROLLUP_ALL``)
+        unless broken out with ``by_segment``/``by_region`` or filtered to a
+        bucket, given raw or bucketed in any case. Every cell returned meets the k-anonymity threshold.
+        """
+        segment_bucket = _requested_bucket(segment_bucket, _bucketize_segment)
+        region_bucket = _requested_bucket(region_bucket, _bucketize_region)
+        by_segment = by_segment or segment_bucket is not None
+        by_region = by_region or region_bucket is not None
+        if metric_code is not None:
+            metric_code = metric_code.strip().upper()
+        return [
+            cell
+            for cell in self.repository.cube(tenant_id, batch_id)
+            if metric_code in (None, cell.metric_code)
+            and _cube_dimension_matches(cell.segment_bucket, by_segment, segment_bucket)
+            and _cube_dimension_matches(cell.region_bucket, by_region, region_bucket)
         ]
-        rows: List[Dict[str, str]] = []
-        for excel_row in sheet.iter_rows(min_row=2):
-            row_dict = {
-                headers[idx]: (str(cell.value) if cell.value is not None else "")
-                for idx, cell in enumerate(excel_row)
-            }
-            rows.append(self._select_required_columns(row_dict))
-        return rows
-
-    def _select_required_columns(self, row: Dict[str, str]) -> Dict[str, str]:
-        selected = {column: row.get(column, "") for column in self.REQUIRED_COLUMNS}
-        return selected
-
-    def _normalize_row(self, row: Dict[str, str]) -> BenchmarkRecord:
-        metric_code = row["metric_code"].strip().upper()
-        segment = row["segment"].strip()
-        region = row["region"].strip()
-        value_str = row["value"].strip()
-
-        if not metric_code:
-            raise ValueError("metric_code required")
-        if not segment or not region:
-            raise ValueError("segment and region required")
 
-        try:
-            value = float(value_str)
-        except ValueError as exc:
-            raise ValueError("value must be numeric") from exc
-        if value < 0:
-            raise ValueError("value must be non-negative")
+    def compare(
+        self,
+        tenant_id: UUID,
+        values: Iterable[Tuple[str, float, str | None, str | None]],
+        *,
+        batch_id: UUID | None = None,
+    ) -> List[BenchmarkComparison]:
+        """Percentile rank of each ``(metric_code, value, segment, region)``.
 
-        return BenchmarkRecord(
-            metric_code=metric_code,
-            segment=self._bucketize_segment(segment),
-            region=self._bucketize_region(region),
-            value=round(value, 2),
-        )
+        Each value is ranked against the matching cell of the cube of
+        ``batch_id`` (the market cube when None); an unset bucket compares
+        against the rolled-up cell. Buckets are normalized like ingest, so
+        ``"Varejo"`` and ``"var*"`` both match ``"VAR*"``. Ranks come from the cell's sketch, whose
+        sorted view is cached with it, so each lookup is a binary search.
+        """
+        cells = {
+            (cell.metric_code, cell.segment_bucket, cell.region_bucket): cell
+            for cell in self.repository.cube(tenant_id, batch_id)
+        }
+        comparisons = []
+        for metric_code, value, segment_bucket, region_bucket in values:
+            comparison = BenchmarkComparison(
+                metric_code=metric_code.strip().upper(),
+                segment_bucket=_requested_bucket(segment_bucket, _bucketize_segment)
+                or ROLLUP_ALL,
+                region_bucket=_requested_bucket(region_bucket, _bucketize_region)
+                or ROLLUP_ALL,
+                value=value,
+            )
+            cell = cells.get(
+                (
+                    comparison.metric_code,
+                    comparison.segment_bucket,
+                    comparison.region_bucket,
+                )
+            )
+            if cell is not None and cell.sketch is not None and cell.sketch.count:
+                comparison.percentile_rank = round(cell.sketch.rank(value) * 100, 2)
+                comparison.count = cell.count
+                comparison.median_value = cell.percentile(0.5)
+            comparisons.append(comparison)
+        return comparisons
 
-    def _bucketize_segment(self, segment: str) -> str:
-        normalized = segment.strip().upper()
-        if len(normalized) <= 3:
-            return f"{normalized}*"
-        return f"{normalized[:3]}*"
+    @staticmethod
+    def report_rows(rows: int, discarded: int) -> None:
+        if rows - discarded:
+            BENCHMARK_INGEST_ROWS.labels(outcome="accepted").inc(rows - discarded)
+        if discarded:
+            BENCHMARK_INGEST_ROWS.labels(outcome="discarded").inc(discarded)
 
-    def _bucketize_region(self, region: str) -> str:
-        normalized = region.strip().upper()
-        if len(normalized) <= 2:
-            return f"{normalized}*"
-        return f"{normalized[:2]}*"
+    def _iter_batches(
+        self, filename: str, stream: BinaryIO
+    ) -> Iterator[ColumnBatch | ArrowColumnBatch]:
+        """Pick the reader from the leading bytes, falling back to the name.
 
-    def _aggregate(
-        self, records: Iterable[BenchmarkRecord]
-    ) -> List[AggregatedBenchmark]:
-        buckets: Dict[Tuple[str, str, str], Dict[str, float]] = {}
-        for record in records:
-            key = (record.metric_code, record.segment, record.region)
-            stats = buckets.setdefault(
-                key, {"count": 0, "sum": 0.0, "min": record.value, "max": record.value}
+        Binary formats are only recognized by their magic bytes; an upload
+        without one is read as CSV if its name says so.
+        """
+        detected = _sniff_format(stream)
+        if detected == "xlsx":
+            return self._iter_excel_batches(stream)
+        if detected is not None:
+            return self._iter_arrow_batches(stream, detected)
+        if filename.lower().endswith(".csv"):
+            return self._iter_csv_batches(stream)
+        raise ValueError("Unsupported file format. Use CSV, XLSX, Parquet or Arrow IPC")
+
+    def _iter_csv_batches(self, stream: BinaryIO) -> Iterator[ColumnBatch]:
+        rows = self._iter_csv(stream)
+        header = next(rows, None)
+        if header is None:
+            return
+        positions = self._column_positions(header)
+        pickers = [
+            itemgetter(position) if position is not None else None
+            for position in positions
+        ]
+        while True:
+            chunk = list(islice(rows, self.BATCH_ROWS))
+            if not chunk:
+                return
+            try:
+                if None in pickers:
+                    raise IndexError
+                columns = [list(map(picker, chunk)) for picker in pickers]
+            except IndexError:
+                # Blank lines, short rows or missing columns: pad per row.
+                columns = _padded_columns(chunk, positions)
+            if columns[0]:
+                yield ColumnBatch(*columns)
+
+    def _column_positions(self, header: Sequence[str]) -> Tuple[int | None, ...]:
+        # Later duplicates win, matching csv.DictReader.
+        names = {_normalize_header(name): index for index, name in enumerate(header)}
+        return tuple(names.get(column) for column in self.REQUIRED_COLUMNS)
+
+    def _iter_csv(self, stream: BinaryIO) -> Iterator[List[str]]:
+        capped = io.BufferedReader(
+            _CappedReader(stream, self.max_file_size_bytes),
+            buffer_size=self.READ_CHUNK_BYTES,
+        )
+        text_stream = io.TextIOWrapper(capped, encoding="utf-8-sig", newline="")
+        return csv.reader(text_stream)
+
+    def _iter_excel_batches(self, stream: BinaryIO) -> Iterator[ColumnBatch]:
+        """Read the required columns of the active sheet as raw cell values.
+
+        The header is resolved once and rows are read with ``values_only``
+        over the narrowest column range that covers the required columns,
+        so openpyxl never builds cell objects for the rest of the sheet.
+        Numeric values reach ``_parse_values`` as numbers instead of going
+        through ``str``.
+        """
+        if load_workbook is None:
+            raise ValueError("openpyxl is required to process XLSX files")
+        self._check_random_access_size(stream)
+        try:
+            workbook = load_workbook(stream, read_only=True)
+        except (KeyError, zipfile.BadZipFile, InvalidFileException) as exc:
+            # Any zip sniffs as XLSX; one without a workbook is a bad upload.
+            raise ValueError("Invalid XLSX file") from exc
+        try:
+            sheet = workbook.active
+            header = next(sheet.iter_rows(max_row=1, values_only=True), None)
+            if header is None:
+                return
+            positions = self._column_positions(
+                ["" if name is None else str(name) for name in header]
             )
-            stats["count"] += 1
-            stats["sum"] += record.value
-            stats["min"] = min(stats["min"], record.value)
-            stats["max"] = max(stats["max"], record.value)
-
-        aggregations: List[AggregatedBenchmark] = []
-        for (metric_code, segment_bucket, region_bucket), stats in buckets.items():
-            if stats["count"] < 3:  # enforce basic k-anonymity
-                continue
-            average_value = round(stats["sum"] / stats["count"], 2)
-            aggregation = AggregatedBenchmark(
-                metric_code=metric_code,
-                segment_bucket=segment_bucket,
-                region_bucket=region_bucket,
-                count=int(stats["count"]),
-                average_value=average_value,
-                min_value=round(stats["min"], 2),
-                max_value=round(stats["max"], 2),
+            present = [position for position in positions if position is not None]
+            first = min(present, default=0)
+            offsets = [
+                position - first if position is not None else None
+                for position in positions
+            ]
+            pickers = None if None in offsets else [itemgetter(o) for o in offsets]
+            rows = sheet.iter_rows(
+                min_row=2,
+                min_col=first + 1,
+                max_col=max(present, default=0) + 1,
+                values_only=True,
             )
-            aggregations.append(aggregation)
-        return aggregations
+            while True:
+                chunk = list(islice(rows, self.BATCH_ROWS))
+                if not chunk:
+                    return
+                # Empty rows come back as all-None; drop them like blank CSV lines.
+                chunk = [row for row in chunk if row.count(None) != len(row)]
+                if not chunk:
+                    continue
+                if pickers is not None:
+                    # Rows are padded to ``max_col``, so every offset exists.
+                    *labels, values = [list(map(picker, chunk)) for picker in pickers]
+                else:
+                    *labels, values = _padded_columns(chunk, offsets, fill=None)
+                yield ColumnBatch(*map(_text_cells, labels), _value_cells(values))
+        finally:
+            workbook.close()
+
+    def _iter_arrow_batches(
+        self, stream: BinaryIO, detected: str
+    ) -> Iterator[ArrowColumnBatch]:
+        """Read the required columns of a Parquet or Arrow IPC upload.
+
+        Parquet only decodes the required column chunks; without any of
+        them the projection is empty and every row is discarded, as in CSV.
+        IPC batches are read whole, but only the required columns are
+        touched. Arrow errors from a malformed upload surface as ValueError.
+        """
+        if pa is None:
+            raise ValueError("pyarrow is required to process Parquet and Arrow files")
+        self._check_random_access_size(stream)
+        try:
+            if detected == "parquet":
+                parquet = pq.ParquetFile(stream)
+                names = self._arrow_column_names(parquet.schema_arrow.names)
+                batches = parquet.iter_batches(
+                    batch_size=self.ARROW_BATCH_ROWS,
+                    columns=[name for name in names if name is not None],
+                )
+            elif detected == "arrow":
+                reader = pa_ipc.open_file(stream)
+                names = self._arrow_column_names(reader.schema.names)
+                batches = (
+                    reader.get_batch(index)
+                    for index in range(reader.num_record_batches)
+                )
+            else:
+                reader = pa_ipc.open_stream(stream)
+                names = self._arrow_column_names(reader.schema.names)
+                batches = iter(reader)
+            for batch in batches:
+                if batch.num_rows:
+                    yield _arrow_column_batch(batch, names)
+        except pa.ArrowException as exc:
+            raise ValueError(f"Invalid {detected} file: {exc}") from exc
+
+    def _arrow_column_names(self, names: Sequence[str]) -> List[str | None]:
+        return [
+            names[position] if position is not None else None
+            for position in self._column_positions(names)
+        ]
+
+    def _check_random_access_size(self, stream: BinaryIO) -> None:
+        # Zip archives and Parquet/Arrow files need random access, so the
+        # size cap is checked up front instead of while reading.
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(0)
+        if size > self.max_file_size_bytes:
+            raise DatasetTooLargeError(
+                f"Dataset exceeds maximum size of {self.max_file_size_bytes} bytes"
+            )
+        BENCHMARK_INGEST_BYTES.inc(size)
+
+
+def _sniff_format(stream: BinaryIO) -> str | None:
+    """Binary format named by the stream's magic bytes, if it is seekable."""
+    if not stream.seekable():
+        return None
+    start = stream.tell()
+    head = stream.read(8)
+    stream.seek(start)
+    for magic, detected in _MAGIC_FORMATS:
+        if head.startswith(magic):
+            return detected
+    return None
+
+
+def _arrow_column_batch(batch: Any, names: Sequence[str | None]) -> ArrowColumnBatch:
+    """Project a record batch onto the required columns, typed for grouping."""
+    columns = [
+        batch.column(name) if name is not None else pa.nulls(batch.num_rows)
+        for name in names
+    ]
+    *labels, values = columns
+    if pa.types.is_integer(values.type) or pa.types.is_floating(values.type):
+        values = pc.cast(values, pa.float64())
+    elif pa.types.is_boolean(values.type):
+        # Booleans are not values, as in CSV and XLSX.
+        values = pa.nulls(batch.num_rows, pa.float64())
+    else:
+        # Text or decimal values: parse like CSV cells.
+        values = pa.array(_parse_values(values.to_pylist()), pa.float64())
+    table = pa.table(
+        [pc.cast(label, pa.string()) for label in labels] + [values],
+        names=list(BenchmarkingService.REQUIRED_COLUMNS),
+    )
+    # Nulls (unparsable cells) drop out of the filter along with negative,
+    # NaN and infinite values, the same rule _parse_values applies.
+    valid = pc.and_(pc.greater_equal(table["value"], 0), pc.is_finite(table["value"]))
+    return ArrowColumnBatch(table=table.filter(valid), rows=batch.num_rows)
 
 
 __all__ = [
     "AggregatedBenchmark",
+    "ArrowColumnBatch",
+    "BenchmarkComparison",
+    "BenchmarkDistribution",
     "BenchmarkIngestResult",
     "BenchmarkRecord",
     "BenchmarkRepository",
     "BenchmarkingService",
+    "BucketState",
+    "ColumnBatch",
+    "DatasetTooLargeError",
     "InMemoryBenchmarkRepository",
+    "K_ANONYMITY_THRESHOLD",
+    "ROLLUP_ALL",
+    "RunningAggregation",
+    "UploadAggregate",
+    "appended_cube",
+    "build_cube",
+    "publishable",
 ]
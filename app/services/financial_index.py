@@ -3,20 +3,35 @@ from __future__ import annotations
 from typing import cast
 from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.schemas.financial_index import IndexValueInput
 from app.db.models.financial_index import FinancialIndexValue
-from app.db.repositories.financial_index import FinancialIndexRepository
+from app.db.repositories.financial_index import (
+    AsyncFinancialIndexRepository,
+    FinancialIndexRepository,
+)
 from app.services.administration import ActingUser, PermissionDeniedError
 
 
 class FinancialIndexService:
-    def __init__(self, db: Session | FinancialIndexRepository):
+    def __init__(
+        self,
+        db: (
+            Session
+            | AsyncSession
+            | FinancialIndexRepository
+            | AsyncFinancialIndexRepository
+        ),
+    ):
         repository_methods = ("list_by_index_code", "create_or_update_values")
-        if isinstance(db, FinancialIndexRepository) or all(
-            hasattr(db, method) for method in repository_methods
-        ):
+        if isinstance(db, AsyncSession):
+            self._repository = AsyncFinancialIndexRepository(db)
+        elif isinstance(
+            db, (FinancialIndexRepository, AsyncFinancialIndexRepository)
+        ) or all(hasattr(db, method) for method in repository_methods):
             self._repository = cast(FinancialIndexRepository, db)
         else:
             self._repository = FinancialIndexRepository(cast(Session, db))
@@ -24,11 +39,30 @@ class FinancialIndexService:
     def list_values(
         self, acting_user: ActingUser, tenant_id: UUID, index_code: str
     ) -> list[FinancialIndexValue]:
+        self._ensure_can_read(acting_user, tenant_id)
+        return self._repository.list_by_index_code(tenant_id, index_code)
+
+    async def list_values_async(
+        self, acting_user: ActingUser, tenant_id: UUID, index_code: str
+    ) -> list[FinancialIndexValue]:
+        """Event-loop friendly ``list_values``.
+
+        Awaits the async repository directly; a sync repository is pushed to
+        the threadpool so routes can switch engines without changing code.
+        """
+        self._ensure_can_read(acting_user, tenant_id)
+        if isinstance(self._repository, AsyncFinancialIndexRepository):
+            return await self._repository.list_by_index_code(tenant_id, index_code)
+        return await run_in_threadpool(
+            self._repository.list_by_index_code, tenant_id, index_code
+        )
+
+    @staticmethod
+    def _ensure_can_read(acting_user: ActingUser, tenant_id: UUID) -> None:
         if not acting_user.is_superuser() and acting_user.tenant_id != tenant_id:
             raise PermissionDeniedError(
                 "User cannot access indexes from another tenant."
             )
-        return self._repository.list_by_index_code(tenant_id, index_code)
 
     def create_or_update_values(
         self,
@@ -36,6 +70,8 @@ class FinancialIndexService:
         tenant_id: UUID,
         index_code: str,
         values: list[IndexValueInput],
+        *,
+        include_history: bool = False,
     ) -> list[FinancialIndexValue]:
         if not acting_user.is_superuser() and not acting_user.is_tenant_admin_for(
             tenant_id
@@ -47,4 +83,6 @@ class FinancialIndexService:
         if not values:
             return []
 
-        return self._repository.create_or_update_values(tenant_id, index_code, values)
+        return self._repository.create_or_update_values(
+            tenant_id, index_code, values, include_history=include_history
+        )
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import BinaryIO, Iterator
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.api.schemas.financial_index import IndexValueInput
+from app.db.repositories.financial_index import FinancialIndexRepository
+from app.services.administration import ActingUser, PermissionDeniedError
+
+try:
+    from openpyxl import load_workbook
+except ImportError:  # pragma: no cover - optional dependency
+    load_workbook = None  # type: ignore
+
+REQUIRED_COLUMNS = ("index_code", "reference_date", "value")
+DEFAULT_CHUNK_SIZE = 5000
+_MAX_INDEX_CODE_LENGTH = 32
+
+_CREATE_STAGING = text(
+    "CREATE TEMP TABLE financial_index_import ("
+    "line bigint NOT NULL, index_code varchar(32) NOT NULL, "
+    "reference_date date NOT NULL, value double precision NOT NULL"
+    ") ON COMMIT DROP"
+)
+_COPY_STAGING = (
+    "COPY financial_index_import (line, index_code, reference_date, value) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+# The latest line wins when a file repeats (index_code, reference_date).
+_MERGE_STAGING = text(
+    "INSERT INTO financial_index_values (tenant_id, index_code, reference_date, value) "
+    "SELECT DISTINCT ON (index_code, reference_date) "
+    "CAST(:tenant_id AS uuid), index_code, reference_date, value "
+    "FROM financial_index_import "
+    "ORDER BY index_code, reference_date, line DESC "
+    "ON CONFLICT (tenant_id, index_code, reference_date) "
+    "DO UPDATE SET value = EXCLUDED.value, updated_at = now()"
+)
+
+
+class IndexImportError(ValueError):
+    """Raised when an uploaded index file cannot be imported."""
+
+
+@dataclass(slots=True)
+class IndexRow:
+    line: int
+    index_code: str
+    reference_date: date
+    value: float
+
+
+@dataclass(slots=True)
+class IndexImportSummary:
+    index_code: str
+    rows: int = 0
+    first_date: date | None = None
+    last_date: date | None = None
+
+    def add(self, row: IndexRow) -> None:
+        self.rows += 1
+        if self.first_date is None or row.reference_date < self.first_date:
+            self.first_date = row.reference_date
+        if self.last_date is None or row.reference_date > self.last_date:
+            self.last_date = row.reference_date
+
+
+def _normalize_header(value: object) -> str:
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _column_positions(header: list[object]) -> tuple[int, int, int]:
+    names = [_normalize_header(name) for name in header]
+    missing = [column for column in REQUIRED_COLUMNS if column not in names]
+    if missing:
+        raise IndexImportError(f"Missing required columns: {', '.join(missing)}")
+    code, reference_date, value = (names.index(column) for column in REQUIRED_COLUMNS)
+    return code, reference_date, value
+
+
+def _parse_date(raw: object) -> date:
+    if isinstance(raw, datetime):
+        return raw.date()
+    if isinstance(raw, date):
+        return raw
+    cleaned = str(raw).strip()
+    try:
+        return date.fromisoformat(cleaned)
+    except ValueError:
+        return datetime.fromisoformat(cleaned).date()
+
+
+def _parse_value(raw: object) -> float:
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    cleaned = str(raw).strip()
+    if "," in cleaned and "." not in cleaned:
+        cleaned = cleaned.replace(",", ".")
+    return float(cleaned)
+
+
+def _to_row(line: int, cells: tuple, positions: tuple[int, int, int]) -> IndexRow:
+    try:
+        code_raw, date_raw, value_raw = (cells[position] for position in positions)
+        index_code = str(code_raw or "").strip()
+        if not index_code or len(index_code) > _MAX_INDEX_CODE_LENGTH:
+            raise ValueError("index_code must have 1 to 32 characters")
+        return IndexRow(
+            line=line,
+            index_code=index_code,
+            reference_date=_parse_date(date_raw),
+            value=_parse_value(value_raw),
+        )
+    except (IndexError, TypeError, ValueError) as exc:
+        raise IndexImportError(f"Line {line}: {exc}") from exc
+
+
+def _iter_csv(stream: BinaryIO) -> Iterator[IndexRow]:
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text_stream)
+        header = next(reader, None)
+        if header is None:
+            raise IndexImportError("File is empty")
+        positions = _column_positions(header)
+        for cells in reader:
+            if any(cell.strip() for cell in cells):
+                yield _to_row(reader.line_num, tuple(cells), positions)
+    finally:
+        text_stream.detach()
+
+
+def _iter_xlsx(stream: BinaryIO) -> Iterator[IndexRow]:
+    if load_workbook is None:
+        raise IndexImportError("openpyxl is required to process XLSX files")
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise IndexImportError("File is empty")
+        positions = _column_positions(list(header))
+        for line, cells in enumerate(rows, start=2):
+            if any(cell not in (None, "") for cell in cells):
+                yield _to_row(line, cells, positions)
+    finally:
+        workbook.close()
+
+
+def iter_index_rows(filename: str, stream: BinaryIO) -> Iterator[IndexRow]:
+    """Yield validated rows one at a time from a CSV or XLSX upload."""
+    lowered = filename.lower()
+    if lowered.endswith(".csv"):
+        return _iter_csv(stream)
+    if lowered.endswith(".xlsx"):
+        return _iter_xlsx(stream)
+    raise IndexImportError("Unsupported file format. Use CSV or XLSX")
+
+
+class IndexImportService:
+    """Import multi-index series from a file in fixed-size chunks.
+
+    On PostgreSQL (psycopg2) each chunk is COPYed into a temporary staging
+    table and merged with a single ``INSERT ... ON CONFLICT`` at the end;
+    other databases upsert every chunk through ``FinancialIndexRepository``.
+    Either way only one chunk of rows is held in memory and the import is
+    committed atomically.
+    """
+
+    def __init__(self, db: Session, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self._db = db
+        self.chunk_size = max(chunk_size, 1)
+
+    def import_file(
+        self,
+        acting_user: ActingUser,
+        tenant_id: UUID,
+        *,
+        filename: str,
+        stream: BinaryIO,
+    ) -> list[IndexImportSummary]:
+        if not acting_user.is_superuser() and not acting_user.is_tenant_admin_for(
+            tenant_id
+        ):
+            raise PermissionDeniedError(
+                "Only tenant administrators can manage index values."
+            )
+        summaries: dict[str, IndexImportSummary] = {}
+        use_copy = self._supports_copy()
+        write_chunk = self._copy_chunk if use_copy else self._upsert_chunk
+        try:
+            if use_copy:
+                self._db.execute(_CREATE_STAGING)
+            chunk: list[IndexRow] = []
+            for row in iter_index_rows(filename, stream):
+                summaries.setdefault(
+                    row.index_code, IndexImportSummary(row.index_code)
+                ).add(row)
+                chunk.append(row)
+                if len(chunk) >= self.chunk_size:
+                    write_chunk(tenant_id, chunk)
+                    chunk = []
+            if chunk:
+                write_chunk(tenant_id, chunk)
+            if not summaries:
+                raise IndexImportError("File has no data rows")
+            if use_copy:
+                self._db.execute(_MERGE_STAGING, {"tenant_id": str(tenant_id)})
+                repository = FinancialIndexRepository(self._db)
+                for summary in summaries.values():
+                    repository.refresh_cumulative(
+                        tenant_id, summary.index_code, summary.first_date
+                    )
+            self._db.commit()
+        except Exception:
+            self._db.rollback()
+            raise
+        return sorted(summaries.values(), key=lambda summary: summary.index_code)
+
+    def _supports_copy(self) -> bool:
+        dialect = self._db.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    def _copy_chunk(self, tenant_id: UUID, chunk: list[IndexRow]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in chunk:
+            writer.writerow(
+                (row.line, row.index_code, row.reference_date.isoformat(), row.value)
+            )
+        buffer.seek(0)
+        cursor = self._db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(_COPY_STAGING, buffer)
+        finally:
+            cursor.close()
+
+    def _upsert_chunk(self, tenant_id: UUID, chunk: list[IndexRow]) -> None:
+        repository = FinancialIndexRepository(self._db)
+        by_code: dict[str, list[IndexValueInput]] = {}
+        for row in chunk:
+            by_code.setdefault(row.index_code, []).append(
+                IndexValueInput(reference_date=row.reference_date, value=row.value)
+            )
+        for index_code, values in by_code.items():
+            repository.create_or_update_values(tenant_id, index_code, values)
+        # Drop the returned rows so memory stays bounded by the chunk size.
+        self._db.expunge_all()
+
+
+__all__ = [
+    "IndexImportError",
+    "IndexImportService",
+    "IndexImportSummary",
+    "iter_index_rows",
+]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.repositories.refresh_token import RefreshTokenRepository
+from app.observability.metrics import (
+    REFRESH_TOKEN_ROWS,
+    REFRESH_TOKEN_TABLE_BYTES,
+    REFRESH_TOKENS_PRUNED,
+)
+
+settings = get_settings()
+
+
+def prune_refresh_tokens(session: Session, *, now: datetime | None = None) -> int:
+    """Delete dead refresh tokens and publish the table size metrics.
+
+    Revoked tokens are kept for one access-token lifetime so the revocation
+    filter of every worker still sees them before the row disappears.
+    """
+    reference = now or datetime.now(timezone.utc)
+    repository = RefreshTokenRepository(session)
+    removed = repository.prune(
+        expired_before=reference,
+        revoked_before=reference
+        - timedelta(minutes=settings.access_token_expire_minutes),
+        batch_size=settings.refresh_token_prune_batch_size,
+    )
+    if removed:
+        REFRESH_TOKENS_PRUNED.inc(removed)
+
+    stats = repository.table_stats()
+    if stats is not None:
+        REFRESH_TOKEN_ROWS.labels(state="live").set(stats.live_rows)
+        REFRESH_TOKEN_ROWS.labels(state="dead").set(stats.dead_rows)
+        REFRESH_TOKEN_TABLE_BYTES.set(stats.total_bytes)
+    return removed
+
+
+__all__ = ["prune_refresh_tokens"]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column: InstrumentedAttribute) -> tuple[Any, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort_column.type.python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, UUID(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor") from exc
+
+
+def paginate(
+    session: Session,
+    stmt: Select,
+    *,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+) -> Page:
+    """Return one keyset page of ``stmt`` ordered by ``(sort_column, id)``.
+
+    Rows after the cursor are selected with a seek predicate rather than an
+    OFFSET, so every page costs the same index range scan. One extra row is
+    fetched to know whether another page exists.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column)
+        stmt = stmt.where(
+            or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id),
+            )
+        )
+    stmt = stmt.order_by(None).order_by(sort_column, id_column).limit(limit + 1)
+    rows = list(session.execute(stmt).unique().scalars())
+    if len(rows) <= limit:
+        return Page(items=rows)
+    items = rows[:limit]
+    last = items[-1]
+    return Page(
+        items=items,
+        next_cursor=encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        ),
+    )
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "InvalidCursorError",
+    "MAX_PAGE_SIZE",
+    "Page",
+    "decode_cursor",
+    "encode_cursor",
+    "paginate",
+]
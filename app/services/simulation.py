@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
-from datetime import date, timedelta
-from typing import Dict, List, Optional
+from datetime import date
+from typing import List, Optional, Sequence
 
 from app.db.repositories.financial_index import FinancialIndexRepository
 from app.services.financial import (
@@ -19,6 +20,35 @@ def _calculate_months_between(start_date: date, end_date: date) -> int:
     return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month
 
 
+def _add_months(start: date, months: int) -> date:
+    """First day of the month ``months`` after ``start``'s month."""
+    month_index = start.month - 1 + months
+    return date(start.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+class CumulativeIndex:
+    """Cumulative index series answering month-range corrections as ratios.
+
+    Months without a stored value contribute a factor of 1.0, so a lookup
+    takes the latest cumulative value at or before the requested month.
+    """
+
+    def __init__(self, series: Sequence[tuple[date, float]]) -> None:
+        self._months = [reference_date for reference_date, _ in series]
+        self._values = [cumulative for _, cumulative in series]
+
+    def __bool__(self) -> bool:
+        return bool(self._months)
+
+    def at(self, month: date) -> float:
+        position = bisect_right(self._months, month)
+        return self._values[position - 1] if position else 1.0
+
+    def factor(self, start_month: date, end_month: date) -> float:
+        """Product of the monthly values after ``start_month`` up to ``end_month``."""
+        return self.at(end_month) / (self.at(start_month) or 1.0)
+
+
 class AdjustmentLogic:
     """Encapsulates the logic for applying financial index adjustments."""
 
@@ -35,14 +65,16 @@ class AdjustmentLogic:
         self.index_code = index_code
         self.periodicity = periodicity
         self.addon_rate = addon_rate
-        self._index_values: Dict[date, float] = {
-            record.reference_date: record.value
-            for record in index_repository.list_by_index_code(tenant_id, index_code)
-        }
+        self._base_month = base_date.replace(day=1)
+        self._index_repository = index_repository
+        self._tenant_id = tenant_id
+        self._cumulative: CumulativeIndex | None = None
+        self._loaded_months = -1
+        self._has_values = False
 
     def apply(self, periods: list[tuple[int, float]]) -> list[tuple[int, float]]:
         """Applies the adjustment to a list of installments."""
-        if not self._index_values:
+        if not self._load_window(self._months_needed(periods)):
             # If no custom index values, fall back to a simple addon_rate adjustment
             return [
                 (period, amount * ((1 + self.addon_rate) ** (period / 12)))
@@ -57,26 +89,49 @@ class AdjustmentLogic:
 
         raise ValueError(f"Unsupported adjustment periodicity: {self.periodicity}")
 
+    def _months_needed(self, periods: list[tuple[int, float]]) -> int:
+        last_period = max((period for period, _ in periods), default=0)
+        if self.periodicity == "anniversary":
+            return (last_period // 12) * 12
+        return last_period
+
+    def _load_window(self, months: int) -> bool:
+        """Fetch cumulative values from ``base_date`` to the last month needed.
+
+        Returns False when the index has no values at all.
+        """
+        if self._cumulative is None or months > self._loaded_months:
+            series = self._index_repository.list_cumulative_window(
+                self._tenant_id,
+                self.index_code,
+                self._base_month,
+                _add_months(self._base_month, months),
+            )
+            self._cumulative = CumulativeIndex(series)
+            self._loaded_months = months
+            self._has_values = bool(series) or self._index_repository.has_values(
+                self._tenant_id, self.index_code
+            )
+        return self._has_values
+
+    def _correction(self, months: int) -> float:
+        # Index months run from the month after base_date through the Nth one.
+        return self._cumulative.factor(
+            self._base_month, _add_months(self._base_month, months)
+        )
+
     def _apply_monthly(
         self, periods: list[tuple[int, float]]
     ) -> list[tuple[int, float]]:
-        adjusted_periods = []
-        for period, amount in periods:
-            correction_factor = 1.0
-            # Iterate from the month after base_date up to the installment's month
-            for m in range(1, period + 1):
-                current_month_date = self.base_date + timedelta(days=31 * m)
-                reference_date = date(
-                    current_month_date.year, current_month_date.month, 1
-                )
-                # Get index for the reference month, or default to 1.0 (no change)
-                monthly_index = self._index_values.get(reference_date, 1.0)
-                correction_factor *= monthly_index
-            adjusted_amount = (
-                amount * correction_factor * ((1 + self.addon_rate) ** (period / 12))
+        return [
+            (
+                period,
+                amount
+                * self._correction(period)
+                * ((1 + self.addon_rate) ** (period / 12)),
             )
-            adjusted_periods.append((period, adjusted_amount))
-        return adjusted_periods
+            for period, amount in periods
+        ]
 
     def _apply_anniversary(
         self, periods: list[tuple[int, float]]
@@ -87,20 +142,8 @@ class AdjustmentLogic:
             if num_years_passed == 0:
                 adjusted_periods.append((period, amount))
                 continue
-
-            correction_factor = 1.0
-            for year in range(num_years_passed):
-                year_start_month_offset = year * 12
-                # Calculate the accumulated index for the 12 months of the current contract year
-                for m in range(1, 13):
-                    current_month_date = self.base_date + timedelta(
-                        days=31 * (year_start_month_offset + m)
-                    )
-                    reference_date = date(
-                        current_month_date.year, current_month_date.month, 1
-                    )
-                    correction_factor *= self._index_values.get(reference_date, 1.0)
-
+            # Accumulated index over every completed contract year.
+            correction_factor = self._correction(num_years_passed * 12)
             adjusted_amount = (
                 amount * correction_factor * ((1 + self.addon_rate) ** num_years_passed)
             )
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import math
+import random
+import struct
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Iterable, List, Sequence, Tuple
+
+DEFAULT_K = 200
+# Level h of H holds at most k * (2/3) ** (H - h - 1) items (never fewer than 2).
+_CAPACITY_DECAY = 2 / 3
+_MIN_CAPACITY = 2
+_SEED = 0x5EED
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BHQddH")
+
+
+@lru_cache(maxsize=256)
+def _capacities(k: int, depth: int) -> Tuple[Tuple[int, ...], int]:
+    """Per-level capacities of a ``depth``-level sketch and their total."""
+    capacities = tuple(
+        max(int(k * _CAPACITY_DECAY ** (depth - level - 1)), _MIN_CAPACITY)
+        for level in range(depth)
+    )
+    return capacities, sum(capacities)
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch (Karnin, Lang and Liberty).
+
+    Values are kept in a stack of compactors; when a level overflows it is
+    sorted and every other item is promoted to the next level with twice the
+    weight. Rank error is roughly ``1.7 / k`` with high probability and the
+    sketch holds ``O(k)`` values no matter how many are added, so per-bucket
+    distributions can be stored with an aggregate and merged across buckets
+    and batches later. Compaction uses a fixed seed, so the same input
+    always produces the same sketch.
+    """
+
+    __slots__ = ("k", "count", "min_value", "max_value", "_levels", "_rng", "_view")
+
+    def __init__(self, k: int = DEFAULT_K) -> None:
+        if k < _MIN_CAPACITY:
+            raise ValueError(f"k must be at least {_MIN_CAPACITY}")
+        self.k = k
+        self.count = 0
+        self.min_value = math.inf
+        self.max_value = -math.inf
+        self._levels: List[List[float]] = [[]]
+        self._rng = random.Random(_SEED)
+        self._view: Tuple[List[float], List[int]] | None = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def retained(self) -> int:
+        """Number of values physically kept by the sketch."""
+        return sum(map(len, self._levels))
+
+    def update(self, value: float) -> None:
+        self.update_many((value,))
+
+    def update_many(self, values: Sequence[float]) -> None:
+        if not values:
+            return
+        self._levels[0].extend(values)
+        self.count += len(values)
+        self.min_value = min(self.min_value, min(values))
+        self.max_value = max(self.max_value, max(values))
+        self._view = None
+        self._compress()
+
+    def merge(self, other: KLLSketch) -> KLLSketch:
+        """Fold ``other`` into this sketch and return it."""
+        if not other.count:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in zip(self._levels, other._levels):
+            level.extend(items)
+        self.count += other.count
+        self.min_value = min(self.min_value, other.min_value)
+        self.max_value = max(self.max_value, other.max_value)
+        self._view = None
+        self._compress()
+        return self
+
+    @classmethod
+    def merged(cls, sketches: Iterable[KLLSketch], k: int = DEFAULT_K) -> KLLSketch:
+        result = cls(k)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at fraction ``q`` (0..1) of the distribution."""
+        if not self.count:
+            raise ValueError("quantile of an empty sketch")
+        if q <= 0:
+            return self.min_value
+        if q >= 1:
+            return self.max_value
+        items, cumulative = self._sorted_view()
+        index = bisect_left(cumulative, q * self.count)
+        return items[min(index, len(items) - 1)]
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        return [self.quantile(q) for q in qs]
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of values less than or equal to ``value``."""
+        if not self.count:
+            raise ValueError("rank of an empty sketch")
+        if value < self.min_value:
+            return 0.0
+        if value >= self.max_value:
+            return 1.0
+        items, cumulative = self._sorted_view()
+        index = bisect_right(items, value)
+        return cumulative[index - 1] / self.count if index else 0.0
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a little-endian header, level sizes and float64 items."""
+        sizes = [len(level) for level in self._levels]
+        items = [item for level in self._levels for item in level]
+        return b"".join(
+            (
+                _HEADER.pack(
+                    _FORMAT_VERSION,
+                    self.k,
+                    self.count,
+                    self.min_value,
+                    self.max_value,
+                    len(sizes),
+                ),
+                struct.pack(f"<{len(sizes)}I", *sizes),
+                struct.pack(f"<{len(items)}d", *items),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> KLLSketch:
+        try:
+            version, k, count, min_value, max_value, depth = _HEADER.unpack_from(
+                payload
+            )
+            if version != _FORMAT_VERSION:
+                raise ValueError(f"unsupported sketch version {version}")
+            offset = _HEADER.size
+            sizes = struct.unpack_from(f"<{depth}I", payload, offset)
+            offset += 4 * depth
+            items = struct.unpack_from(f"<{sum(sizes)}d", payload, offset)
+        except struct.error as exc:
+            raise ValueError("corrupt sketch payload") from exc
+        sketch = cls(k)
+        sketch.count = count
+        sketch.min_value = min_value
+        sketch.max_value = max_value
+        sketch._levels = []
+        start = 0
+        for size in sizes:
+            sketch._levels.append(list(items[start : start + size]))
+            start += size
+        return sketch
+
+    def _compress(self) -> None:
+        while True:
+            capacities, total = _capacities(self.k, len(self._levels))
+            if sum(map(len, self._levels)) <= total:
+                return
+            for height, level in enumerate(self._levels):
+                if len(level) >= capacities[height]:
+                    break
+            if height + 1 == len(self._levels):
+                self._levels.append([])
+            level.sort()
+            # An odd item out stays behind so total weight is preserved.
+            leftover = [level.pop()] if len(level) % 2 else []
+            self._levels[height + 1].extend(level[self._rng.getrandbits(1) :: 2])
+            self._levels[height] = leftover
+
+    def _sorted_view(self) -> Tuple[List[float], List[int]]:
+        if self._view is None:
+            weighted = sorted(
+                (item, 1 << height)
+                for height, level in enumerate(self._levels)
+                for item in level
+            )
+            self._view = (
+                [item for item, _ in weighted],
+                list(accumulate(weight for _, weight in weighted)),
+            )
+        return self._view
+
+
+__all__ = ["DEFAULT_K", "KLLSketch"]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable
+from uuid import UUID
+
+from app.api.schemas.simulation import SimulationPlanSnapshot, SimulationResult
+from app.core.config import get_settings
+
+CompiledTemplateKey = tuple[UUID, datetime | None, date]
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Everything a template outcome needs, computed once per template version."""
+
+    periods: tuple[tuple[int, float], ...]
+    snapshot: SimulationPlanSnapshot
+    result: SimulationResult
+
+
+class CompiledTemplateCache:
+    """LRU of compiled payment plan templates shared across requests.
+
+    Keys include the template's ``updated_at`` so a change made by another
+    worker is picked up on the next read; the admin update path also calls
+    ``invalidate`` so this process drops stale entries immediately.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[CompiledTemplateKey, CompiledTemplate] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(template: Any, as_of: date) -> CompiledTemplateKey:
+        return (template.id, getattr(template, "updated_at", None), as_of)
+
+    def get_or_compile(
+        self,
+        template: Any,
+        as_of: date,
+        compile_template: Callable[[Any], CompiledTemplate],
+    ) -> CompiledTemplate:
+        key = self.key_for(template, as_of)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        compiled = compile_template(template)
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = compiled
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, template_id: UUID) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == template_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+compiled_templates = CompiledTemplateCache(
+    maxsize=get_settings().compiled_template_cache_size
+)
+
+
+__all__ = ["CompiledTemplate", "CompiledTemplateCache", "compiled_templates"]
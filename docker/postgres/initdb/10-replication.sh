@@ -0,0 +1,19 @@
+#!/usr/bin/env bash
+# Creates the streaming-replication role used by the optional postgres-replica
+# service. Runs only when the primary data volume is initialised.
+set -euo pipefail
+
+REPLICATION_USER="${POSTGRES_REPLICATION_USER:-replicator}"
+REPLICATION_PASSWORD="${POSTGRES_REPLICATION_PASSWORD:-replicator}"
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-SQL
+  DO \$\$
+  BEGIN
+    IF NOT EXISTS (SELECT FROM pg_roles WHERE rolname = '${REPLICATION_USER}') THEN
+      CREATE ROLE "${REPLICATION_USER}" WITH REPLICATION LOGIN PASSWORD '${REPLICATION_PASSWORD}';
+    END IF;
+  END
+  \$\$;
+SQL
+
+echo "host replication ${REPLICATION_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
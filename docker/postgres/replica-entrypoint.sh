@@ -0,0 +1,25 @@
+#!/usr/bin/env bash
+# Bootstraps a hot-standby replica of the compose "postgres" service with
+# pg_basebackup on first start, then runs postgres in recovery mode.
+set -euo pipefail
+
+PRIMARY_HOST="${PRIMARY_HOST:-postgres}"
+REPLICATION_USER="${POSTGRES_REPLICATION_USER:-replicator}"
+export PGPASSWORD="${POSTGRES_REPLICATION_PASSWORD:-replicator}"
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  until pg_basebackup \
+      --host="$PRIMARY_HOST" \
+      --username="$REPLICATION_USER" \
+      --pgdata="$PGDATA" \
+      --wal-method=stream \
+      --write-recovery-conf \
+      --checkpoint=fast; do
+    echo "Waiting for primary to accept replication connections..."
+    rm -rf "${PGDATA:?}"/*
+    sleep 2
+  done
+  chmod 0700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on -c hot_standby_feedback=on
@@ -8,10 +8,14 @@ from app.audit import service as audit_service
 from app.api.routes import benchmarking as benchmarking_routes
 from app.core.config import get_settings
 from app.core.security import create_access_token
+from app.core.token_cache import revocation_filter, token_cache
+from app.services.benchmark_jobs import ingest_jobs
+from app.services.benchmarking import InMemoryBenchmarkRepository
+from app.services.template_cache import compiled_templates
 from app.db.session import get_db
 from app.main import create_app
 from app.middleware.rate_limit import RateLimitMiddleware
-from app.db.models.financial_index import FinancialIndexValue
+from app.db.models.financial_index import FinancialIndexCumulative, FinancialIndexValue
 
 TENANT_ID = "11111111-1111-1111-1111-111111111111"
 USER_ID = "44444444-4444-4444-4444-444444444444"
@@ -19,6 +23,9 @@ USER_ID = "44444444-4444-4444-4444-444444444444"
 settings = get_settings()
 settings.rate_limit_requests = 5
 settings.rate_limit_window_seconds = 60
+settings.sql_enforce_query_budgets = True
+# Parse uploads on the threadpool instead of spawning worker processes.
+settings.benchmark_ingest_processes = 0
 
 app = create_app()
 
@@ -37,6 +44,8 @@ def _get_rate_limiter(asgi_app) -> RateLimitMiddleware | None:
 
 
 app.dependency_overrides[get_db] = _override_get_db
+# Endpoint tests run without a database; keep benchmark batches in memory.
+benchmarking_routes.service.repository = InMemoryBenchmarkRepository()
 
 
 @pytest.fixture(autouse=True)
@@ -48,11 +57,19 @@ def _clear_state():
     rate_limiter = _get_rate_limiter(app)
     if rate_limiter:
         rate_limiter.reset()
+    token_cache.clear()
+    revocation_filter.clear()
+    compiled_templates.clear()
+    ingest_jobs.clear()
     yield
     if callable(clear):
         clear()
     if rate_limiter:
         rate_limiter.reset()
+    token_cache.clear()
+    revocation_filter.clear()
+    compiled_templates.clear()
+    ingest_jobs.clear()
 
 
 @pytest.fixture(scope="session")
@@ -112,6 +129,7 @@ def _noop_audit_persistence():
 def db_session() -> Session:
     engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
     FinancialIndexValue.__table__.create(bind=engine)
+    FinancialIndexCumulative.__table__.create(bind=engine)
     SessionLocal = sessionmaker(bind=engine, future=True, autoflush=False)
     session = SessionLocal()
     try:
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from app.api.schemas.financial_index import IndexValueInput
+from app.db import session as db_session_module
+from app.db.models.financial_index import FinancialIndexCumulative, FinancialIndexValue
+from app.db.repositories.financial_index import AsyncFinancialIndexRepository
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+
+async def _with_session(callback):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(FinancialIndexValue.__table__.create)
+        await connection.run_sync(FinancialIndexCumulative.__table__.create)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    try:
+        async with factory() as session:
+            return await callback(session)
+    finally:
+        await engine.dispose()
+
+
+def test_async_financial_index_repository_upserts_and_lists() -> None:
+    tenant_id = uuid4()
+
+    async def scenario(session: AsyncSession):
+        repository = AsyncFinancialIndexRepository(session)
+        await repository.create_or_update_values(
+            tenant_id,
+            "INCC",
+            [
+                IndexValueInput(reference_date=date(2024, 2, 1), value=1.02),
+                IndexValueInput(reference_date=date(2024, 1, 1), value=1.01),
+            ],
+        )
+        affected = await repository.create_or_update_values(
+            tenant_id,
+            "INCC",
+            [IndexValueInput(reference_date=date(2024, 2, 1), value=1.05)],
+        )
+        history = await repository.create_or_update_values(
+            tenant_id,
+            "INCC",
+            [IndexValueInput(reference_date=date(2024, 3, 1), value=1.07)],
+            include_history=True,
+        )
+        return affected, history
+
+    affected, history = asyncio.run(_with_session(scenario))
+
+    assert [(v.reference_date, v.value) for v in affected] == [(date(2024, 2, 1), 1.05)]
+    assert [(v.reference_date, v.value) for v in history] == [
+        (date(2024, 1, 1), 1.01),
+        (date(2024, 2, 1), 1.05),
+        (date(2024, 3, 1), 1.07),
+    ]
+
+
+def test_uses_async_db_reads_router_list(monkeypatch) -> None:
+    monkeypatch.setattr(
+        db_session_module.settings, "async_db_routers", " Financial_Index, auth "
+    )
+
+    assert db_session_module.uses_async_db("financial_index")
+    assert db_session_module.uses_async_db("auth")
+    assert not db_session_module.uses_async_db("benchmarking")
+
+
+def test_async_database_url_swaps_sync_driver(monkeypatch) -> None:
+    monkeypatch.setattr(db_session_module.settings, "database_async_url", None)
+    monkeypatch.setattr(
+        db_session_module.settings,
+        "database_url",
+        "postgresql+psycopg2://user:secret@db:5432/pv",
+    )
+
+    assert (
+        db_session_module.async_database_url()
+        == "postgresql+asyncpg://user:secret@db:5432/pv"
+    )
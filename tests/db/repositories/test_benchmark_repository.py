@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.models.benchmark import BenchmarkAggregate, BenchmarkBatch, BenchmarkRollup
+from app.db.models.tenant import Tenant
+from app.db.repositories.benchmark import AggregationCache, SqlBenchmarkRepository
+from app.services.benchmarking import (
+    BenchmarkIngestResult,
+    BucketState,
+    publishable,
+)
+from app.services.sketches import KLLSketch
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    for model in (Tenant, BenchmarkBatch, BenchmarkAggregate, BenchmarkRollup):
+        model.__table__.create(bind=engine)
+    try:
+        yield sessionmaker(bind=engine, future=True, autoflush=False)
+    finally:
+        engine.dispose()
+
+
+def _sketch(count: int) -> KLLSketch:
+    sketch = KLLSketch()
+    sketch.update_many([float(value) for value in range(count)])
+    return sketch
+
+
+def _result(tenant_id, batch_id, *counts: int) -> BenchmarkIngestResult:
+    buckets = [
+        BucketState(
+            metric_code=f"METRIC_{index}",
+            segment_bucket="PME*",
+            region_bucket="SU*",
+            count=count,
+            total=float(sum(range(count))),
+            min_value=0.0,
+            max_value=float(count - 1),
+            sketch=_sketch(count),
+        )
+        for index, count in enumerate(counts)
+    ]
+    return BenchmarkIngestResult(
+        tenant_id=tenant_id,
+        batch_id=batch_id,
+        total_rows=sum(counts),
+        discarded_rows=0,
+        aggregations=publishable(buckets),
+        buckets=buckets,
+    )
+
+
+def test_store_persists_aggregations_across_repositories(session_factory) -> None:
+    tenant_id, batch_id = uuid4(), uuid4()
+    SqlBenchmarkRepository(session_factory).store(_result(tenant_id, batch_id, 3, 5))
+
+    fresh = SqlBenchmarkRepository(session_factory)
+    aggregations = fresh.list(tenant_id, batch_id)
+
+    assert [item.metric_code for item in aggregations] == ["METRIC_0", "METRIC_1"]
+    assert [item.count for item in aggregations] == [3, 5]
+    assert aggregations[1].sketch.count == 5
+    assert aggregations[1].percentile(0.5) == 2.0
+    assert fresh.list(uuid4(), batch_id) == []
+
+
+def test_store_replaces_previous_batch(session_factory) -> None:
+    tenant_id, batch_id = uuid4(), uuid4()
+    repository = SqlBenchmarkRepository(
+        session_factory, cache=AggregationCache(maxsize=0, ttl_seconds=0)
+    )
+    repository.store(_result(tenant_id, batch_id, 3, 4, 5))
+    repository.store(_result(tenant_id, batch_id, 7))
+
+    aggregations = repository.list(tenant_id, batch_id)
+
+    assert [(item.metric_code, item.count) for item in aggregations] == [
+        ("METRIC_0", 7)
+    ]
+    with session_factory() as session:
+        batch = session.get(BenchmarkBatch, (tenant_id, batch_id))
+        assert batch.total_rows == 7
+
+
+def test_append_patches_cached_batch_with_touched_buckets(session_factory) -> None:
+    tenant_id, batch_id = uuid4(), uuid4()
+    repository = SqlBenchmarkRepository(
+        session_factory, cache=AggregationCache(maxsize=8, ttl_seconds=60)
+    )
+    repository.store(_result(tenant_id, batch_id, 3, 2))
+
+    repository.append(_result(tenant_id, batch_id, 1, 1))
+
+    assert [
+        (item.metric_code, item.count) for item in repository.list(tenant_id, batch_id)
+    ] == [
+        ("METRIC_0", 4),
+        ("METRIC_1", 3),
+    ]
+
+
+def test_list_is_served_from_cache_until_expiry(session_factory) -> None:
+    tenant_id, batch_id = uuid4(), uuid4()
+    cache = AggregationCache(maxsize=8, ttl_seconds=60)
+    repository = SqlBenchmarkRepository(session_factory, cache=cache)
+    repository.store(_result(tenant_id, batch_id, 3))
+    with session_factory() as session:
+        session.execute(delete(BenchmarkAggregate))
+        session.commit()
+
+    assert len(repository.list(tenant_id, batch_id)) == 1
+
+    cache.clear()
+    assert repository.list(tenant_id, batch_id) == []
+
+
+def test_append_merges_slices_and_reevaluates_k_anonymity(session_factory) -> None:
+    tenant_id, batch_id = uuid4(), uuid4()
+    repository = SqlBenchmarkRepository(
+        session_factory, cache=AggregationCache(maxsize=0, ttl_seconds=0)
+    )
+    repository.append(_result(tenant_id, batch_id, 2, 4))
+    assert [item.metric_code for item in repository.list(tenant_id, batch_id)] == [
+        "METRIC_1"
+    ]
+
+    merged = repository.append(_result(tenant_id, batch_id, 2))
+
+    # Only the buckets the slice touched are read back and returned.
+    assert {state.key[0]: state.count for state in merged} == {"METRIC_0": 4}
+    aggregations = repository.list(tenant_id, batch_id)
+    assert [(item.metric_code, item.count) for item in aggregations] == [
+        ("METRIC_0", 4),
+        ("METRIC_1", 4),
+    ]
+    assert aggregations[0].average_value == 0.5
+    assert aggregations[0].sketch.count == 4
+    with session_factory() as session:
+        batch = session.get(BenchmarkBatch, (tenant_id, batch_id))
+        assert batch.total_rows == 8
+
+
+def _regional_result(tenant_id, batch_id, **counts: int) -> BenchmarkIngestResult:
+    buckets = [
+        BucketState(
+            metric_code="SPREAD",
+            segment_bucket="PME*",
+            region_bucket=f"{region}*",
+            count=count,
+            total=float(count),
+            min_value=1.0,
+            max_value=1.0,
+            sketch=_sketch(count),
+        )
+        for region, count in counts.items()
+    ]
+    return BenchmarkIngestResult(
+        tenant_id=tenant_id,
+        batch_id=batch_id,
+        total_rows=sum(counts.values()),
+        discarded_rows=0,
+        aggregations=publishable(buckets),
+        buckets=buckets,
+    )
+
+
+def test_writes_maintain_cubes_from_published_buckets_only(session_factory) -> None:
+    tenant_id, first, second = uuid4(), uuid4(), uuid4()
+    repository = SqlBenchmarkRepository(
+        session_factory, cache=AggregationCache(maxsize=0, ttl_seconds=0)
+    )
+
+    def cells(batch_id):
+        return {
+            (item.segment_bucket, item.region_bucket): item.count
+            for item in repository.cube(tenant_id, batch_id)
+        }
+
+    repository.store(_regional_result(tenant_id, first, SU=2, NO=1))
+    # Suppressed buckets never reach a rollup, even when their sum would pass.
+    assert cells(first) == {}
+
+    repository.store(_regional_result(tenant_id, second, SU=3))
+    assert cells(None) == {
+        ("PME*", "SU*"): 3,
+        ("*", "SU*"): 3,
+        ("PME*", "*"): 3,
+        ("*", "*"): 3,
+    }
+
+    # NO* crosses the threshold and joins the cubes with its whole state...
+    repository.append(_regional_result(tenant_id, first, NO=2))
+    assert cells(first) == {
+        ("PME*", "NO*"): 3,
+        ("*", "NO*"): 3,
+        ("PME*", "*"): 3,
+        ("*", "*"): 3,
+    }
+    # ...and once published, later slices only add their own rows.
+    repository.append(_regional_result(tenant_id, first, NO=1))
+    assert cells(first)[("*", "*")] == 4
+    assert cells(None)[("*", "*")] == 7
+    repository.append(_regional_result(tenant_id, first, SU=1))
+    assert cells(first)[("*", "*")] == 7
+    assert cells(None)[("*", "SU*")] == 6
+
+    repository.store(_regional_result(tenant_id, first, SU=1))
+    assert cells(first) == {}
+    assert cells(None)[("*", "*")] == 3
+    assert cells(uuid4()) == {}
@@ -141,3 +141,88 @@ class TestFinancialIndexRepository:
         assert len(results) == 2
         assert results[0].value == 1.99
         assert results[1].value == 2.0
+
+    def test_create_or_update_values_returns_only_affected_rows(
+        self, db_session: Session
+    ):
+        # Arrange
+        repo = FinancialIndexRepository(db_session)
+        tenant_id = uuid4()
+        repo.create_or_update_values(
+            tenant_id,
+            "IGPM",
+            [
+                IndexValueInput(reference_date=date(2024, month, 1), value=1.0)
+                for month in range(1, 13)
+            ],
+        )
+        db_session.commit()
+
+        # Act
+        affected = repo.create_or_update_values(
+            tenant_id,
+            "IGPM",
+            [
+                IndexValueInput(reference_date=date(2024, 6, 1), value=1.1),
+                IndexValueInput(reference_date=date(2024, 6, 1), value=1.2),
+            ],
+        )
+
+        # Assert
+        assert [(r.reference_date, r.value) for r in affected] == [
+            (date(2024, 6, 1), 1.2)
+        ]
+        assert len(repo.list_by_index_code(tenant_id, "IGPM")) == 12
+
+    def test_writes_maintain_cumulative_series_from_changed_month(
+        self, db_session: Session
+    ):
+        # Arrange
+        repo = FinancialIndexRepository(db_session)
+        tenant_id = uuid4()
+        repo.create_or_update_values(
+            tenant_id,
+            "IGPM",
+            [
+                IndexValueInput(reference_date=date(2024, 1, 1), value=1.1),
+                IndexValueInput(reference_date=date(2024, 2, 1), value=1.2),
+                IndexValueInput(reference_date=date(2024, 3, 1), value=1.5),
+            ],
+        )
+
+        # Act
+        repo.create_or_update_values(
+            tenant_id,
+            "IGPM",
+            [IndexValueInput(reference_date=date(2024, 2, 1), value=2.0)],
+        )
+
+        # Assert
+        assert repo.list_cumulative(tenant_id, "IGPM") == [
+            (date(2024, 1, 1), pytest.approx(1.1)),
+            (date(2024, 2, 1), pytest.approx(2.2)),
+            (date(2024, 3, 1), pytest.approx(3.3)),
+        ]
+
+    def test_list_cumulative_window_includes_floor_month(self, db_session: Session):
+        # Arrange
+        repo = FinancialIndexRepository(db_session)
+        tenant_id = uuid4()
+        repo.create_or_update_values(
+            tenant_id,
+            "IPCA",
+            [
+                IndexValueInput(reference_date=date(2020 + year, 1, 1), value=2.0)
+                for year in range(6)
+            ],
+        )
+
+        # Act
+        window = repo.list_cumulative_window(
+            tenant_id, "IPCA", date(2022, 6, 1), date(2023, 6, 1)
+        )
+
+        # Assert
+        assert window == [(date(2022, 1, 1), 8.0), (date(2023, 1, 1), 16.0)]
+        assert repo.has_values(tenant_id, "IPCA")
+        assert not repo.has_values(tenant_id, "IGPM")
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects.postgresql import INET
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models.refresh_token import RefreshToken
+from app.db.repositories.refresh_token import RefreshTokenRepository
+
+
+@compiles(INET, "sqlite")
+def _compile_inet_for_sqlite(type_, compiler, **kw) -> str:
+    return "VARCHAR(45)"
+
+
+@pytest.fixture()
+def token_session() -> Session:
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    RefreshToken.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine, future=True, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _token(**overrides) -> RefreshToken:
+    values = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "token_hash": uuid4().hex,
+        "expires_at": datetime.now(timezone.utc) + timedelta(days=1),
+    }
+    values.update(overrides)
+    return RefreshToken(**values)
+
+
+def test_prune_removes_expired_and_old_revoked_tokens_in_batches(
+    token_session: Session,
+) -> None:
+    now = datetime.now(timezone.utc)
+    active = _token()
+    recently_revoked = _token(revoked_at=now - timedelta(minutes=1))
+    token_session.add_all(
+        [active, recently_revoked]
+        + [_token(expires_at=now - timedelta(days=1)) for _ in range(5)]
+        + [_token(revoked_at=now - timedelta(hours=2)) for _ in range(2)]
+    )
+    token_session.commit()
+
+    removed = RefreshTokenRepository(token_session).prune(
+        expired_before=now,
+        revoked_before=now - timedelta(minutes=30),
+        batch_size=3,
+    )
+
+    remaining = set(token_session.execute(select(RefreshToken.id)).scalars())
+    assert removed == 7
+    assert remaining == {active.id, recently_revoked.id}
+
+
+def test_prune_honours_max_batches(token_session: Session) -> None:
+    now = datetime.now(timezone.utc)
+    token_session.add_all(
+        [_token(expires_at=now - timedelta(days=1)) for _ in range(5)]
+    )
+    token_session.commit()
+
+    repository = RefreshTokenRepository(token_session)
+    removed = repository.prune(
+        expired_before=now, revoked_before=now, batch_size=2, max_batches=1
+    )
+
+    assert removed == 2
+    assert repository.table_stats() is None
+
+
+def test_prune_selects_each_batch_through_a_single_indexed_condition(
+    token_session: Session,
+) -> None:
+    now = datetime.now(timezone.utc)
+    token_session.add_all(
+        [_token(expires_at=now - timedelta(days=1)) for _ in range(2)]
+        + [_token(revoked_at=now - timedelta(hours=2))]
+    )
+    token_session.commit()
+    statements: list[str] = []
+    event.listen(
+        token_session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    removed = RefreshTokenRepository(token_session).prune(
+        expired_before=now, revoked_before=now, batch_size=5
+    )
+
+    selects = [sql for sql in statements if sql.lstrip().startswith("SELECT")]
+    assert removed == 3
+    assert len(selects) == 2
+    assert all(" OR " not in sql for sql in selects)
+    assert "expires_at <=" in selects[0]
+    assert "revoked_at <=" in selects[1]
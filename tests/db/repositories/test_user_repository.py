@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.models.user_login_hint import UserLoginHint
+from app.db.repositories.user import UserRepository
+
+
+@pytest.fixture()
+def hint_session() -> Session:
+    engine = create_engine("sqlite+pysqlite:///:memory:", future=True)
+    UserLoginHint.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine, future=True, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_record_login_hint_upserts_on_existing_email(hint_session: Session) -> None:
+    first_tenant, second_tenant = uuid4(), uuid4()
+    repository = UserRepository(hint_session)
+    # A concurrent first login already inserted the row behind this session.
+    hint_session.execute(
+        UserLoginHint.__table__.insert().values(
+            email="consultant@example.com", tenant_id=first_tenant
+        )
+    )
+    hint_session.commit()
+
+    repository.record_login_hint(" Consultant@Example.com ", first_tenant)
+    repository.record_login_hint("consultant@example.com", second_tenant)
+
+    rows = hint_session.execute(
+        select(UserLoginHint.email, UserLoginHint.tenant_id)
+    ).all()
+    assert rows == [("consultant@example.com", second_tenant)]
+    assert repository.get_login_hint("CONSULTANT@example.com") == second_tenant
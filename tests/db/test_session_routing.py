@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.financial_index import FinancialIndexValue
+from app.db.routing import (
+    WRITE_MARKER_COOKIE,
+    WRITE_MARKER_HEADER,
+    ReadYourWritesTracker,
+    ReplicaMonitor,
+    RoutingSession,
+    bind_tenant,
+    track_client_writes,
+    use_replica_for_reads,
+)
+from app.middleware.read_your_writes import WriteMarkerMiddleware
+
+TENANT = str(uuid4())
+
+
+@pytest.fixture()
+def routing(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, value in ((primary, 1.0), (replica, 2.0)):
+        FinancialIndexValue.__table__.create(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(
+                FinancialIndexValue.__table__.insert().values(
+                    id=uuid4(),
+                    tenant_id=uuid4(),
+                    index_code="INCC",
+                    reference_date=date(2024, 1, 1),
+                    value=value,
+                )
+            )
+    monitor = ReplicaMonitor(max_lag_seconds=5, stale_after=60)
+    monitor.record(0.0)
+    tracker = ReadYourWritesTracker(window_seconds=30)
+    factory = sessionmaker(
+        bind=primary,
+        class_=RoutingSession,
+        replica_bind=replica,
+        replica_monitor=monitor,
+        write_tracker=tracker,
+    )
+    yield factory, monitor, tracker
+    primary.dispose()
+    replica.dispose()
+
+
+def _read_value(session, **options) -> float:
+    stmt = select(FinancialIndexValue.value).where(
+        FinancialIndexValue.index_code == "INCC"
+    )
+    return session.execute(stmt.execution_options(**options)).scalars().first()
+
+
+def test_read_only_sessions_use_the_replica(routing) -> None:
+    factory, _, _ = routing
+    with factory() as session:
+        assert _read_value(session) == 1.0
+    with factory() as session:
+        use_replica_for_reads(session, tenant_key=TENANT)
+        assert _read_value(session) == 2.0
+    with factory() as session:
+        assert _read_value(session, read_replica=True) == 2.0
+
+
+def test_reads_fall_back_to_primary_when_replica_lags(routing) -> None:
+    factory, monitor, _ = routing
+    monitor.record(30.0)
+    with factory() as session:
+        use_replica_for_reads(session, tenant_key=TENANT)
+        assert _read_value(session) == 1.0
+    monitor.record(None)
+    with factory() as session:
+        assert _read_value(session, read_replica=True) == 1.0
+
+
+def test_tenant_writes_pin_reads_to_primary(routing) -> None:
+    factory, _, tracker = routing
+    with factory() as session:
+        bind_tenant(session, lambda: TENANT)
+        session.add(
+            FinancialIndexValue(
+                tenant_id=uuid4(),
+                index_code="IPCA",
+                reference_date=date(2024, 1, 1),
+                value=3.0,
+            )
+        )
+        session.commit()
+        assert _read_value(session, read_replica=True) == 1.0
+
+    assert tracker.is_sticky(TENANT)
+    with factory() as session:
+        use_replica_for_reads(session, tenant_key=TENANT)
+        assert _read_value(session) == 1.0
+    with factory() as session:
+        use_replica_for_reads(session, tenant_key=str(uuid4()))
+        assert _read_value(session) == 2.0
+
+
+def test_client_write_marker_pins_reads_across_workers(routing) -> None:
+    factory, _, tracker = routing
+    written: list[float] = []
+    with factory() as session:
+        track_client_writes(session, marker=None, on_write=written.append)
+        session.add(
+            FinancialIndexValue(
+                tenant_id=uuid4(),
+                index_code="IPCA",
+                reference_date=date(2024, 1, 1),
+                value=3.0,
+            )
+        )
+        session.commit()
+    [written_at] = written
+
+    # Another worker never saw the write; only the client's marker pins it.
+    tracker.clear()
+    for marker, expected in (
+        (str(written_at), 1.0),
+        (str(written_at - 60), 2.0),
+        ("garbage", 2.0),
+    ):
+        with factory() as session:
+            use_replica_for_reads(session, tenant_key=TENANT)
+            track_client_writes(session, marker=marker, on_write=written.append)
+            assert _read_value(session) == expected
+    assert len(written) == 1
+
+
+def test_write_marker_middleware_hands_back_last_write() -> None:
+    app = FastAPI()
+    app.add_middleware(WriteMarkerMiddleware, window_seconds=10)
+
+    @app.post("/items")
+    def write(request: Request) -> dict:
+        request.state.last_write_at = 1700000000.5
+        return {}
+
+    @app.get("/items")
+    def read() -> dict:
+        return {}
+
+    with TestClient(app) as marker_client:
+        written = marker_client.post("/items")
+        read = marker_client.get("/items")
+
+    assert written.headers[WRITE_MARKER_HEADER] == "1700000000.500"
+    assert written.cookies[WRITE_MARKER_COOKIE] == "1700000000.500"
+    assert "max-age=10" in written.headers["set-cookie"].lower()
+    assert WRITE_MARKER_HEADER not in read.headers
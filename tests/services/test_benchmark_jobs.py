@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+
+from app.services import benchmark_jobs
+from app.services.benchmark_jobs import (
+    BenchmarkIngestExecutor,
+    BenchmarkJobRegistry,
+    aggregate_file,
+)
+from app.services.benchmarking import DatasetTooLargeError
+
+CSV = "metric_code,segment,region,value\n" + "spread,Varejo,Sul,2.0\n" * 4
+
+
+@pytest.fixture
+def upload_path(tmp_path) -> str:
+    path = tmp_path / "upload.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return str(path)
+
+
+def test_aggregate_file_enforces_the_size_cap(upload_path: str) -> None:
+    upload = aggregate_file(upload_path, "upload.csv", 1024)
+    assert upload.total_rows == 4
+    [bucket] = upload.buckets
+    assert bucket.count == 4
+
+    with pytest.raises(DatasetTooLargeError):
+        aggregate_file(upload_path, "upload.csv", 16)
+
+
+def test_executor_parses_in_worker_process(upload_path: str, monkeypatch) -> None:
+    in_progress = Mock()
+    monkeypatch.setattr(benchmark_jobs, "BENCHMARK_INGESTS_IN_PROGRESS", in_progress)
+    executor = BenchmarkIngestExecutor(processes=1)
+    try:
+        upload = asyncio.run(executor.aggregate(upload_path, "upload.csv", 1024))
+    finally:
+        executor.shutdown()
+
+    assert upload.total_rows == 4
+    assert upload.buckets[0].sketch.quantile(0.5) == 2.0
+    # The worker's own registry is never scraped; the parent tracks the gauge.
+    in_progress.inc.assert_called_once_with()
+    in_progress.dec.assert_called_once_with()
+
+
+def test_job_registry_scopes_jobs_to_tenant_and_expires_them() -> None:
+    registry = BenchmarkJobRegistry(ttl_seconds=0)
+    tenant_id = uuid4()
+    job = registry.create(tenant_id, uuid4())
+
+    assert registry.get(tenant_id, job.job_id) is job
+    assert registry.get(uuid4(), job.job_id) is None
+
+    registry.fail(job, "boom")
+    assert job.status == "failed"
+    assert registry.get(tenant_id, job.job_id) is None
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from uuid import uuid4
+
+import pytest
+from openpyxl import Workbook
+
+from app.services.benchmarking import (
+    BenchmarkingService,
+    BenchmarkRecord,
+    InMemoryBenchmarkRepository,
+    RunningAggregation,
+)
+
+
+def _ingest(service: BenchmarkingService, content: str):
+    return service.ingest_dataset(
+        uuid4(), uuid4(), filename="dataset.csv", content=content.encode("utf-8")
+    )
+
+
+def test_columnar_ingest_matches_row_by_row_aggregation() -> None:
+    rows = [
+        ("spread", f"Segment {index % 4}", f"Region {index % 3}", index * 0.137)
+        for index in range(10_000)
+    ]
+    content = "metric_code,segment,region,value\n" + "".join(
+        f"{metric},{segment},{region},{value}\n"
+        for metric, segment, region, value in rows
+    )
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+    service.BATCH_ROWS = 512
+
+    result = _ingest(service, content)
+
+    expected = RunningAggregation()
+    for metric, segment, region, value in rows:
+        expected.add(
+            BenchmarkRecord(
+                metric_code=metric.upper(),
+                segment=f"{segment[:3].upper()}*",
+                region=f"{region[:2].upper()}*",
+                value=round(value, 2),
+            )
+        )
+    assert result.total_rows == 10_000
+    assert sorted(result.aggregations, key=repr) == sorted(expected.results(), key=repr)
+
+
+def test_columnar_ingest_discards_invalid_and_ragged_rows() -> None:
+    content = (
+        "Metric Code,Segment,Region,Value,Notes\n"
+        "vpl,Micro Comercio,Sudeste,1.0,ok\n"
+        "\n"
+        "vpl,Micro Comercio,Sudeste,2.0\n"
+        "vpl,Micro Comercio,Sudeste,3.004\n"
+        "vpl,Micro Comercio,Sudeste,-1\n"
+        "vpl,Micro Comercio,Sudeste,abc\n"
+        "vpl,,Sudeste,1.0\n"
+        "vpl,Micro Comercio\n"
+    )
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+
+    result = _ingest(service, content)
+
+    assert result.total_rows == 7
+    assert result.discarded_rows == 4
+    [aggregation] = result.aggregations
+    assert aggregation.metric_code == "VPL"
+    assert aggregation.count == 3
+    assert aggregation.average_value == 2.0
+    assert aggregation.max_value == 3.0
+
+
+def test_columnar_ingest_without_required_column_discards_every_row() -> None:
+    content = "metric_code,segment,value\nspread,Varejo,1.0\nspread,Varejo,2.0\n"
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+
+    result = _ingest(service, content)
+
+    assert (result.total_rows, result.discarded_rows) == (2, 2)
+    assert result.aggregations == []
+
+
+def test_xlsx_ingest_reads_only_required_columns_as_raw_values() -> None:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["id", "Metric Code", "notes", "Segment", "Region", "Value", "x"])
+    sheet.append([1, "spread", "a", "Varejo Moda", "Sul", 2, "y"])
+    sheet.append([2, "spread", None, "Varejo Moda", "Sul", 1.255])
+    sheet.append([])
+    sheet.append([3, "spread", "c", "Varejo Moda", "Sul", "3.5"])
+    sheet.append([4, "spread", "d", "Varejo Moda", "Sul", "n/a"])
+    sheet.append([5, 2024, "e", "Varejo Moda", 11, -1.0])
+    sheet.append([6, "spread", "f", "Varejo Moda", "Sul", True])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+    upload = service.aggregate_stream("dataset.xlsx", io.BytesIO(buffer.getvalue()))
+
+    assert (upload.total_rows, upload.discarded_rows) == (6, 3)
+    [bucket] = upload.buckets
+    assert bucket.key == ("SPREAD", "VAR*", "SU*")
+    assert bucket.count == 3
+    assert bucket.min_value == 1.25
+    assert bucket.max_value == 3.5
+
+
+def test_upload_format_is_detected_from_magic_bytes() -> None:
+    workbook = Workbook()
+    workbook.active.append(["metric_code", "segment", "region", "value"])
+    for _ in range(3):
+        workbook.active.append(["spread", "Varejo", "Sul", 1.5])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+
+    upload = service.aggregate_stream("export.bin", io.BytesIO(buffer.getvalue()))
+    assert upload.buckets[0].count == 3
+
+    with pytest.raises(ValueError):
+        service.aggregate_stream("export.csv", io.BytesIO(b"PAR1" + b"\0" * 16))
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        service.aggregate_stream("export.bin", io.BytesIO(b"metric_code\n"))
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zipped:
+        zipped.writestr("dataset.csv", "metric_code,segment,region,value\n")
+    with pytest.raises(ValueError, match="Invalid XLSX file"):
+        service.aggregate_stream("export.zip", io.BytesIO(archive.getvalue()))
+
+
+def test_parquet_ingest_aggregates_required_columns_in_arrow() -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {
+            "id": list(range(6)),
+            "Metric Code": ["spread"] * 5 + [None],
+            "segment": ["Varejo Moda"] * 6,
+            "region": ["Sul"] * 6,
+            "value": [1.0, 2.004, 3.0, -1.0, None, 5.0],
+        }
+    )
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+    upload = service.aggregate_stream("export.bin", io.BytesIO(buffer.getvalue()))
+
+    assert (upload.total_rows, upload.discarded_rows) == (6, 3)
+    [bucket] = upload.buckets
+    assert bucket.key == ("SPREAD", "VAR*", "SU*")
+    assert (bucket.count, bucket.total) == (3, 6.0)
+
+
+def test_non_finite_values_are_discarded_alike_in_csv_and_parquet() -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    values = [1.0, float("nan"), 2.0, float("inf"), 3.0]
+    csv_content = "metric_code,segment,region,value\n" + "".join(
+        f"spread,Varejo,Sul,{value}\n" for value in values
+    )
+    buffer = io.BytesIO()
+    pq.write_table(
+        pa.table(
+            {
+                "metric_code": ["spread"] * 5,
+                "segment": ["Varejo"] * 5,
+                "region": ["Sul"] * 5,
+                "value": values,
+            }
+        ),
+        buffer,
+    )
+
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+    uploads = [
+        service.aggregate_stream("dataset.csv", io.BytesIO(csv_content.encode())),
+        service.aggregate_stream("export.bin", io.BytesIO(buffer.getvalue())),
+    ]
+
+    for upload in uploads:
+        assert (upload.total_rows, upload.discarded_rows) == (5, 2)
+        [bucket] = upload.buckets
+        assert (bucket.count, bucket.total, bucket.max_value) == (3, 6.0, 3.0)
+
+
+def test_parquet_ingest_discards_boolean_values() -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    buffer = io.BytesIO()
+    pq.write_table(
+        pa.table(
+            {
+                "metric_code": ["spread"] * 2,
+                "segment": ["Varejo"] * 2,
+                "region": ["Sul"] * 2,
+                "value": [True, False],
+            }
+        ),
+        buffer,
+    )
+
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+    upload = service.aggregate_stream("export.bin", io.BytesIO(buffer.getvalue()))
+
+    assert (upload.total_rows, upload.discarded_rows) == (2, 2)
+    assert upload.buckets == []
+
+
+def test_parquet_ingest_without_required_columns_discards_every_row() -> None:
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    buffer = io.BytesIO()
+    pq.write_table(pa.table({"id": [1, 2], "notes": ["a", "b"]}), buffer)
+
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+    upload = service.aggregate_stream("export.bin", io.BytesIO(buffer.getvalue()))
+
+    assert (upload.total_rows, upload.discarded_rows) == (2, 2)
+    assert upload.buckets == []
+
+
+@pytest.mark.parametrize("writer", ["new_file", "new_stream"])
+def test_arrow_ipc_ingest_aggregates_required_columns(writer: str) -> None:
+    pa = pytest.importorskip("pyarrow")
+    ipc = pytest.importorskip("pyarrow.ipc")
+    table = pa.table(
+        {
+            "metric_code": ["spread", "spread", "spread", "vpl"],
+            "Segment": ["Varejo Moda"] * 4,
+            "region": ["Sul"] * 4,
+            "value": ["1.5", "2", "n/a", "4"],
+            "notes": list("abcd"),
+        }
+    )
+    buffer = io.BytesIO()
+    with getattr(ipc, writer)(buffer, table.schema) as sink:
+        for batch in table.to_batches(max_chunksize=2):
+            sink.write_batch(batch)
+
+    service = BenchmarkingService(InMemoryBenchmarkRepository())
+    upload = service.aggregate_stream("export.bin", io.BytesIO(buffer.getvalue()))
+
+    assert (upload.total_rows, upload.discarded_rows) == (4, 1)
+    spread, vpl = sorted(upload.buckets, key=lambda bucket: bucket.key)
+    assert spread.key == ("SPREAD", "VAR*", "SU*")
+    assert (spread.count, spread.total) == (2, 3.5)
+    assert (vpl.count, vpl.total) == (1, 4.0)
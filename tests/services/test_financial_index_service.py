@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import Mock
 from uuid import uuid4
 
@@ -110,3 +111,22 @@ class TestFinancialIndexServicePermissions:
         )
         assert result == []
         service._repository.create_or_update_values.assert_not_called()
+
+    # --- Testes para list_values_async ---
+    def test_list_values_async_runs_sync_repository_in_threadpool(
+        self, service: FinancialIndexService, tenant_admin: ActingUser
+    ):
+        # Repositório síncrono é executado fora do event loop
+        asyncio.run(
+            service.list_values_async(tenant_admin, tenant_admin.tenant_id, "INCC")
+        )
+        service._repository.list_by_index_code.assert_called_once_with(
+            tenant_admin.tenant_id, "INCC"
+        )
+
+    def test_list_values_async_denied_for_other_tenant(
+        self, service: FinancialIndexService, tenant_admin: ActingUser
+    ):
+        with pytest.raises(PermissionDeniedError):
+            asyncio.run(service.list_values_async(tenant_admin, uuid4(), "INCC"))
+        service._repository.list_by_index_code.assert_not_called()
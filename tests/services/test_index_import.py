@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import io
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from openpyxl import Workbook
+from sqlalchemy.orm import Session
+
+from app.db.repositories.financial_index import FinancialIndexRepository
+from app.services.administration import ActingUser, PermissionDeniedError
+from app.services.index_import import IndexImportError, IndexImportService
+
+
+def _admin(tenant_id) -> ActingUser:
+    return ActingUser(
+        id=uuid4(), tenant_id=tenant_id, roles=frozenset(["tenant_admin"])
+    )
+
+
+def test_import_csv_in_chunks_returns_per_index_summary(db_session: Session) -> None:
+    tenant_id = uuid4()
+    lines = ["Index Code,Reference Date,Value"]
+    lines += [f"IGPM,2024-{month:02d}-01,1.{month:02d}" for month in range(1, 13)]
+    lines += ["INCC,2024-01-01,0.5", "INCC,2024-01-01,0.7"]
+    stream = io.BytesIO("\n".join(lines).encode("utf-8"))
+
+    summaries = IndexImportService(db_session, chunk_size=5).import_file(
+        _admin(tenant_id), tenant_id, filename="series.csv", stream=stream
+    )
+
+    assert [(s.index_code, s.rows) for s in summaries] == [("IGPM", 12), ("INCC", 2)]
+    assert summaries[0].first_date == date(2024, 1, 1)
+    assert summaries[0].last_date == date(2024, 12, 1)
+    repository = FinancialIndexRepository(db_session)
+    assert len(repository.list_by_index_code(tenant_id, "IGPM")) == 12
+    assert [v.value for v in repository.list_by_index_code(tenant_id, "INCC")] == [0.7]
+
+
+def test_import_xlsx(db_session: Session) -> None:
+    tenant_id = uuid4()
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["index_code", "reference_date", "value"])
+    sheet.append(["IPCA", date(2024, 1, 1), 0.42])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    summaries = IndexImportService(db_session).import_file(
+        _admin(tenant_id), tenant_id, filename="series.xlsx", stream=buffer
+    )
+
+    assert [(s.index_code, s.rows) for s in summaries] == [("IPCA", 1)]
+
+
+def test_import_rolls_back_on_invalid_row(db_session: Session) -> None:
+    tenant_id = uuid4()
+    stream = io.BytesIO(
+        b"index_code,reference_date,value\nIGPM,2024-01-01,1.0\nIGPM,not-a-date,1.1\n"
+    )
+
+    with pytest.raises(IndexImportError, match="Line 3"):
+        IndexImportService(db_session, chunk_size=1).import_file(
+            _admin(tenant_id), tenant_id, filename="series.csv", stream=stream
+        )
+
+    assert (
+        FinancialIndexRepository(db_session).list_by_index_code(tenant_id, "IGPM") == []
+    )
+
+
+def test_import_requires_tenant_admin(db_session: Session) -> None:
+    with pytest.raises(PermissionDeniedError):
+        IndexImportService(db_session).import_file(
+            _admin(uuid4()), uuid4(), filename="series.csv", stream=io.BytesIO()
+        )
@@ -6,6 +6,7 @@ from uuid import uuid4
 
 import pytest
 
+from app.db.repositories.financial_index import cumulative_series
 from app.services.simulation import AdjustmentLogic
 
 
@@ -24,7 +25,8 @@ class TestAdjustmentLogic:
         utiliza a `addon_rate` para calcular a correção.
         """
         # Arrange
-        mock_index_repository.list_by_index_code.return_value = []
+        mock_index_repository.list_cumulative_window.return_value = []
+        mock_index_repository.has_values.return_value = False
         tenant_id = uuid4()
         addon_rate = 0.12  # 12% a.a.
         periods = [(1, 1000.0), (12, 1000.0)]
@@ -42,9 +44,9 @@ class TestAdjustmentLogic:
         adjusted_periods = logic.apply(periods)
 
         # Assert
-        # Verifica se o repositório foi consultado
-        mock_index_repository.list_by_index_code.assert_called_once_with(
-            tenant_id, "INCC-CUSTOM"
+        # Verifica se o repositório foi consultado apenas na janela do plano
+        mock_index_repository.list_cumulative_window.assert_called_once_with(
+            tenant_id, "INCC-CUSTOM", date(2024, 1, 1), date(2025, 1, 1)
         )
 
         # Valida o cálculo para a primeira parcela (1 mês)
@@ -68,7 +70,9 @@ class TestAdjustmentLogic:
             Mock(reference_date=date(2024, 3, 1), value=1.02),  # Mar/24
             Mock(reference_date=date(2024, 4, 1), value=1.005),  # Abr/24
         ]
-        mock_index_repository.list_by_index_code.return_value = index_values
+        mock_index_repository.list_cumulative_window.return_value = cumulative_series(
+            (value.reference_date, value.value) for value in index_values
+        )
         base_date = date(2024, 1, 15)
         addon_rate = 0.12  # 12% a.a.
 
@@ -106,7 +110,9 @@ class TestAdjustmentLogic:
             Mock(reference_date=date(2024, m + 1, 1), value=(1.005 + m * 0.0001))
             for m in range(12)
         ]
-        mock_index_repository.list_by_index_code.return_value = index_values
+        mock_index_repository.list_cumulative_window.return_value = cumulative_series(
+            (value.reference_date, value.value) for value in index_values
+        )
         base_date = date(2023, 12, 15)
         addon_rate = 0.10  # 10% a.a.
 
@@ -135,3 +141,30 @@ class TestAdjustmentLogic:
             index_correction *= v.value
         expected_amount = 1000.0 * index_correction * (1 + addon_rate)
         assert adjusted_periods[1][1] == pytest.approx(expected_amount)
+
+    def test_apply_monthly_counts_calendar_months_from_month_end(
+        self, mock_index_repository: Mock
+    ):
+        """
+        Uma data-base no fim do mês não deve pular fevereiro (deriva de 31 dias).
+        """
+        # Arrange
+        mock_index_repository.list_cumulative_window.return_value = cumulative_series(
+            [(date(2024, 2, 1), 1.02), (date(2024, 3, 1), 1.03)]
+        )
+        logic = AdjustmentLogic(
+            base_date=date(2024, 1, 31),
+            index_code="IPCA",
+            periodicity="monthly",
+            addon_rate=0.0,
+            index_repository=mock_index_repository,
+            tenant_id=uuid4(),
+        )
+
+        # Act
+        adjusted_periods = logic.apply([(1, 1000.0), (2, 1000.0), (30, 1000.0)])
+
+        # Assert
+        assert adjusted_periods[0][1] == pytest.approx(1020.0)
+        assert adjusted_periods[1][1] == pytest.approx(1000.0 * 1.02 * 1.03)
+        assert adjusted_periods[2][1] == pytest.approx(1000.0 * 1.02 * 1.03)
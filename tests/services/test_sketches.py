@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from app.services.sketches import KLLSketch
+
+
+def _values(count: int, seed: int = 7) -> list[float]:
+    rng = random.Random(seed)
+    return [rng.expovariate(0.5) for _ in range(count)]
+
+
+def _true_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def test_quantiles_stay_within_rank_error_with_bounded_memory() -> None:
+    values = _values(200_000)
+    sketch = KLLSketch()
+    for start in range(0, len(values), 4096):
+        sketch.update_many(values[start : start + 4096])
+
+    assert sketch.count == 200_000
+    assert sketch.retained < 4 * sketch.k
+    ordered = sorted(values)
+    for q in (0.25, 0.5, 0.75, 0.9):
+        estimate = sketch.quantile(q)
+        rank = sum(1 for value in ordered if value <= estimate) / len(ordered)
+        assert rank == pytest.approx(q, abs=0.02)
+
+
+def test_merged_sketch_matches_union_of_inputs() -> None:
+    left, right = _values(50_000, seed=1), [value + 5 for value in _values(50_000)]
+    first, second = KLLSketch(), KLLSketch()
+    first.update_many(left)
+    second.update_many(right)
+
+    merged = KLLSketch.merged([first, second])
+
+    assert merged.count == 100_000
+    assert merged.min_value == min(left + right)
+    assert merged.max_value == max(left + right)
+    assert merged.quantile(0.5) == pytest.approx(
+        _true_quantile(left + right, 0.5), rel=0.05
+    )
+    assert first.count == 50_000  # inputs are left untouched
+
+
+def test_small_sketches_are_exact() -> None:
+    sketch = KLLSketch()
+    sketch.update_many([4.0, 1.0, 3.0, 2.0])
+
+    assert sketch.quantile(0) == 1.0
+    assert sketch.quantile(0.5) == 2.0
+    assert sketch.quantile(1) == 4.0
+    assert sketch.rank(2.5) == 0.5
+
+
+def test_serialization_round_trips() -> None:
+    sketch = KLLSketch()
+    sketch.update_many(_values(10_000))
+
+    restored = KLLSketch.from_bytes(sketch.to_bytes())
+
+    assert restored.count == sketch.count
+    assert restored.quantiles([0.1, 0.5, 0.9]) == sketch.quantiles([0.1, 0.5, 0.9])
+    with pytest.raises(ValueError):
+        KLLSketch.from_bytes(sketch.to_bytes()[:10])
@@ -0,0 +1,44 @@
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.api.schemas.simulation import SimulationPlanSnapshot, SimulationResult
+from app.services.template_cache import CompiledTemplate, CompiledTemplateCache
+
+
+def _compiled(_template) -> CompiledTemplate:
+    return CompiledTemplate(
+        periods=((1, 100.0),),
+        snapshot=SimulationPlanSnapshot(
+            principal=100, discount_rate=0, installments=[]
+        ),
+        result=SimulationResult.model_construct(),
+    )
+
+
+def test_cache_keys_on_template_version_and_date() -> None:
+    cache = CompiledTemplateCache(maxsize=8)
+    template = SimpleNamespace(id=uuid4(), updated_at=datetime.now(timezone.utc))
+    today = date(2026, 10, 19)
+
+    first = cache.get_or_compile(template, today, _compiled)
+    assert cache.get_or_compile(template, today, _compiled) is first
+    assert cache.hits == 1
+
+    template.updated_at = datetime.now(timezone.utc)
+    assert cache.get_or_compile(template, today, _compiled) is not first
+    assert cache.get_or_compile(template, date(2026, 10, 20), _compiled) is not first
+    assert cache.misses == 3
+
+
+def test_invalidate_drops_every_entry_of_a_template() -> None:
+    cache = CompiledTemplateCache(maxsize=8)
+    kept = SimpleNamespace(id=uuid4(), updated_at=None)
+    dropped = SimpleNamespace(id=uuid4(), updated_at=None)
+    for day in (date(2026, 10, 19), date(2026, 10, 20)):
+        cache.get_or_compile(kept, day, _compiled)
+        cache.get_or_compile(dropped, day, _compiled)
+
+    cache.invalidate(dropped.id)
+
+    assert len(cache) == 2
@@ -7,6 +7,7 @@ import pytest
 
 from app.api.routes.admin_portal import get_administration_service
 from app.core.roles import SUPERADMIN_ROLE
+from app.services.pagination import Page
 from tests.conftest import TENANT_ID, app
 
 
@@ -471,6 +472,61 @@ def test_list_payment_plan_templates_returns_collection(
     assert body[0]["productCode"] == "standard"
 
 
+def test_list_payment_plan_templates_paginates_and_projects(
+    client, superadmin_headers, _clear_overrides
+):
+    captured = {}
+    template = SimpleNamespace(
+        id=uuid.uuid4(),
+        tenant_id=UUID(TENANT_ID),
+        product_code="standard",
+        name="Plano Standard",
+        description=None,
+        principal=4000,
+        discount_rate=0.015,
+        metadata_json=None,
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+        installments=[],
+    )
+
+    class StubService:
+        def list_payment_plan_templates_page(
+            self,
+            acting_user,
+            tenant_id,
+            *,
+            include_inactive,
+            include_installments,
+            limit,
+            cursor,
+        ):
+            captured.update(
+                include_installments=include_installments, limit=limit, cursor=cursor
+            )
+            return Page(items=[template], next_cursor="next-page")
+
+    app.dependency_overrides[get_administration_service] = lambda: StubService()
+
+    response = client.get(
+        f"/v1/admin-portal/tenant-admin/{TENANT_ID}/payment-plans",
+        params={"limit": 1, "cursor": "abc", "fields": "id,productCode"},
+        headers=superadmin_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["X-Next-Cursor"] == "next-page"
+    assert response.json() == [{"id": str(template.id), "productCode": "standard"}]
+    assert captured == {"include_installments": False, "limit": 1, "cursor": "abc"}
+
+    response = client.get(
+        f"/v1/admin-portal/tenant-admin/{TENANT_ID}/payment-plans",
+        params={"limit": 1, "fields": "bogus"},
+        headers=superadmin_headers,
+    )
+    assert response.status_code == 400
+
+
 def test_update_payment_plan_template_calls_service(
     client, superadmin_headers, _clear_overrides
 ):
@@ -1,7 +1,7 @@
 import uuid
 
 import pytest
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, event, select
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.roles import SUPERADMIN_ROLE, TENANT_ADMIN_ROLE, TENANT_USER_ROLE
@@ -541,6 +541,7 @@ def test_create_payment_plan_template_persists_entities(
         .scalar_one()
     )
     assert stored.product_code == "plan-basic"
+    assert stored.packed_installments == [(1, 2500.0), (2, 2600.0)]
     assert len(stored.installments) == 2
     assert {item.period for item in stored.installments} == {1, 2}
 
@@ -575,6 +576,36 @@ def test_list_payment_plan_templates_filters_inactive(
     assert codes == {active.product_code, inactive.product_code}
 
 
+def test_list_payment_plan_templates_page_walks_cursor(
+    service: AdministrationService,
+    default_tenant: Tenant,
+    superadmin: ActingUser,
+) -> None:
+    for code in ("plan-c", "plan-a", "plan-b"):
+        _create_template(service, default_tenant, superadmin, code=code)
+
+    first = service.list_payment_plan_templates_page(
+        superadmin, default_tenant.id, limit=2
+    )
+    assert [t.product_code for t in first.items] == ["plan-a", "plan-b"]
+    assert first.next_cursor is not None
+
+    second = service.list_payment_plan_templates_page(
+        superadmin, default_tenant.id, limit=2, cursor=first.next_cursor
+    )
+    assert [t.product_code for t in second.items] == ["plan-c"]
+    assert second.next_cursor is None
+
+
+def test_list_page_rejects_malformed_cursor(
+    service: AdministrationService,
+    default_tenant: Tenant,
+    superadmin: ActingUser,
+) -> None:
+    with pytest.raises(BusinessRuleViolation):
+        service.list_users_page(superadmin, default_tenant.id, cursor="not-a-cursor")
+
+
 def test_update_payment_plan_template_replaces_installments(
     service: AdministrationService,
     default_tenant: Tenant,
@@ -601,3 +632,33 @@ def test_update_payment_plan_template_replaces_installments(
     assert float(updated.principal) == 6000
     assert len(updated.installments) == 3
     assert {item.period for item in updated.installments} == {1, 2, 3}
+
+
+def test_update_payment_plan_template_applies_installment_diff(
+    service: AdministrationService,
+    default_tenant: Tenant,
+    superadmin: ActingUser,
+) -> None:
+    template = _create_template(service, default_tenant, superadmin)
+    original_ids = {item.period: item.id for item in template.installments}
+    commits = []
+    event.listen(service.session, "after_commit", commits.append)
+
+    updated = service.update_payment_plan_template(
+        superadmin,
+        default_tenant.id,
+        template.id,
+        PaymentPlanTemplateUpdateInput(
+            installments=[
+                PaymentPlanInstallmentInput(period=2, amount=2600),
+                PaymentPlanInstallmentInput(period=3, amount=2700),
+            ],
+        ),
+    )
+
+    assert len(commits) == 1
+    assert updated.packed_installments == [(2, 2600.0), (3, 2700.0)]
+    by_period = {item.period: item for item in updated.installments}
+    assert set(by_period) == {2, 3}
+    assert by_period[2].id == original_ids[2]
+    assert float(by_period[3].amount) == 2700
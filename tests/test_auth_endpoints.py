@@ -162,3 +162,171 @@ def test_login_scoped_success(
     assert "refresh_token" in data
     mock_user_repository.get_by_email.assert_called_once_with(TENANT_ID, email)
     mock_refresh_token_repository.create.assert_called_once()
+
+
+def _count_verifications(monkeypatch) -> list[str]:
+    from app.api.routes import auth as auth_routes
+
+    checked: list[str] = []
+    original = auth_routes.verify_password
+
+    def _verify(plain: str, hashed: str) -> bool:
+        checked.append(hashed)
+        return original(plain, hashed)
+
+    monkeypatch.setattr(auth_routes, "verify_password", _verify)
+    return checked
+
+
+def test_login_unscoped_uses_last_tenant_hint_with_single_verification(
+    client: TestClient,
+    mock_user_repository: MagicMock,
+    mock_refresh_token_repository: MagicMock,
+    monkeypatch,
+):
+    # Arrange
+    email = "consultant@example.com"
+    other_tenant = "22222222-2222-2222-2222-222222222222"
+    users = [
+        User(
+            id=f"5555555{idx}-5555-5555-5555-555555555555",
+            tenant_id=other_tenant if idx else TENANT_ID,
+            email=email,
+            hashed_password=f"hashed:secret-{idx}",
+            is_active=True,
+            is_suspended=False,
+        )
+        for idx in range(3)
+    ]
+    mock_user_repository.get_by_email_unscoped.return_value = users
+    mock_user_repository.get_login_hint.return_value = other_tenant
+    checked = _count_verifications(monkeypatch)
+
+    # Act
+    response = client.post("/v1/login", json={"email": email, "password": "secret-1"})
+
+    # Assert
+    assert response.status_code == 200
+    assert checked == ["hashed:secret-1"]
+    mock_user_repository.record_login_hint.assert_called_once_with(email, other_tenant)
+
+
+def test_login_unscoped_failure_spends_single_verification(
+    client: TestClient, mock_user_repository: MagicMock, monkeypatch
+):
+    # Arrange
+    email = "consultant@example.com"
+    users = [
+        User(
+            id=USER_ID,
+            tenant_id=TENANT_ID,
+            email=email,
+            hashed_password=f"hashed:secret-{idx}",
+            is_active=True,
+            is_suspended=False,
+        )
+        for idx in range(20)
+    ]
+    mock_user_repository.get_by_email_unscoped.return_value = users
+    mock_user_repository.get_login_hint.return_value = None
+    checked = _count_verifications(monkeypatch)
+
+    # Act
+    response = client.post("/v1/login", json={"email": email, "password": "wrong"})
+
+    # Assert
+    assert response.status_code == 401
+    assert len(checked) == 1
+    mock_user_repository.record_login_hint.assert_not_called()
+
+
+def test_login_unscoped_with_tenant_slug_skips_membership_scan(
+    client: TestClient,
+    mock_user_repository: MagicMock,
+    mock_refresh_token_repository: MagicMock,
+):
+    # Arrange
+    email = "test@example.com"
+    user = User(
+        id=USER_ID,
+        tenant_id=TENANT_ID,
+        email=email,
+        hashed_password="hashed:password",
+        is_active=True,
+        is_suspended=False,
+    )
+    mock_user_repository.get_by_email_and_tenant_slug.return_value = user
+
+    # Act
+    response = client.post(
+        "/v1/login",
+        json={"email": email, "password": "password", "tenantSlug": "labs4ideas"},
+    )
+
+    # Assert
+    assert response.status_code == 200
+    mock_user_repository.get_by_email_and_tenant_slug.assert_called_once_with(
+        email, "labs4ideas"
+    )
+    mock_user_repository.get_by_email_unscoped.assert_not_called()
+
+
+def test_login_unscoped_skips_inactive_and_suspended_memberships(
+    client: TestClient,
+    mock_user_repository: MagicMock,
+    mock_refresh_token_repository: MagicMock,
+    monkeypatch,
+):
+    # Arrange
+    email = "consultant@example.com"
+    users = [
+        User(
+            id=f"5555555{idx}-5555-5555-5555-555555555555",
+            tenant_id=f"2222222{idx}-2222-2222-2222-222222222222",
+            email=email,
+            hashed_password="hashed:secret",
+            is_active=idx != 0,
+            is_suspended=idx == 1,
+        )
+        for idx in range(3)
+    ]
+    mock_user_repository.get_by_email_unscoped.return_value = users
+    mock_user_repository.get_login_hint.return_value = users[0].tenant_id
+    checked = _count_verifications(monkeypatch)
+
+    # Act
+    response = client.post("/v1/login", json={"email": email, "password": "secret"})
+
+    # Assert
+    assert response.status_code == 200
+    assert len(checked) == 1
+    mock_user_repository.record_login_hint.assert_called_once_with(
+        email, users[2].tenant_id
+    )
+
+
+def test_login_unscoped_asks_for_tenant_slug_when_memberships_are_ambiguous(
+    client: TestClient, mock_user_repository: MagicMock
+):
+    # Arrange
+    email = "consultant@example.com"
+    users = [
+        User(
+            id=f"5555555{idx}-5555-5555-5555-555555555555",
+            tenant_id=f"2222222{idx}-2222-2222-2222-222222222222",
+            email=email,
+            hashed_password=f"hashed:secret-{idx}",
+            is_active=True,
+            is_suspended=False,
+        )
+        for idx in range(2)
+    ]
+    mock_user_repository.get_by_email_unscoped.return_value = users
+    mock_user_repository.get_login_hint.return_value = None
+
+    # Act
+    response = client.post("/v1/login", json={"email": email, "password": "secret-1"})
+
+    # Assert
+    assert response.status_code == 401
+    assert "tenantSlug" in response.json()["message"]
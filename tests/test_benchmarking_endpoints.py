@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from uuid import uuid4
+from itertools import product
+from uuid import UUID, uuid4
 
 from fastapi.testclient import TestClient
 
@@ -98,3 +99,304 @@ inadimplencia,Large Industrias,Sudeste,5.5
     aggregation = data["aggregations"][0]
     assert aggregation["metricCode"] == "INADIMPLENCIA"
     assert aggregation["count"] == 3
+
+
+def test_benchmark_ingest_streams_datasets_beyond_two_megabytes(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    batch_id = uuid4()
+    rows = "".join(
+        f"ticket,Varejo Moda,Nordeste,{index % 100}.25\n" for index in range(100_000)
+    )
+    csv_content = ("metric_code,segment,region,value\n" + rows).encode("utf-8")
+    assert len(csv_content) > 2 * 1024 * 1024
+
+    response = client.post(
+        f"/v1/t/{TENANT_ID}/benchmarking/batches/{batch_id}/ingest",
+        params={"filename": "large.csv"},
+        headers=_headers_with_auth(auth_headers),
+        content=csv_content,
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["totalRows"] == 100_000
+    assert payload["discardedRows"] == 0
+    aggregation = payload["aggregations"][0]
+    assert aggregation["count"] == 100_000
+    assert aggregation["averageValue"] == 49.75
+    assert aggregation["minValue"] == 0.25
+    assert aggregation["maxValue"] == 99.25
+
+
+def test_benchmark_ingest_rejects_datasets_over_the_size_cap(
+    client: TestClient, auth_headers: dict[str, str], monkeypatch
+) -> None:
+    from app.api.routes import benchmarking
+
+    monkeypatch.setattr(benchmarking.service, "max_file_size_bytes", 64)
+    csv_content = (
+        "metric_code,segment,region,value\n" + "spread,Varejo,Sul,1.0\n" * 10
+    ).encode("utf-8")
+    response = client.post(
+        f"/v1/t/{TENANT_ID}/benchmarking/batches/{uuid4()}/ingest",
+        params={"filename": "dataset.csv"},
+        headers=_headers_with_auth(auth_headers),
+        content=csv_content,
+    )
+    assert response.status_code == 413
+
+
+def test_benchmark_distribution_unions_buckets_and_batches(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    batch_ids = [uuid4(), uuid4()]
+    for batch_id, region in zip(batch_ids, ("Sul", "Norte")):
+        rows = "".join(
+            f"spread,Varejo Moda,{region},{value}\n" for value in range(1, 51)
+        )
+        response = client.post(
+            f"/v1/t/{TENANT_ID}/benchmarking/batches/{batch_id}/ingest",
+            params={"filename": "dataset.csv"},
+            headers=_headers_with_auth(auth_headers),
+            content=("metric_code,segment,region,value\n" + rows).encode("utf-8"),
+        )
+        assert response.status_code == 200
+        aggregation = response.json()["aggregations"][0]
+        assert aggregation["medianValue"] == 25.0
+        assert aggregation["p90Value"] == 45.0
+
+    response = client.get(
+        f"/v1/t/{TENANT_ID}/benchmarking/distribution",
+        params={
+            "metric_code": "spread",
+            "batch_id": [str(batch_id) for batch_id in batch_ids],
+            "segment_bucket": "VAR*",
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["count"] == 100
+    assert payload["minValue"] == 1.0
+    assert payload["medianValue"] == 25.0
+    assert payload["p75Value"] == 38.0
+
+    missing = client.get(
+        f"/v1/t/{TENANT_ID}/benchmarking/distribution",
+        params={"metric_code": "vpl", "batch_id": str(batch_ids[0])},
+        headers=auth_headers,
+    )
+    assert missing.status_code == 404
+
+
+def test_benchmark_ingest_append_merges_daily_slices(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    batch_id = uuid4()
+    url = f"/v1/t/{TENANT_ID}/benchmarking/batches/{batch_id}/ingest"
+    slices = (
+        "metric_code,segment,region,value\nvpl,Micro Comercio,Sudeste,1.0\n"
+        "vpl,Micro Comercio,Sudeste,2.0\n",
+        "metric_code,segment,region,value\nvpl,Micro Comercio,Sudeste,3.0\n"
+        "vpl,Micro Comercio,Sudeste,6.0\n",
+    )
+
+    first = client.post(
+        url,
+        params={"filename": "day1.csv", "mode": "append"},
+        headers=_headers_with_auth(auth_headers),
+        content=slices[0].encode("utf-8"),
+    )
+    assert first.status_code == 200
+    assert first.json()["aggregations"] == []  # two rows stay suppressed
+
+    second = client.post(
+        url,
+        params={"filename": "day2.csv", "mode": "append"},
+        headers=_headers_with_auth(auth_headers),
+        content=slices[1].encode("utf-8"),
+    )
+    assert second.status_code == 200
+    payload = second.json()
+    assert payload["totalRows"] == 2
+    [aggregation] = payload["aggregations"]
+    assert aggregation["count"] == 4
+    assert aggregation["averageValue"] == 3.0
+    assert aggregation["maxValue"] == 6.0
+
+    replaced = client.post(
+        url,
+        params={"filename": "day1.csv"},
+        headers=_headers_with_auth(auth_headers),
+        content=slices[0].encode("utf-8"),
+    )
+    assert replaced.json()["aggregations"] == []
+
+
+def test_benchmark_ingest_background_job_reports_status(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    batch_id = uuid4()
+    csv_content = (
+        "metric_code,segment,region,value\n" + "spread,Varejo,Sul,2.0\n" * 3
+    ).encode("utf-8")
+    response = client.post(
+        f"/v1/t/{TENANT_ID}/benchmarking/batches/{batch_id}/ingest",
+        params={"filename": "dataset.csv", "background": "true"},
+        headers=_headers_with_auth(auth_headers),
+        content=csv_content,
+    )
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["batchId"] == str(batch_id)
+    assert response.headers["location"].endswith(f"/benchmarking/jobs/{job['jobId']}")
+
+    # TestClient runs background tasks before returning the response.
+    status_response = client.get(response.headers["location"], headers=auth_headers)
+    assert status_response.status_code == 200
+    payload = status_response.json()
+    assert payload["status"] == "succeeded"
+    assert payload["finishedAt"] is not None
+    assert payload["result"]["totalRows"] == 3
+    assert payload["result"]["aggregations"][0]["count"] == 3
+
+    missing = client.get(
+        f"/v1/t/{TENANT_ID}/benchmarking/jobs/{uuid4()}", headers=auth_headers
+    )
+    assert missing.status_code == 404
+
+
+def test_benchmark_ingest_background_job_records_parse_errors(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"/v1/t/{TENANT_ID}/benchmarking/batches/{uuid4()}/ingest",
+        params={"filename": "dataset.txt", "background": "true"},
+        headers=_headers_with_auth(auth_headers),
+        content=b"metric_code,segment,region,value\n",
+    )
+
+    assert response.status_code == 202
+    payload = client.get(response.headers["location"], headers=auth_headers).json()
+    assert payload["status"] == "failed"
+    assert "Unsupported file format" in payload["error"]
+    assert payload["result"] is None
+
+
+def test_benchmark_cube_answers_rollup_slices(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    first, second = uuid4(), uuid4()
+    for batch_id, rows in (
+        (first, "spread,Varejo,Sul,1.0\n" * 3 + "spread,Industria,Sul,987.65\n"),
+        (second, "spread,Varejo,Norte,3.0\nspread,Varejo,Norte,5.0\n" * 2),
+    ):
+        response = client.post(
+            f"/v1/t/{TENANT_ID}/benchmarking/batches/{batch_id}/ingest",
+            params={"filename": "dataset.csv"},
+            headers=_headers_with_auth(auth_headers),
+            content=("metric_code,segment,region,value\n" + rows).encode("utf-8"),
+        )
+        assert response.status_code == 200
+
+    url = f"/v1/t/{TENANT_ID}/benchmarking/cube"
+    market = client.get(url, params={"metric_code": "spread"}, headers=auth_headers)
+    assert market.status_code == 200
+    payload = market.json()
+    assert payload["batchId"] is None
+    [total] = payload["cells"]
+    assert (total["segmentBucket"], total["regionBucket"]) == ("*", "*")
+    assert total["count"] == 7
+    assert total["averageValue"] == 2.71
+
+    by_region = client.get(
+        url, params={"group_by": "region"}, headers=auth_headers
+    ).json()
+    assert {
+        (cell["segmentBucket"], cell["regionBucket"], cell["count"])
+        for cell in by_region["cells"]
+    } == {("*", "NO*", 4), ("*", "SU*", 3)}
+    norte = client.get(
+        url, params={"region_bucket": "Norte"}, headers=auth_headers
+    ).json()
+    assert [(cell["regionBucket"], cell["count"]) for cell in norte["cells"]] == [
+        ("NO*", 4)
+    ]
+
+    # The single suppressed Industria row must not show through any level.
+    from app.api.routes import benchmarking
+
+    for batch_id in (first, None):
+        for by_segment, by_region in product((False, True), repeat=2):
+            cells = benchmarking.service.cube(
+                UUID(TENANT_ID), batch_id, by_segment=by_segment, by_region=by_region
+            )
+            assert cells
+            for cell in cells:
+                assert cell.max_value < 987.65
+                assert cell.segment_bucket != "IND*"
+                assert cell.sketch.rank(987.0) == 1.0
+                assert cell.count != 4 or cell.region_bucket == "NO*"
+
+
+def test_benchmark_compare_returns_percentile_ranks(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    rows = "".join(f"spread,Varejo,Sul,{value}\n" for value in range(1, 11))
+    response = client.post(
+        f"/v1/t/{TENANT_ID}/benchmarking/batches/{uuid4()}/ingest",
+        params={"filename": "dataset.csv"},
+        headers=_headers_with_auth(auth_headers),
+        content=("metric_code,segment,region,value\n" + rows).encode("utf-8"),
+    )
+    assert response.status_code == 200
+
+    response = client.post(
+        f"/v1/t/{TENANT_ID}/benchmarking/compare",
+        headers=auth_headers,
+        json={
+            "metrics": [
+                {"metricCode": "spread", "value": 7},
+                {
+                    "metricCode": "spread",
+                    "value": 0.5,
+                    "segmentBucket": "VAR*",
+                    "regionBucket": "SU*",
+                },
+                {"metricCode": "vpl", "value": 1.0},
+                {
+                    "metricCode": "spread",
+                    "value": 0.5,
+                    "segmentBucket": "var*",
+                    "regionBucket": "su*",
+                },
+                {
+                    "metricCode": "spread",
+                    "value": 0.5,
+                    "segmentBucket": "Varejo",
+                    "regionBucket": "Sul",
+                },
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["batchId"] is None
+    overall, bucket, unmatched, lowercase, raw = payload["comparisons"]
+    assert overall["metricCode"] == "SPREAD"
+    assert (overall["segmentBucket"], overall["regionBucket"]) == ("*", "*")
+    assert overall["percentileRank"] == 70.0
+    assert overall["count"] == 10
+    assert overall["medianValue"] == 5.0
+    assert bucket["percentileRank"] == 0.0
+    assert unmatched["percentileRank"] is None
+    assert unmatched["count"] is None
+    for normalized in (lowercase, raw):
+        assert (normalized["segmentBucket"], normalized["regionBucket"]) == (
+            "VAR*",
+            "SU*",
+        )
+        assert normalized["percentileRank"] == bucket["percentileRank"]
+        assert normalized["count"] == 10
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import pytest
+from fastapi import Depends, FastAPI
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
 
+from app.api.deps import query_budget
 from app.core.config import get_settings
+from app.middleware.sql_metrics import SQLInstrumentationMiddleware
+from app.observability.metrics import registry
+from app.observability.pool import InstrumentedQueuePool, instrument_engine
+from app.observability.sql import (
+    QueryBudgetExceeded,
+    collect_queries,
+    install_sql_instrumentation,
+)
 from tests.conftest import TENANT_ID
 
 settings = get_settings()
@@ -51,3 +63,110 @@ def test_metrics_endpoint_exposes_custom_counters(client: TestClient) -> None:
     body = response.text
     assert "safv_requests_total" in body or "requests_total" in body
     assert "rate_limit_hits_total" in body
+
+
+def test_pool_instrumentation_tracks_checkouts(tmp_path) -> None:
+    engine = instrument_engine(
+        create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=2,
+            max_overflow=1,
+            pool_logging_name="test-pool",
+        )
+    )
+    labels = {"pool": "test-pool"}
+    try:
+        with engine.connect() as first, engine.connect() as second:
+            first.exec_driver_sql("SELECT 1")
+            second.exec_driver_sql("SELECT 1")
+            assert registry.get_sample_value("safv_db_pool_checked_out", labels) == 2
+        assert registry.get_sample_value("safv_db_pool_checked_out", labels) == 0
+        assert (
+            registry.get_sample_value(
+                "safv_db_pool_checkout_wait_seconds_count", labels
+            )
+            == 2
+        )
+        assert (
+            registry.get_sample_value(
+                "safv_db_pool_connection_age_seconds_count", labels
+            )
+            == 2
+        )
+    finally:
+        engine.dispose()
+
+
+def _budget_app(queries: int) -> FastAPI:
+    engine = create_engine("sqlite://")
+    budget_app = FastAPI()
+    budget_app.add_middleware(SQLInstrumentationMiddleware)
+
+    @budget_app.get("/items/{item_id}", dependencies=[Depends(query_budget(2))])
+    def read_item(item_id: int) -> dict[str, int]:
+        with engine.connect() as connection:
+            for _ in range(queries):
+                connection.exec_driver_sql("SELECT 1")
+        return {"item": item_id}
+
+    return budget_app
+
+
+def test_collect_queries_counts_statements_and_duplicates() -> None:
+    install_sql_instrumentation()
+    engine = create_engine("sqlite://")
+    with collect_queries() as stats, engine.connect() as connection:
+        for _ in range(3):
+            connection.exec_driver_sql("SELECT  1")
+        connection.exec_driver_sql("SELECT 2")
+
+    assert stats.count == 4
+    assert stats.duplicates == {"SELECT 1": 3}
+    assert stats.duplicate_count == 2
+
+
+def test_sql_middleware_reports_server_timing() -> None:
+    install_sql_instrumentation()
+    with TestClient(_budget_app(queries=2)) as budget_client:
+        response = budget_client.get("/items/1")
+
+    assert response.status_code == 200
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+    assert (
+        registry.get_sample_value(
+            "safv_db_queries_per_request_count", {"endpoint": "/items/{item_id}"}
+        )
+        >= 1
+    )
+
+
+def test_sql_middleware_enforces_query_budget() -> None:
+    install_sql_instrumentation()
+    with TestClient(_budget_app(queries=3)) as budget_client:
+        with pytest.raises(QueryBudgetExceeded):
+            budget_client.get("/items/1")
+
+
+def test_sql_middleware_labels_by_route_template() -> None:
+    install_sql_instrumentation()
+    label_app = FastAPI()
+    label_app.add_middleware(SQLInstrumentationMiddleware)
+
+    @label_app.get("/files/{name}")
+    def read_file(name: str) -> dict[str, str]:
+        return {"name": name}
+
+    with TestClient(label_app) as label_client:
+        assert label_client.get("/files/files").status_code == 200
+        assert label_client.get("/wp-login.php").status_code == 404
+
+    def observed(endpoint: str) -> float | None:
+        return registry.get_sample_value(
+            "safv_db_queries_per_request_count", {"endpoint": endpoint}
+        )
+
+    assert observed("/files/{name}") >= 1
+    assert observed("unmatched") >= 1
+    assert observed("/wp-login.php") is None
+    assert observed("/{name}/files") is None
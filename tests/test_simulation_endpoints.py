@@ -5,6 +5,7 @@ from uuid import UUID
 from fastapi.testclient import TestClient
 
 from app.api.routes import simulations as simulations_routes
+from app.services.template_cache import compiled_templates
 from tests.conftest import TENANT_ID
 
 
@@ -55,13 +56,15 @@ def test_simulation_endpoint_uses_standard_plan_when_product_code_matches(
         def __init__(self, session) -> None:  # noqa: D401 - stub only
             pass
 
-        def list_by_ids(self, tenant_id, template_ids, *, only_active: bool = True):
+        def list_by_ids(
+            self, tenant_id, template_ids, *, only_active=True, with_installments=True
+        ):
             if template_ids and template_id in template_ids:
                 return [template]
             return []
 
         def list_by_product_codes(
-            self, tenant_id, product_codes, *, only_active: bool = True
+            self, tenant_id, product_codes, *, only_active=True, with_installments=True
         ):
             lowered = {code.lower() for code in product_codes}
             if "plano-vip" in lowered:
@@ -104,6 +107,15 @@ def test_simulation_endpoint_uses_standard_plan_when_product_code_matches(
     assert template_outcome["product_code"] == "plano-vip"
     assert template_outcome["plan"]["principal"] == 5000
 
+    response = client.post(
+        f"/v1/t/{TENANT_ID}/simulations",
+        json=payload,
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert compiled_templates.hits == 1
+    assert response.json()["outcomes"] == body["outcomes"]
+
 
 def test_valuation_endpoint_returns_scenarios(
     client: TestClient, auth_headers: dict[str, str]
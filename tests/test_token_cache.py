@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.core.token_cache import (
+    RevocationFilter,
+    VerifiedTokenCache,
+    revocation_filter,
+    token_cache,
+)
+from tests.conftest import TENANT_ID, USER_ID
+
+
+def _filter(**overrides) -> RevocationFilter:
+    options = {
+        "size_bits": 1 << 12,
+        "hash_count": 3,
+        "session_ttl": timedelta(minutes=15),
+    }
+    options.update(overrides)
+    return RevocationFilter(**options)
+
+
+def test_verified_token_cache_expires_with_token() -> None:
+    cache = VerifiedTokenCache(maxsize=4)
+    cache.put("token", {"sub": "user", "exp": 100})
+
+    assert cache.get("token", now=99) == {"sub": "user", "exp": 100}
+    assert cache.get("token", now=100) is None
+    assert len(cache) == 0
+
+
+def test_verified_token_cache_evicts_least_recently_used() -> None:
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("first", {"exp": 1_000})
+    cache.put("second", {"exp": 1_000})
+    cache.get("first", now=0)
+    cache.put("third", {"exp": 1_000})
+
+    assert cache.get("second", now=0) is None
+    assert cache.get("first", now=0) is not None
+    assert cache.get("third", now=0) is not None
+
+
+def test_revocation_filter_tracks_users_and_sessions() -> None:
+    revocations = _filter()
+    user_id = uuid4()
+    session_id = uuid4()
+
+    assert not revocations.is_revoked(str(user_id), str(session_id))
+
+    revocations.revoke_session(session_id)
+    assert revocations.is_revoked(str(uuid4()), str(session_id))
+
+    revocations.revoke_user(user_id)
+    assert revocations.is_revoked(str(user_id))
+    revocations.restore_user(user_id)
+    assert not revocations.is_revoked(str(user_id))
+
+
+def test_revocation_filter_prunes_sessions_after_token_lifetime() -> None:
+    revocations = _filter()
+    now = datetime.now(timezone.utc)
+    old_session, recent_session = uuid4(), uuid4()
+    revocations.revoke_session(old_session, now - timedelta(minutes=30))
+    revocations.revoke_session(recent_session, now - timedelta(minutes=1))
+    revocations.revoke_user("suspended")
+
+    revocations.prune(now)
+
+    assert not revocations.is_revoked("someone", str(old_session))
+    assert revocations.is_revoked("someone", str(recent_session))
+    assert revocations.is_revoked("suspended")
+
+
+def test_revoked_user_token_is_rejected(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    url = f"/v1/t/{TENANT_ID}/benchmarking/batches/{uuid4()}/aggregations"
+    assert client.get(url, headers=auth_headers).status_code != 401
+    assert len(token_cache) == 1
+
+    revocation_filter.revoke_user(USER_ID)
+    response = client.get(url, headers=auth_headers)
+
+    assert response.status_code == 401
+    assert response.json()["message"] == "Token has been revoked"
+
+
+def test_revoked_session_token_is_rejected(client: TestClient) -> None:
+    session_id = str(uuid4())
+    token = create_access_token(
+        subject=USER_ID,
+        extra_claims={"tenant_id": TENANT_ID, "roles": ["user"], "sid": session_id},
+    )
+    revocation_filter.revoke_session(session_id)
+
+    response = client.get(
+        f"/v1/t/{TENANT_ID}/benchmarking/batches/{uuid4()}/aggregations",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 401